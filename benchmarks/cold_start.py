@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Cold-start benchmarks for the showcase clients.
+
+Every sample runs in a fresh interpreter, so each measurement includes
+the one-time costs a newly started worker pays. The scenarios are:
+
+* ``import``: importing ``google.showcase`` and resolving both clients.
+* ``construct_echo``/``construct_identity``: building a client, plain and
+  with mutual TLS through ``client_cert_source`` (``*_mtls``).
+* ``first_echo``/``first_echo_mtls``: import, construction and the first
+  ``EchoClient.echo`` round trip against a local stand-in server. The
+  ``process`` phase is the wall time from spawning ``python -c`` until it
+  exits.
+
+Results are written as JSON. Pass ``--baseline`` with an earlier results
+file to print the change of each median.
+
+Usage::
+
+    python benchmarks/cold_start.py --output cold_start.json
+
+or ``nox -s benchmark``; the package must be importable, e.g. after
+``pip install -e .``.
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import showcase_server
+
+
+_PREAMBLE = '''
+import json, time
+timings = {}
+def cert_source():
+    with open(%(cert)r, 'rb') as fh:
+        cert = fh.read()
+    with open(%(key)r, 'rb') as fh:
+        key = fh.read()
+    return cert, key
+'''
+
+_IMPORT = '''
+start = time.perf_counter()
+import google.showcase
+timings['import_package'] = time.perf_counter() - start
+start = time.perf_counter()
+google.showcase.EchoClient, google.showcase.IdentityClient
+timings['import_clients'] = time.perf_counter() - start
+from google.auth import credentials
+from google.api_core import client_options
+'''
+
+_CONSTRUCT = '''
+options = client_options.ClientOptions(api_endpoint=%(endpoint)r)
+if %(mtls)r:
+    options.client_cert_source = cert_source
+start = time.perf_counter()
+client = google.showcase.%(client)s(
+    credentials=credentials.AnonymousCredentials(),
+    client_options=options,
+)
+timings['construct'] = time.perf_counter() - start
+'''
+
+_FIRST_ECHO = '''
+start = time.perf_counter()
+response = client.echo(google.showcase.EchoRequest(content='cold start'))
+timings['first_rpc'] = time.perf_counter() - start
+assert response.content == 'cold start'
+'''
+
+_EPILOGUE = '''
+print(json.dumps(timings))
+'''
+
+
+def _scenarios(endpoint: str) -> Dict[str, str]:
+    def script(*parts, **params):
+        params.setdefault('mtls', False)
+        params.update(
+            endpoint=endpoint,
+            cert=showcase_server.CERT_FILE,
+            key=showcase_server.KEY_FILE,
+        )
+        return ''.join(p % params for p in (_PREAMBLE,) + parts + (_EPILOGUE,))
+
+    return {
+        'import': script(_IMPORT),
+        'construct_echo': script(_IMPORT, _CONSTRUCT, client='EchoClient'),
+        'construct_echo_mtls': script(
+            _IMPORT, _CONSTRUCT, client='EchoClient', mtls=True),
+        'construct_identity': script(
+            _IMPORT, _CONSTRUCT, client='IdentityClient'),
+        'construct_identity_mtls': script(
+            _IMPORT, _CONSTRUCT, client='IdentityClient', mtls=True),
+        'first_echo': script(
+            _IMPORT, _CONSTRUCT, _FIRST_ECHO, client='EchoClient'),
+        'first_echo_mtls': script(
+            _IMPORT, _CONSTRUCT, _FIRST_ECHO, client='EchoClient', mtls=True),
+    }
+
+
+def _run_sample(code: str) -> Dict[str, float]:
+    start = time.perf_counter()
+    output = subprocess.check_output(
+        [sys.executable, '-c', code],
+        env=showcase_server.client_environ(),
+        cwd=showcase_server.ROOT,
+    )
+    process = time.perf_counter() - start
+    timings = json.loads(output.decode().strip().splitlines()[-1])
+    timings['process'] = process
+    return timings
+
+
+def _summarize(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        'min': ordered[0],
+        'median': statistics.median(ordered),
+        'mean': statistics.mean(ordered),
+        'p90': ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))],
+        'max': ordered[-1],
+    }
+
+
+def run(repeat: int, scenarios: List[str] = None) -> dict:
+    """Run the benchmarks and return the results document."""
+    server, port = showcase_server.serve()
+    try:
+        available = _scenarios('localhost:{}'.format(port))
+        results = {}
+        for name in scenarios or available:
+            samples = {}  # type: Dict[str, List[float]]
+            for _ in range(repeat):
+                for phase, value in _run_sample(available[name]).items():
+                    samples.setdefault(phase, []).append(value)
+            results[name] = {
+                phase: _summarize(values) for phase, values in samples.items()
+            }
+            print('{:<26} {}'.format(name, '  '.join(
+                '{}={:.1f}ms'.format(phase, stats['median'] * 1e3)
+                for phase, stats in results[name].items())))
+    finally:
+        server.stop(None)
+
+    return {
+        'benchmark': 'cold_start',
+        'timestamp': datetime.datetime.utcnow().isoformat() + 'Z',
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'unit': 'seconds',
+        'results': results,
+    }
+
+
+def compare(results: dict, baseline: dict) -> None:
+    """Print the relative change of each median against a baseline."""
+    for name, phases in results['results'].items():
+        for phase, stats in phases.items():
+            try:
+                before = baseline['results'][name][phase]['median']
+            except KeyError:
+                continue
+            change = (stats['median'] - before) / before * 100 if before else 0
+            print('{:<26} {:<16} {:+6.1f}%'.format(name, phase, change))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Cold-start benchmarks for the showcase clients.')
+    parser.add_argument('--repeat', type=int, default=10,
+                        help='Fresh interpreters to run per scenario.')
+    parser.add_argument('--scenario', action='append', dest='scenarios',
+                        help='Scenario to run; may be repeated. '
+                             'Defaults to all of them.')
+    parser.add_argument('--output', help='Write the JSON results here.')
+    parser.add_argument('--baseline',
+                        help='Earlier JSON results to compare against.')
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat, args.scenarios)
+    if args.output:
+        with open(args.output, 'w') as fh:
+            json.dump(results, fh, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as fh:
+            compare(results, json.load(fh))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""A local stand-in for the showcase server, for benchmarks.
+
+It implements enough of the Echo and Identity services for the clients
+in this package to run against it, over TLS with the repository's
+``server.crt``/``server.key``. Client certificates are accepted but not
+required, so both plain and mutual TLS clients can connect.
+
+Clients trust the server when ``GRPC_DEFAULT_SSL_ROOTS_FILE_PATH`` points
+at ``server.crt``; see :func:`client_environ`.
+"""
+
+from concurrent import futures
+import itertools
+import os
+import threading
+from typing import Dict, Tuple
+
+import grpc  # type: ignore
+import proto  # type: ignore
+
+from google.protobuf import timestamp_pb2 as timestamp  # type: ignore
+from google.showcase_v1beta1.types import echo as gs_echo
+from google.showcase_v1beta1.types import identity
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CERT_FILE = os.path.join(ROOT, 'server.crt')
+KEY_FILE = os.path.join(ROOT, 'server.key')
+
+
+def read_cert_and_key() -> Tuple[bytes, bytes]:
+    """Return the PEM certificate and key bytes used by the server."""
+    with open(CERT_FILE, 'rb') as fh:
+        cert = fh.read()
+    with open(KEY_FILE, 'rb') as fh:
+        key = fh.read()
+    return cert, key
+
+
+def client_environ() -> Dict[str, str]:
+    """Return an environment in which gRPC clients trust the server."""
+    environ = dict(os.environ)
+    environ['GRPC_DEFAULT_SSL_ROOTS_FILE_PATH'] = CERT_FILE
+    return environ
+
+
+class _Empty(proto.Message):
+    """A stand-in for ``google.protobuf.Empty``."""
+
+
+def _words(content):
+    return content.split(' ') if content else []
+
+
+class _Echo(object):
+    def echo(self, request, context):
+        return gs_echo.EchoResponse(content=request.content)
+
+    def expand(self, request, context):
+        for word in _words(request.content):
+            yield gs_echo.EchoResponse(content=word)
+
+    def collect(self, request_iterator, context):
+        return gs_echo.EchoResponse(
+            content=' '.join(r.content for r in request_iterator))
+
+    def chat(self, request_iterator, context):
+        for request in request_iterator:
+            yield gs_echo.EchoResponse(content=request.content)
+
+    def paged_expand(self, request, context):
+        words = _words(request.content)
+        start = int(request.page_token or 0)
+        size = request.page_size or len(words) or 1
+        end = min(start + size, len(words))
+        return gs_echo.PagedExpandResponse(
+            responses=[gs_echo.EchoResponse(content=w) for w in words[start:end]],
+            next_page_token=str(end) if end < len(words) else '',
+        )
+
+    def block(self, request, context):
+        return request.success or gs_echo.BlockResponse()
+
+
+class _Identity(object):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._users = {}  # type: Dict[str, identity.User]
+        self._ids = itertools.count(1)
+
+    def _now(self):
+        now = timestamp.Timestamp()
+        now.GetCurrentTime()
+        return now
+
+    def _get(self, name, context):
+        try:
+            return self._users[name]
+        except KeyError:
+            context.abort(grpc.StatusCode.NOT_FOUND, 'User not found: ' + name)
+
+    def create_user(self, request, context):
+        with self._lock:
+            user = identity.User(request.user)
+            user.name = 'users/{}'.format(next(self._ids))
+            user.create_time = user.update_time = self._now()
+            self._users[user.name] = user
+            return user
+
+    def get_user(self, request, context):
+        with self._lock:
+            return self._get(request.name, context)
+
+    def update_user(self, request, context):
+        with self._lock:
+            user = self._get(request.user.name, context)
+            user.display_name = request.user.display_name
+            user.email = request.user.email
+            user.update_time = self._now()
+            return user
+
+    def delete_user(self, request, context):
+        with self._lock:
+            self._get(request.name, context)
+            del self._users[request.name]
+        return _Empty()
+
+    def list_users(self, request, context):
+        with self._lock:
+            names = sorted(self._users)
+            start = int(request.page_token or 0)
+            end = min(start + (request.page_size or 100), len(names))
+            return identity.ListUsersResponse(
+                users=[self._users[n] for n in names[start:end]],
+                next_page_token=str(end) if end < len(names) else '',
+            )
+
+
+def _handler(service, methods):
+    handlers = {}
+    for name, (kind, func, request_type, response_type) in methods.items():
+        factory = getattr(grpc, kind + '_rpc_method_handler')
+        handlers[name] = factory(
+            func,
+            request_deserializer=request_type.deserialize,
+            response_serializer=response_type.serialize,
+        )
+    return grpc.method_handlers_generic_handler(service, handlers)
+
+
+def serve(port: int = 0, max_workers: int = 16) -> Tuple[grpc.Server, int]:
+    """Start the stand-in server.
+
+    Args:
+        port (int): The port to listen on; ``0`` picks a free one.
+        max_workers (int): The size of the server thread pool.
+
+    Returns:
+        Tuple[grpc.Server, int]: The started server and its port.
+    """
+    echo, users = _Echo(), _Identity()
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
+    server.add_generic_rpc_handlers((
+        _handler('google.showcase.v1beta1.Echo', {
+            'Echo': ('unary_unary', echo.echo, gs_echo.EchoRequest, gs_echo.EchoResponse),
+            'Expand': ('unary_stream', echo.expand, gs_echo.ExpandRequest, gs_echo.EchoResponse),
+            'Collect': ('stream_unary', echo.collect, gs_echo.EchoRequest, gs_echo.EchoResponse),
+            'Chat': ('stream_stream', echo.chat, gs_echo.EchoRequest, gs_echo.EchoResponse),
+            'PagedExpand': ('unary_unary', echo.paged_expand, gs_echo.PagedExpandRequest, gs_echo.PagedExpandResponse),
+            'Block': ('unary_unary', echo.block, gs_echo.BlockRequest, gs_echo.BlockResponse),
+        }),
+        _handler('google.showcase.v1beta1.Identity', {
+            'CreateUser': ('unary_unary', users.create_user, identity.CreateUserRequest, identity.User),
+            'GetUser': ('unary_unary', users.get_user, identity.GetUserRequest, identity.User),
+            'UpdateUser': ('unary_unary', users.update_user, identity.UpdateUserRequest, identity.User),
+            'DeleteUser': ('unary_unary', users.delete_user, identity.DeleteUserRequest, _Empty),
+            'ListUsers': ('unary_unary', users.list_users, identity.ListUsersRequest, identity.ListUsersResponse),
+        }),
+    ))
+
+    cert, key = read_cert_and_key()
+    credentials = grpc.ssl_server_credentials(
+        [(key, cert)],
+        root_certificates=cert,
+        require_client_auth=False,
+    )
+    port = server.add_secure_port('localhost:{}'.format(port), credentials)
+    server.start()
+    return server, port
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--port', type=int, default=7469)
+    args = parser.parse_args()
+
+    server, port = serve(args.port)
+    print('Serving on localhost:{}'.format(port))
+    server.wait_for_termination()
@@ -15,37 +15,85 @@
 # limitations under the License.
 #
 
+import importlib
+import sys
+import typing
+
+if typing.TYPE_CHECKING or sys.version_info < (3, 7):
+    from google.showcase_v1beta1.services.echo.async_client import EchoAsyncClient
+    from google.showcase_v1beta1.services.echo.client import EchoClient
+    from google.showcase_v1beta1.services.identity.async_client import IdentityAsyncClient
+    from google.showcase_v1beta1.services.identity.client import IdentityClient
+    from google.showcase_v1beta1.types.echo import BlockRequest
+    from google.showcase_v1beta1.types.echo import BlockResponse
+    from google.showcase_v1beta1.types.echo import EchoRequest
+    from google.showcase_v1beta1.types.echo import EchoResponse
+    from google.showcase_v1beta1.types.echo import ExpandRequest
+    from google.showcase_v1beta1.types.echo import PagedExpandRequest
+    from google.showcase_v1beta1.types.echo import PagedExpandResponse
+    from google.showcase_v1beta1.types.echo import WaitMetadata
+    from google.showcase_v1beta1.types.echo import WaitRequest
+    from google.showcase_v1beta1.types.echo import WaitResponse
+    from google.showcase_v1beta1.types.identity import CreateUserRequest
+    from google.showcase_v1beta1.types.identity import DeleteUserRequest
+    from google.showcase_v1beta1.types.identity import GetUserRequest
+    from google.showcase_v1beta1.types.identity import ListUsersRequest
+    from google.showcase_v1beta1.types.identity import ListUsersResponse
+    from google.showcase_v1beta1.types.identity import UpdateUserRequest
+    from google.showcase_v1beta1.types.identity import User
+else:
+    # Resolve each public name on first access (PEP 562), so that importing
+    # this package does not pull in every client, transport and message.
+    _LAZY_ATTRIBUTES = {
+        'EchoAsyncClient': 'google.showcase_v1beta1.services.echo.async_client',
+        'EchoClient': 'google.showcase_v1beta1.services.echo.client',
+        'IdentityAsyncClient': 'google.showcase_v1beta1.services.identity.async_client',
+        'IdentityClient': 'google.showcase_v1beta1.services.identity.client',
+        'BlockRequest': 'google.showcase_v1beta1.types.echo',
+        'BlockResponse': 'google.showcase_v1beta1.types.echo',
+        'EchoRequest': 'google.showcase_v1beta1.types.echo',
+        'EchoResponse': 'google.showcase_v1beta1.types.echo',
+        'ExpandRequest': 'google.showcase_v1beta1.types.echo',
+        'PagedExpandRequest': 'google.showcase_v1beta1.types.echo',
+        'PagedExpandResponse': 'google.showcase_v1beta1.types.echo',
+        'WaitMetadata': 'google.showcase_v1beta1.types.echo',
+        'WaitRequest': 'google.showcase_v1beta1.types.echo',
+        'WaitResponse': 'google.showcase_v1beta1.types.echo',
+        'CreateUserRequest': 'google.showcase_v1beta1.types.identity',
+        'DeleteUserRequest': 'google.showcase_v1beta1.types.identity',
+        'GetUserRequest': 'google.showcase_v1beta1.types.identity',
+        'ListUsersRequest': 'google.showcase_v1beta1.types.identity',
+        'ListUsersResponse': 'google.showcase_v1beta1.types.identity',
+        'UpdateUserRequest': 'google.showcase_v1beta1.types.identity',
+        'User': 'google.showcase_v1beta1.types.identity',
+    }
+
+    def __getattr__(name):
+        try:
+            module_name = _LAZY_ATTRIBUTES[name]
+        except KeyError:
+            raise AttributeError('module {!r} has no attribute {!r}'.format(
+                __name__, name)) from None
+        value = getattr(importlib.import_module(module_name, __name__), name)
+        globals()[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(globals()) | set(__all__))
 
-from google.showcase_v1beta1.services.echo.client import EchoClient
-from google.showcase_v1beta1.services.identity.client import IdentityClient
-from google.showcase_v1beta1.types.echo import BlockRequest
-from google.showcase_v1beta1.types.echo import BlockResponse
-from google.showcase_v1beta1.types.echo import EchoRequest
-from google.showcase_v1beta1.types.echo import EchoResponse
-from google.showcase_v1beta1.types.echo import ExpandRequest
-from google.showcase_v1beta1.types.echo import PagedExpandRequest
-from google.showcase_v1beta1.types.echo import PagedExpandResponse
-from google.showcase_v1beta1.types.echo import WaitMetadata
-from google.showcase_v1beta1.types.echo import WaitRequest
-from google.showcase_v1beta1.types.echo import WaitResponse
-from google.showcase_v1beta1.types.identity import CreateUserRequest
-from google.showcase_v1beta1.types.identity import DeleteUserRequest
-from google.showcase_v1beta1.types.identity import GetUserRequest
-from google.showcase_v1beta1.types.identity import ListUsersRequest
-from google.showcase_v1beta1.types.identity import ListUsersResponse
-from google.showcase_v1beta1.types.identity import UpdateUserRequest
-from google.showcase_v1beta1.types.identity import User
 
 __all__ = (
     'BlockRequest',
     'BlockResponse',
     'CreateUserRequest',
     'DeleteUserRequest',
+    'EchoAsyncClient',
     'EchoClient',
     'EchoRequest',
     'EchoResponse',
     'ExpandRequest',
     'GetUserRequest',
+    'IdentityAsyncClient',
     'IdentityClient',
     'ListUsersRequest',
     'ListUsersResponse',
@@ -15,26 +15,71 @@
 # limitations under the License.
 #
 
+import importlib
+import sys
+import typing
 
-from .services.echo import EchoClient
-from .services.identity import IdentityClient
-from .types.echo import BlockRequest
-from .types.echo import BlockResponse
-from .types.echo import EchoRequest
-from .types.echo import EchoResponse
-from .types.echo import ExpandRequest
-from .types.echo import PagedExpandRequest
-from .types.echo import PagedExpandResponse
-from .types.echo import WaitMetadata
-from .types.echo import WaitRequest
-from .types.echo import WaitResponse
-from .types.identity import CreateUserRequest
-from .types.identity import DeleteUserRequest
-from .types.identity import GetUserRequest
-from .types.identity import ListUsersRequest
-from .types.identity import ListUsersResponse
-from .types.identity import UpdateUserRequest
-from .types.identity import User
+if typing.TYPE_CHECKING or sys.version_info < (3, 7):
+    from .services.echo import EchoAsyncClient
+    from .services.echo import EchoClient
+    from .services.identity import IdentityAsyncClient
+    from .services.identity import IdentityClient
+    from .types.echo import BlockRequest
+    from .types.echo import BlockResponse
+    from .types.echo import EchoRequest
+    from .types.echo import EchoResponse
+    from .types.echo import ExpandRequest
+    from .types.echo import PagedExpandRequest
+    from .types.echo import PagedExpandResponse
+    from .types.echo import WaitMetadata
+    from .types.echo import WaitRequest
+    from .types.echo import WaitResponse
+    from .types.identity import CreateUserRequest
+    from .types.identity import DeleteUserRequest
+    from .types.identity import GetUserRequest
+    from .types.identity import ListUsersRequest
+    from .types.identity import ListUsersResponse
+    from .types.identity import UpdateUserRequest
+    from .types.identity import User
+else:
+    # Resolve each public name on first access (PEP 562), so that importing
+    # this package does not pull in every client, transport and message.
+    _LAZY_ATTRIBUTES = {
+        'EchoAsyncClient': '.services.echo',
+        'EchoClient': '.services.echo',
+        'IdentityAsyncClient': '.services.identity',
+        'IdentityClient': '.services.identity',
+        'BlockRequest': '.types.echo',
+        'BlockResponse': '.types.echo',
+        'EchoRequest': '.types.echo',
+        'EchoResponse': '.types.echo',
+        'ExpandRequest': '.types.echo',
+        'PagedExpandRequest': '.types.echo',
+        'PagedExpandResponse': '.types.echo',
+        'WaitMetadata': '.types.echo',
+        'WaitRequest': '.types.echo',
+        'WaitResponse': '.types.echo',
+        'CreateUserRequest': '.types.identity',
+        'DeleteUserRequest': '.types.identity',
+        'GetUserRequest': '.types.identity',
+        'ListUsersRequest': '.types.identity',
+        'ListUsersResponse': '.types.identity',
+        'UpdateUserRequest': '.types.identity',
+        'User': '.types.identity',
+    }
+
+    def __getattr__(name):
+        try:
+            module_name = _LAZY_ATTRIBUTES[name]
+        except KeyError:
+            raise AttributeError('module {!r} has no attribute {!r}'.format(
+                __name__, name)) from None
+        value = getattr(importlib.import_module(module_name, __name__), name)
+        globals()[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(globals()) | set(__all__))
 
 
 __all__ = (
@@ -42,6 +87,7 @@ __all__ = (
     'BlockResponse',
     'CreateUserRequest',
     'DeleteUserRequest',
+    'EchoAsyncClient',
     'EchoClient',
     'EchoRequest',
     'EchoResponse',
@@ -56,5 +102,6 @@ __all__ = (
     'WaitMetadata',
     'WaitRequest',
     'WaitResponse',
+'IdentityAsyncClient',
 'IdentityClient',
 )
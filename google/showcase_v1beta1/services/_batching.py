@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Generator, Iterable, Optional
+
+from google.api_core import exceptions  # type: ignore
+
+import grpc  # type: ignore
+
+
+class BatchResult(object):
+    """The outcome of one request sent as part of a batch.
+
+    Attributes:
+        index (int): The position of the request in the batch.
+        request: The request which was sent.
+        response: The response, or ``None`` if the call failed.
+        exception (Optional[Exception]): The error the call failed with,
+            mapped to a :class:`google.api_core.exceptions.GoogleAPICallError`
+            where possible, or ``None`` if it succeeded.
+    """
+    __slots__ = ('index', 'request', 'response', 'exception')
+
+    def __init__(self,
+            index: int,
+            request: Any,
+            response: Any = None,
+            exception: Optional[BaseException] = None):
+        self.index = index
+        self.request = request
+        self.response = response  # type: Any
+        self.exception = exception
+
+    def result(self) -> Any:
+        """Return the response, or raise the error the call failed with."""
+        if self.exception is not None:
+            raise self.exception
+        return self.response
+
+    def __repr__(self) -> str:
+        return '{}(index={!r}, response={!r}, exception={!r})'.format(
+            self.__class__.__name__, self.index, self.response, self.exception)
+
+
+def _outcome(index, request, future):
+    # Runs as a done callback, so it must always produce a result; an
+    # exception escaping here would leave the batch waiting forever.
+    try:
+        return BatchResult(index, request, response=future.result())
+    except grpc.RpcError as exc:
+        try:
+            exc = exceptions.from_grpc_error(exc)
+        except Exception:
+            pass
+        return BatchResult(index, request, exception=exc)
+    except BaseException as exc:
+        return BatchResult(index, request, exception=exc)
+
+
+def run_windowed(
+        start: Callable[[Any], grpc.Future],
+        requests: Iterable[Any],
+        max_in_flight: int,
+        ordered: bool = True) -> Generator[BatchResult, None, None]:
+    """Send requests concurrently, with at most ``max_in_flight`` at once.
+
+    Args:
+        start (Callable[[Any], grpc.Future]): Starts the call for a request
+            without waiting for it, e.g. the ``future`` form of a stub.
+        requests (Iterable[Any]): The requests, consumed lazily.
+        max_in_flight (int): The most calls to have outstanding. When
+            ``ordered``, results waiting for an earlier one count too, so
+            memory stays bounded however slow the earliest call is.
+        ordered (bool): Yield results in request order, rather than as they
+            complete.
+
+    Yields:
+        BatchResult: The outcome of each request. A failed call does not
+            stop the batch.
+    """
+    if max_in_flight < 1:
+        raise ValueError('max_in_flight must be positive.')
+
+    requests = iter(requests)
+    completed = queue.Queue()  # type: queue.Queue
+    futures = {}  # type: Dict[int, grpc.Future]
+    finished = {}  # type: Dict[int, BatchResult]
+    started = yielded = 0
+    exhausted = False
+    try:
+        while True:
+            # Fill the window.
+            while not exhausted and started - yielded < max_in_flight:
+                try:
+                    request = next(requests)
+                except StopIteration:
+                    exhausted = True
+                    break
+                index, started = started, started + 1
+                try:
+                    future = start(request)
+                except Exception as exc:
+                    completed.put(BatchResult(index, request, exception=exc))
+                    continue
+                futures[index] = future
+                future.add_done_callback(
+                    lambda f, index=index, request=request:
+                        completed.put(_outcome(index, request, f)))
+
+            if yielded == started:
+                return
+
+            # Wait for a call to finish; yield what can be yielded.
+            result = completed.get()
+            futures.pop(result.index, None)
+            if not ordered:
+                yielded += 1
+                yield result
+                continue
+            finished[result.index] = result
+            while yielded in finished:
+                result = finished.pop(yielded)
+                yielded += 1
+                yield result
+    finally:
+        # The caller stopped early; do not leave calls running.
+        for future in futures.values():
+            future.cancel()
+
+
+class RateLimiter(object):
+    """Spaces out calls to at most ``rate`` per second.
+
+    A token bucket: up to ``burst`` calls may be made at once after a
+    quiet period, after which each :meth:`acquire` waits its turn. Waiting
+    callers are served in the order they arrived. It is safe to share
+    between threads.
+
+    Args:
+        rate (float): The most calls per second, on average.
+        burst (int): The most calls to allow at once.
+        clock (Callable[[], float]): The time source, in seconds.
+        sleep (Callable[[float], None]): Waits the given seconds.
+    """
+    def __init__(self,
+            rate: float,
+            burst: int = 1,
+            *,
+            clock: Callable[[], float] = time.monotonic,
+            sleep: Callable[[float], None] = time.sleep):
+        if rate <= 0:
+            raise ValueError('rate must be positive.')
+        if burst < 1:
+            raise ValueError('burst must be positive.')
+        self._rate = rate
+        self._burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = clock()
+
+    def acquire(self) -> None:
+        """Wait until a call may be made."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self._burst,
+                self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            # Take the token now, even if it is yet to come, so that later
+            # callers queue behind this one.
+            self._tokens -= 1
+            wait = -self._tokens / self._rate if self._tokens < 0 else 0
+        if wait:
+            self._sleep(wait)
+
+
+__all__ = (
+    'BatchResult',
+    'RateLimiter',
+    'run_windowed',
+)
@@ -0,0 +1,523 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import collections
+import hashlib
+import logging
+import threading
+import typing
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+import weakref
+
+from google.auth import credentials as ga_credentials  # type: ignore
+
+import grpc  # type: ignore
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def fingerprint(cert: bytes, key: bytes) -> str:
+    """Return a stable identity for a PEM certificate and private key."""
+    digest = hashlib.sha256()
+    digest.update(cert)
+    digest.update(b'\0')
+    digest.update(key)
+    return digest.hexdigest()
+
+
+def credentials_key(
+        credentials: Optional[ga_credentials.Credentials]) -> Hashable:
+    """Return the identity of call credentials for use in a pool key.
+
+    Anonymous credentials attach nothing to calls, so any two instances are
+    interchangeable; other credentials are only equal to themselves, and
+    None (credentials from the environment) is its own key.
+    """
+    if isinstance(credentials, ga_credentials.AnonymousCredentials):
+        return ga_credentials.AnonymousCredentials
+    return credentials
+
+
+class ChannelPool(object):
+    """A process-wide pool of gRPC channels shared between transports.
+
+    Channels are keyed by everything that makes them distinct (target,
+    credential identity and channel options), so that the Echo and Identity
+    transports talking to the same endpoint with the same credentials share
+    one channel, and thus one HTTP/2 connection and TLS handshake.
+
+    Channels are reference counted and closed when the last transport
+    using them releases its reference.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}  # type: Dict[Hashable, List[Any]]
+        self._keys = {}  # type: Dict[int, Hashable]
+
+    def acquire(self,
+            key: Hashable,
+            factory: Callable[[], grpc.Channel]) -> grpc.Channel:
+        """Return the channel for ``key``, creating it if needed.
+
+        Args:
+            key (Hashable): The identity of the channel.
+            factory (Callable[[], grpc.Channel]): Creates the channel when
+                the pool does not hold one for ``key``.
+
+        Returns:
+            grpc.Channel: The shared channel. Each call must be balanced by
+                a call to :meth:`release`.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                channel = factory()
+                entry = self._entries[key] = [channel, 0]
+                self._keys[id(channel)] = key
+            entry[1] += 1
+            return entry[0]
+
+    def release(self, channel: grpc.Channel) -> None:
+        """Drop a reference to ``channel``, closing it if it was the last."""
+        with self._lock:
+            key = self._keys.get(id(channel))
+            if key is None:
+                return
+            entry = self._entries[key]
+            entry[1] -= 1
+            if entry[1]:
+                return
+            del self._entries[key]
+            del self._keys[id(channel)]
+        channel.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+# The pool used by all transports in this process.
+POOL = ChannelPool()
+
+
+class SslCredentialsCache(object):
+    """A process-wide cache of client ``grpc.ChannelCredentials``.
+
+    Building SSL channel credentials parses the certificate and key every
+    time, and distinct credentials objects cannot share TLS session state.
+    Credentials are cached by the :func:`fingerprint` of the PEM bytes, so
+    that a ``client_cert_source`` returning the same certificate yields the
+    same credentials; a rotated certificate gets new ones. The least
+    recently used entries are evicted beyond ``maxsize``.
+    """
+    def __init__(self, maxsize: int = 16):
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()  # type: typing.OrderedDict[str, grpc.ChannelCredentials]
+
+    def get(self, cert: bytes, key: bytes) -> grpc.ChannelCredentials:
+        """Return the SSL channel credentials for a certificate and key.
+
+        Args:
+            cert (bytes): The client certificate chain, in PEM format.
+            key (bytes): The client private key, in PEM format.
+
+        Returns:
+            grpc.ChannelCredentials: The cached credentials.
+        """
+        identity = fingerprint(cert, key)
+        with self._lock:
+            try:
+                self._entries.move_to_end(identity)
+                return self._entries[identity]
+            except KeyError:
+                pass
+        ssl_credentials = grpc.ssl_channel_credentials(
+            certificate_chain=cert, private_key=key
+        )
+        with self._lock:
+            ssl_credentials = self._entries.setdefault(identity, ssl_credentials)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+        return ssl_credentials
+
+    def clear(self) -> None:
+        """Drop all cached credentials."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+# The SSL credentials cache used by all transports in this process.
+SSL_CREDENTIALS = SslCredentialsCache()
+
+
+class _DelegatingMultiCallable(object):
+    """Routes each call to a channel chosen by a :class:`_DelegatingChannel`.
+
+    The owner's ``_begin`` picks the channel and counts the call as
+    outstanding; ``_end`` is invoked once the call has terminated.
+    """
+    def __init__(self, owner, kind, method, kwargs):
+        self._owner = owner
+        self._kind = kind
+        self._method = method
+        self._kwargs = kwargs
+        self._callables = {}  # type: Dict[int, Any]
+
+    def _callable(self, channel):
+        try:
+            return self._callables[id(channel)][1]
+        except KeyError:
+            # Forget the callables of channels the owner no longer uses.
+            live = {id(c) for c in self._owner._channels_in_use()}
+            self._callables = {
+                k: v for k, v in self._callables.items() if k in live}
+            multicallable = getattr(channel, self._kind)(
+                self._method, **self._kwargs)
+            # Keep the channel alongside, so its id stays unique.
+            self._callables[id(channel)] = (channel, multicallable)
+            return multicallable
+
+    def _blocking(self, attr, request, kwargs):
+        channel = self._owner._begin()
+        try:
+            return getattr(self._callable(channel), attr)(request, **kwargs)
+        finally:
+            self._owner._end(channel)
+
+    def _tracked(self, attr, request, kwargs, add_callback):
+        channel = self._owner._begin()
+        try:
+            call = getattr(self._callable(channel), attr)(request, **kwargs)
+        except BaseException:
+            self._owner._end(channel)
+            raise
+        if not add_callback(call, lambda *_: self._owner._end(channel)):
+            # The call already terminated.
+            self._owner._end(channel)
+        return call
+
+
+def _add_done_callback(future, callback):
+    future.add_done_callback(callback)
+    return True
+
+
+def _add_callback(call, callback):
+    return call.add_callback(callback)
+
+
+class _UnaryUnaryMultiCallable(_DelegatingMultiCallable, grpc.UnaryUnaryMultiCallable):
+    def __call__(self, request, **kwargs):
+        return self._blocking('__call__', request, kwargs)
+
+    def with_call(self, request, **kwargs):
+        return self._blocking('with_call', request, kwargs)
+
+    def future(self, request, **kwargs):
+        return self._tracked('future', request, kwargs, _add_done_callback)
+
+
+class _UnaryStreamMultiCallable(_DelegatingMultiCallable, grpc.UnaryStreamMultiCallable):
+    def __call__(self, request, **kwargs):
+        return self._tracked('__call__', request, kwargs, _add_callback)
+
+
+class _StreamUnaryMultiCallable(_DelegatingMultiCallable, grpc.StreamUnaryMultiCallable):
+    def __call__(self, request_iterator, **kwargs):
+        return self._blocking('__call__', request_iterator, kwargs)
+
+    def with_call(self, request_iterator, **kwargs):
+        return self._blocking('with_call', request_iterator, kwargs)
+
+    def future(self, request_iterator, **kwargs):
+        return self._tracked(
+            'future', request_iterator, kwargs, _add_done_callback)
+
+
+class _StreamStreamMultiCallable(_DelegatingMultiCallable, grpc.StreamStreamMultiCallable):
+    def __call__(self, request_iterator, **kwargs):
+        return self._tracked('__call__', request_iterator, kwargs, _add_callback)
+
+
+class _DelegatingChannel(grpc.Channel):
+    """A ``grpc.Channel`` which hands each call to an underlying channel.
+
+    Subclasses decide which channel serves a call in :meth:`_begin`, and
+    are told when it has terminated through :meth:`_end`.
+    """
+    def _begin(self) -> grpc.Channel:
+        raise NotImplementedError
+
+    def _end(self, channel: grpc.Channel) -> None:
+        raise NotImplementedError
+
+    def _channels_in_use(self) -> List[grpc.Channel]:
+        raise NotImplementedError
+
+    def unary_unary(self, method, **kwargs):
+        return _UnaryUnaryMultiCallable(self, 'unary_unary', method, kwargs)
+
+    def unary_stream(self, method, **kwargs):
+        return _UnaryStreamMultiCallable(self, 'unary_stream', method, kwargs)
+
+    def stream_unary(self, method, **kwargs):
+        return _StreamUnaryMultiCallable(self, 'stream_unary', method, kwargs)
+
+    def stream_stream(self, method, **kwargs):
+        return _StreamStreamMultiCallable(self, 'stream_stream', method, kwargs)
+
+    def subscribe(self, callback, try_to_connect=False):
+        for channel in self._channels_in_use():
+            channel.subscribe(callback, try_to_connect=try_to_connect)
+
+    def unsubscribe(self, callback):
+        for channel in self._channels_in_use():
+            channel.unsubscribe(callback)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+
+class MultiChannel(_DelegatingChannel):
+    """A channel spreading calls across several independent channels.
+
+    A single channel is one HTTP/2 connection, and so is capped by that
+    connection's maximum number of concurrent streams. This sends each call
+    to the underlying channel with the fewest outstanding calls, breaking
+    ties in round-robin order, so that load spreads across connections.
+
+    Args:
+        channels (Sequence[grpc.Channel]): The channels to use. They should
+            not share subchannels (see the ``grpc.use_local_subchannel_pool``
+            channel option), or they will share one connection.
+    """
+    def __init__(self, channels):
+        if not channels:
+            raise ValueError('MultiChannel needs at least one channel.')
+        self._channels = list(channels)
+        self._outstanding = [0] * len(self._channels)
+        self._index = {id(c): i for i, c in enumerate(self._channels)}
+        self._next = 0
+        self._lock = threading.Lock()
+
+    @property
+    def channels(self) -> List[grpc.Channel]:
+        """The underlying channels."""
+        return list(self._channels)
+
+    @property
+    def outstanding(self) -> List[int]:
+        """The number of calls in flight on each underlying channel."""
+        with self._lock:
+            return list(self._outstanding)
+
+    def _begin(self):
+        with self._lock:
+            count = len(self._channels)
+            start = self._next
+            self._next = (start + 1) % count
+            best = start
+            for offset in range(1, count):
+                i = (start + offset) % count
+                if self._outstanding[i] < self._outstanding[best]:
+                    best = i
+            self._outstanding[best] += 1
+            return self._channels[best]
+
+    def _end(self, channel):
+        with self._lock:
+            self._outstanding[self._index[id(channel)]] -= 1
+
+    def _channels_in_use(self):
+        return self._channels
+
+    def close(self):
+        for channel in self._channels:
+            channel.close()
+
+
+def _refresh_periodically(ref, stop, interval):
+    # Holds only a weak reference, so an abandoned channel can be collected.
+    while not stop.wait(interval):
+        channel = ref()
+        if channel is None:
+            return
+        try:
+            channel.refresh()
+        except Exception:
+            _LOGGER.exception('Refreshing the client certificate failed.')
+        del channel
+
+
+class RotatingChannel(_DelegatingChannel):
+    """A mutual TLS channel which follows a rotating client certificate.
+
+    When the certificate returned by ``cert_source`` changes, a channel
+    with the new certificate is built alongside the current one. New calls
+    switch over once it is ``READY``; calls in flight on the old channel run
+    to completion, and the old channel is closed once they have drained.
+
+    Args:
+        cert_source (Callable[[], Tuple[bytes, bytes]]): Returns the client
+            certificate and private key, both in PEM format.
+        factory (Callable[[grpc.ChannelCredentials], grpc.Channel]): Creates
+            a channel using the given SSL credentials.
+        refresh_interval (Optional[float]): If set, check ``cert_source``
+            for a new certificate every ``refresh_interval`` seconds, from a
+            background thread. Otherwise call :meth:`refresh` as needed.
+    """
+    def __init__(self,
+            cert_source: Callable[[], Tuple[bytes, bytes]],
+            factory: Callable[[grpc.ChannelCredentials], grpc.Channel],
+            refresh_interval: float = None):
+        self._cert_source = cert_source
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._closed = False
+
+        cert, key = cert_source()
+        self._fingerprint = fingerprint(cert, key)
+        self._current = factory(SSL_CREDENTIALS.get(cert, key))
+        # The current and draining channels, with their outstanding calls.
+        self._outstanding = {id(self._current): [self._current, 0]}  # type: Dict[int, List[Any]]
+        # The fingerprint, channel and readiness of the next channel.
+        self._pending = None  # type: Optional[Tuple[str, grpc.Channel, grpc.Future]]
+
+        self._stop = threading.Event()
+        if refresh_interval:
+            threading.Thread(
+                target=_refresh_periodically,
+                args=(weakref.ref(self), self._stop, refresh_interval),
+                name='RotatingChannel-refresh',
+                daemon=True,
+            ).start()
+
+    @property
+    def channel(self) -> grpc.Channel:
+        """The channel new calls are sent to."""
+        with self._lock:
+            return self._current
+
+    def refresh(self) -> bool:
+        """Check for a new client certificate.
+
+        Returns:
+            bool: Whether a channel was started for a new certificate. It
+                takes over from the current channel once it is ready.
+        """
+        cert, key = self._cert_source()
+        identity = fingerprint(cert, key)
+        with self._lock:
+            if self._closed or identity == self._fingerprint:
+                return False
+            if self._pending is not None and self._pending[0] == identity:
+                return False
+
+        channel = self._factory(SSL_CREDENTIALS.get(cert, key))
+        ready = grpc.channel_ready_future(channel)
+        with self._lock:
+            superseded, self._pending = self._pending, (identity, channel, ready)
+            closed = self._closed
+        if superseded is not None:
+            # A newer certificate arrived before the last one was ready.
+            superseded[2].cancel()
+            superseded[1].close()
+        if closed:
+            ready.cancel()
+            channel.close()
+            return False
+        ready.add_done_callback(lambda _: self._promote(channel))
+        return True
+
+    def _promote(self, channel):
+        with self._lock:
+            if self._pending is None or self._pending[1] is not channel:
+                return
+            identity, _, ready = self._pending
+            if ready.cancelled():
+                return
+            self._pending = None
+            previous, self._current = self._current, channel
+            self._fingerprint = identity
+            self._outstanding[id(channel)] = [channel, 0]
+            drained = self._outstanding[id(previous)][1] == 0
+            if drained:
+                del self._outstanding[id(previous)]
+        if drained:
+            previous.close()
+
+    def _begin(self):
+        with self._lock:
+            self._outstanding[id(self._current)][1] += 1
+            return self._current
+
+    def _end(self, channel):
+        with self._lock:
+            entry = self._outstanding[id(channel)]
+            entry[1] -= 1
+            drained = (
+                not entry[1] and channel is not self._current
+                and not self._closed)
+            if drained:
+                del self._outstanding[id(channel)]
+        if drained:
+            # This runs in the call's completion callback, where gRPC may
+            # hold locks that closing the channel needs; close it elsewhere.
+            threading.Thread(
+                target=channel.close, name='RotatingChannel-close',
+                daemon=True).start()
+
+    def _channels_in_use(self):
+        with self._lock:
+            return [entry[0] for entry in self._outstanding.values()]
+
+    def close(self):
+        """Stop refreshing and close every channel, including draining ones."""
+        self._stop.set()
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            pending, self._pending = self._pending, None
+            channels = [entry[0] for entry in self._outstanding.values()]
+        if pending is not None:
+            pending[2].cancel()
+            channels.append(pending[1])
+        for channel in channels:
+            channel.close()
+
+
+__all__ = (
+    'ChannelPool',
+    'MultiChannel',
+    'POOL',
+    'RotatingChannel',
+    'SSL_CREDENTIALS',
+    'SslCredentialsCache',
+    'credentials_key',
+    'fingerprint',
+)
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from typing import Any, Callable, Dict, Sequence, Tuple
+
+from google.api_core import gapic_v1       # type: ignore
+from google.api_core import grpc_helpers   # type: ignore
+from google.api_core import grpc_helpers_async  # type: ignore
+
+
+class WrappedMethod(object):
+    """An RPC method wrapped once with retry, timeout and client info.
+
+    Transports build one of these per RPC at construction time, so the
+    ``google.api_core`` decorator stack is not rebuilt on every call. Calls
+    which end up with neither a retry nor a timeout in effect skip that
+    stack entirely and invoke the error-mapped RPC directly.
+
+    Args:
+        func (Callable): The low-level RPC method.
+        default_retry (Optional[google.api_core.retry.Retry]): The retry
+            applied when the caller does not provide one. If ``None``,
+            calls are not retried by default.
+        default_timeout (Optional[float]): The timeout applied when the
+            caller does not provide one. If ``None``, calls have no
+            deadline by default.
+        client_info (Optional[google.api_core.gapic_v1.client_info.ClientInfo]):
+            Client information sent as user-agent metadata on every call.
+    """
+    _wrap_method = staticmethod(gapic_v1.method.wrap_method)
+    _wrap_errors = staticmethod(grpc_helpers.wrap_errors)
+
+    def __init__(self,
+            func: Callable,
+            default_retry=None,
+            default_timeout: float = None,
+            client_info=gapic_v1.client_info.DEFAULT_CLIENT_INFO):
+        # A gRPC multi-callable, whose ``future`` form unary-unary methods
+        # support.
+        self._func = func  # type: Any
+        self._default_retry = default_retry
+        self._default_timeout = default_timeout
+        self._client_info = client_info
+        self._wrapped = self._wrap_method(
+            func,
+            default_retry=default_retry,
+            default_timeout=default_timeout,
+            client_info=client_info,
+        )
+        self._direct = self._wrap_errors(func)
+        self._metadata = ()  # type: Tuple[Tuple[str, str], ...]
+        if client_info is not None:
+            self._metadata = (client_info.to_grpc_metadata(),)
+
+    def __call__(self,
+            request: Any,
+            *,
+            retry=gapic_v1.method.DEFAULT,
+            timeout=gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = ()) -> Any:
+        if retry is gapic_v1.method.DEFAULT:
+            retry = self._default_retry
+        if timeout is gapic_v1.method.DEFAULT:
+            timeout = self._default_timeout
+
+        # Fast path: nothing to decorate, so call straight through.
+        if retry is None and timeout is None:
+            return self._direct(
+                request,
+                metadata=tuple(metadata or ()) + self._metadata,
+            )
+
+        return self._wrapped(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+    def rebind(self, func: Callable) -> 'WrappedMethod':
+        """Wrap another RPC method the way this one is wrapped.
+
+        Args:
+            func (Callable): The low-level RPC method.
+
+        Returns:
+            WrappedMethod: A wrapper of ``func`` with the same default
+                retry, timeout and client info.
+        """
+        return type(self)(
+            func,
+            default_retry=self._default_retry,
+            default_timeout=self._default_timeout,
+            client_info=self._client_info,
+        )
+
+    def future(self,
+            request: Any,
+            *,
+            timeout=gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = ()) -> Any:
+        """Start the RPC without waiting for its response.
+
+        Only unary-unary methods support this. Calls are not retried, and
+        errors are raised by the returned future as ``grpc.RpcError``.
+
+        Returns:
+            grpc.Future: The future of the response.
+        """
+        if timeout is gapic_v1.method.DEFAULT:
+            timeout = self._default_timeout
+        return self._func.future(
+            request,
+            timeout=timeout,
+            metadata=tuple(metadata or ()) + self._metadata,
+        )
+
+
+class AsyncWrappedMethod(WrappedMethod):
+    """A :class:`WrappedMethod` for ``grpc.aio`` RPC methods.
+
+    Calling it returns the ``grpc.aio`` call, to be awaited or iterated.
+    """
+    _wrap_method = staticmethod(gapic_v1.method_async.wrap_method)
+    _wrap_errors = staticmethod(grpc_helpers_async.wrap_errors)
+
+
+class LazyWrappedMethods(Dict[str, WrappedMethod]):
+    """The wrapped methods of a transport, each wrapped on first use.
+
+    Transports which do not precompute their wrapped methods get one of
+    these instead, so methods they do not implement are never touched.
+
+    Args:
+        wrap (Callable[[str], WrappedMethod]): Wraps the method of a name.
+    """
+    def __init__(self, wrap: Callable[[str], WrappedMethod]):
+        super().__init__()
+        self._wrap = wrap
+
+    def __missing__(self, name: str) -> WrappedMethod:
+        method = self[name] = self._wrap(name)
+        return method
+
+
+__all__ = (
+    'AsyncWrappedMethod',
+    'LazyWrappedMethods',
+    'WrappedMethod',
+)
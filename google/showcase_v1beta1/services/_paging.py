@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+import queue
+import threading
+from typing import Any, AsyncGenerator, Awaitable, Callable, Generator, Optional
+
+
+# Marks the last page.
+_END = object()
+
+
+class _Failure(object):
+    __slots__ = ('exception',)
+
+    def __init__(self, exception):
+        self.exception = exception
+
+
+def _fetch_ahead(token, fetch, pages, room, stop):
+    try:
+        while token:
+            room.acquire()
+            if stop.is_set():
+                return
+            page = fetch(token)
+            pages.put(page)
+            token = page.next_page_token
+    except Exception as exc:
+        pages.put(_Failure(exc))
+    else:
+        pages.put(_END)
+
+
+def prefetch_pages(
+        response: Any,
+        fetch: Callable[[str], Any],
+        depth: int) -> Generator[Any, None, None]:
+    """Yield a page and the pages after it, fetching them in the background.
+
+    A thread requests each page as soon as the one before it arrives, so
+    fetching overlaps with the caller's use of earlier pages. The thread
+    runs at most ``depth`` pages ahead of the caller, counting the page
+    being fetched, and pauses there. Closing the generator stops the
+    thread, once any request it has in flight returns.
+
+    Args:
+        response (Any): The first page, with a ``next_page_token``.
+        fetch (Callable[[str], Any]): Fetches the page for a page token.
+        depth (int): The most pages to fetch ahead of the caller.
+
+    Raises:
+        ValueError: If ``depth`` is less than one.
+    """
+    if depth < 1:
+        raise ValueError('depth must be positive.')
+    return _prefetched(response, fetch, depth)
+
+
+def _prefetched(response, fetch, depth):
+    if not response.next_page_token:
+        yield response
+        return
+
+    pages = queue.Queue()  # type: queue.Queue
+    room = threading.Semaphore(depth)
+    stop = threading.Event()
+    threading.Thread(
+        target=_fetch_ahead,
+        args=(response.next_page_token, fetch, pages, room, stop),
+        name='PagePrefetch',
+        daemon=True,
+    ).start()
+
+    try:
+        yield response
+        while True:
+            page = pages.get()
+            if page is _END:
+                return
+            if isinstance(page, _Failure):
+                raise page.exception
+            room.release()
+            yield page
+    finally:
+        stop.set()
+        # Wake the thread if it is waiting for room, so it sees ``stop``.
+        room.release()
+
+
+async def _fetch_ahead_async(token, fetch, pages, room):
+    try:
+        while token:
+            await room.acquire()
+            page = await fetch(token)
+            pages.put_nowait(page)
+            token = page.next_page_token
+    except asyncio.CancelledError:
+        raise
+    except Exception as exc:
+        pages.put_nowait(_Failure(exc))
+    else:
+        pages.put_nowait(_END)
+
+
+def prefetch_pages_async(
+        response: Any,
+        fetch: Callable[[str], Awaitable[Any]],
+        depth: int) -> AsyncGenerator[Any, None]:
+    """The asyncio version of :func:`prefetch_pages`.
+
+    A task, rather than a thread, fetches ahead. Closing the generator
+    with ``aclose()`` cancels the task, with any request it has in flight.
+
+    Args:
+        response (Any): The first page, with a ``next_page_token``.
+        fetch (Callable[[str], Awaitable[Any]]): Fetches the page for a
+            page token.
+        depth (int): The most pages to fetch ahead of the caller.
+
+    Raises:
+        ValueError: If ``depth`` is less than one.
+    """
+    if depth < 1:
+        raise ValueError('depth must be positive.')
+    return _prefetched_async(response, fetch, depth)
+
+
+async def _prefetched_async(response, fetch, depth):
+    if not response.next_page_token:
+        yield response
+        return
+
+    pages = asyncio.Queue()  # type: asyncio.Queue
+    room = asyncio.Semaphore(depth)
+    task = asyncio.ensure_future(_fetch_ahead_async(
+        response.next_page_token, fetch, pages, room))
+
+    try:
+        yield response
+        while True:
+            page = await pages.get()
+            if page is _END:
+                return
+            if isinstance(page, _Failure):
+                raise page.exception
+            room.release()
+            yield page
+    finally:
+        task.cancel()
+
+
+class AdaptivePageSize(object):
+    """Chooses the size of each page from how the pages before it went.
+
+    After each page, the next size is scaled by how far the page was from
+    ``target_latency`` and, if set, from ``target_bytes``, whichever calls
+    for the smaller page. A size grows at most twofold and shrinks at most
+    fourfold per page, and always stays within ``min_size`` and
+    ``max_size``. Slow or large pages therefore shrink quickly, while fast,
+    small pages grow steadily, whether the endpoint is near or far.
+
+    Example::
+
+        pager = client.list_users(
+            adaptive_page_size=pagers.AdaptivePageSize(max_size=500))
+
+    Args:
+        min_size (int): The smallest page size to request.
+        max_size (int): The largest page size to request.
+        target_latency (float): The seconds each page should take.
+        target_bytes (Optional[int]): The most bytes a page should carry.
+            If None, payload size is not considered.
+        initial_size (Optional[int]): The size of the first adjusted
+            request. If None, the size of the original request is kept
+            until a page has been observed.
+    """
+    _MAX_GROWTH = 2.0
+    _MAX_SHRINK = 0.25
+
+    def __init__(self, *,
+            min_size: int = 1,
+            max_size: int = 1000,
+            target_latency: float = 0.25,
+            target_bytes: int = None,
+            initial_size: int = None):
+        if not 1 <= min_size <= max_size:
+            raise ValueError('Page sizes must satisfy 1 <= min_size <= max_size.')
+        if target_latency <= 0:
+            raise ValueError('target_latency must be positive.')
+        if target_bytes is not None and target_bytes <= 0:
+            raise ValueError('target_bytes must be positive.')
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_latency = target_latency
+        self.target_bytes = target_bytes
+        self._size = None if initial_size is None else self._clamp(initial_size)
+
+    def _clamp(self, size: float) -> int:
+        return max(self.min_size, min(self.max_size, int(size)))
+
+    @property
+    def size(self) -> Optional[int]:
+        """The page size to request next, or None to keep the current one."""
+        return self._size
+
+    def observe(self,
+            page_size: int,
+            items: int,
+            latency: float,
+            payload_bytes: int = None) -> int:
+        """Record how a page went, and choose the size of the next one.
+
+        Args:
+            page_size (int): The size the page was requested with, or 0 if
+                the server chose it.
+            items (int): The number of items the page held.
+            latency (float): The seconds the page took.
+            payload_bytes (Optional[int]): The serialized size of the page.
+
+        Returns:
+            int: The page size to request next.
+        """
+        size = page_size or items or self._size or self.min_size
+        factor = self.target_latency / max(latency, 1e-6)
+        if self.target_bytes and payload_bytes and items:
+            # Go by the bytes per item, as a page may hold fewer items
+            # than were asked for.
+            fitting = self.target_bytes * items / float(payload_bytes)
+            factor = min(factor, fitting / size)
+        factor = max(self._MAX_SHRINK, min(self._MAX_GROWTH, factor))
+        self._size = self._clamp(size * factor)
+        return self._size
+
+
+__all__ = (
+    'AdaptivePageSize',
+    'prefetch_pages',
+    'prefetch_pages_async',
+)
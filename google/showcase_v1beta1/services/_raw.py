@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from typing import Any, Callable, Dict, Tuple, Union
+
+from google.protobuf import message  # type: ignore
+
+from google.showcase_v1beta1.services._method import WrappedMethod
+
+
+RawMessage = Union[bytes, message.Message]
+
+
+def serialize(request: RawMessage) -> bytes:
+    """Serialize a protobuf message, passing bytes through unchanged."""
+    if isinstance(request, bytes):
+        return request
+    return request.SerializeToString()
+
+
+class RawMethods(object):
+    """The RPC methods of a transport, on ``*_pb2`` messages.
+
+    The stubs of a transport marshal every message through proto-plus.
+    These stubs share the transport's channel, but serialize ``*_pb2``
+    messages (or bytes) directly and parse responses into ``*_pb2``
+    messages, or leave them as bytes if ``decode`` is False. They are
+    wrapped with the same defaults as the transport's methods.
+
+    Subclasses list their methods in :attr:`_METHODS`.
+
+    Args:
+        transport: The transport whose channel and method defaults to use.
+        decode (bool): Whether to parse responses; if False, responses are
+            the serialized bytes.
+    """
+    # The gRPC path, the kind of channel method and the ``*_pb2`` response
+    # class of each method, keyed by name.
+    _METHODS = {}  # type: Dict[str, Tuple[str, str, Any]]
+
+    def __init__(self, transport, *, decode: bool = True):
+        self._transport = transport
+        self._decode = decode
+        self._wrapped_methods = {}  # type: Dict[str, WrappedMethod]
+
+    def rpc(self, name: str) -> WrappedMethod:
+        """Return the wrapped raw method of a name, creating it on first use.
+
+        Besides calling it, unary-unary methods may be started without
+        waiting, with its ``future`` method.
+
+        Args:
+            name (str): The name of the method, e.g. ``'echo'``.
+
+        Returns:
+            WrappedMethod: The method, taking and returning raw messages.
+        """
+        try:
+            return self._wrapped_methods[name]
+        except KeyError:
+            pass
+
+        path, kind, response_type = self._METHODS[name]
+        stub = getattr(self._transport.grpc_channel, kind)(
+            path,
+            request_serializer=serialize,
+            response_deserializer=response_type.FromString if self._decode else None,
+        )  # type: Callable
+        rpc = self._transport._wrapped_methods[name].rebind(stub)
+        self._wrapped_methods[name] = rpc
+        return rpc
+
+
+__all__ = (
+    'RawMethods',
+    'serialize',
+)
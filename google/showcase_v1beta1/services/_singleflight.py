@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Flight(object):
+    __slots__ = ('done', 'result', 'exception', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.exception = None  # type: Optional[BaseException]
+        self.waiters = 0
+
+
+class SingleFlight(object):
+    """Merges concurrent calls with the same key into one.
+
+    The first caller for a key runs the call; callers arriving with the
+    same key while it runs wait for it and receive its result, or its
+    exception. Once it finishes, the next caller starts a new call, so
+    nothing is cached.
+
+    Only idempotent calls should be merged: waiting callers rely on the
+    first caller's request, including its retry, timeout and metadata.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}  # type: Dict[Hashable, _Flight]
+        self._shared = 0
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run ``func``, or wait for the call already running for ``key``.
+
+        Args:
+            key (Hashable): Identifies calls which may be merged.
+            func (Callable[[], Any]): The call.
+
+        Returns:
+            Tuple[Any, bool]: The result, and whether it was shared with
+                other callers; a shared result should be copied before it
+                is changed.
+
+        Raises:
+            Exception: Whatever ``func`` raised.
+        """
+        with self._lock:
+            running = self._flights.get(key)
+            if running is None:
+                flight = self._flights[key] = _Flight()
+            else:
+                running.waiters += 1
+                self._shared += 1
+
+        if running is not None:
+            running.done.wait()
+            if running.exception is not None:
+                raise running.exception
+            return running.result, True
+
+        try:
+            flight.result = func()
+        except BaseException as exc:
+            flight.exception = exc
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result, flight.waiters > 0
+
+    @property
+    def shared(self) -> int:
+        """The number of calls answered by another caller's call."""
+        with self._lock:
+            return self._shared
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+
+__all__ = (
+    'SingleFlight',
+)
@@ -15,8 +15,31 @@
 # limitations under the License.
 #
 
+import sys
+import typing
+
 from .client import EchoClient
+from .raw import RawEchoClient
+from .chat import AsyncChatSession
+from .chat import ChatSession
+
+if typing.TYPE_CHECKING or sys.version_info < (3, 7):
+    from .async_client import EchoAsyncClient
+else:
+    # The async client is resolved on first access (PEP 562), so that the
+    # synchronous client does not load the asyncio transport.
+    def __getattr__(name):
+        if name != 'EchoAsyncClient':
+            raise AttributeError('module {!r} has no attribute {!r}'.format(
+                __name__, name))
+        from .async_client import EchoAsyncClient
+        globals()[name] = EchoAsyncClient
+        return EchoAsyncClient
 
 __all__ = (
     'EchoClient',
+    'EchoAsyncClient',
+    'RawEchoClient',
+    'ChatSession',
+    'AsyncChatSession',
 )
@@ -0,0 +1,548 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from collections import OrderedDict
+from typing import AsyncIterable, Dict, Iterable, Sequence, Tuple, Type, Union
+
+import google.api_core.client_options as ClientOptions # type: ignore
+from google.api_core import exceptions                 # type: ignore
+from google.api_core import gapic_v1                   # type: ignore
+from google.api_core import retry as retries           # type: ignore
+from google.auth import credentials                    # type: ignore
+
+from google.api_core import operation_async
+from google.rpc import status_pb2 as status  # type: ignore
+from google.showcase_v1beta1.services.echo import pagers
+from google.showcase_v1beta1.types import echo as gs_echo
+
+from .client import EchoClient
+from .transports.base import EchoTransport
+from .transports.grpc_asyncio import EchoGrpcAsyncIOTransport
+
+
+class _EchoAsyncTransportClient(EchoClient):
+    # Builds the transport of an EchoAsyncClient, choosing among the
+    # asyncio transports; it is never used to make calls.
+    _transport_registry = OrderedDict()  # type: Dict[str, Type[EchoTransport]]
+    _transport_registry['grpc_asyncio'] = EchoGrpcAsyncIOTransport
+
+
+class EchoAsyncClient:
+    """This service is used showcase the four main types of rpcs -
+    unary, server side streaming, client side streaming, and
+    bidirectional streaming. This service also exposes methods that
+    explicitly implement server delay, and paginated calls. Set the
+    'showcase-trailer' metadata key on any method to have the values
+    echoed in the response trailers.
+    """
+
+    DEFAULT_ENDPOINT = EchoClient.DEFAULT_ENDPOINT
+    DEFAULT_MTLS_ENDPOINT = EchoClient.DEFAULT_MTLS_ENDPOINT
+
+    @classmethod
+    def from_service_account_file(cls, filename: str, *args, **kwargs):
+        """Creates an instance of this client using the provided credentials
+        file.
+
+        Args:
+            filename (str): The path to the service account private key json
+                file.
+            args: Additional arguments to pass to the constructor.
+            kwargs: Additional arguments to pass to the constructor.
+
+        Returns:
+            {@api.name}: The constructed client.
+        """
+        return EchoClient.from_service_account_file.__func__(  # type: ignore
+            cls, filename, *args, **kwargs)
+
+    from_service_account_json = from_service_account_file
+
+    @classmethod
+    def get_transport_class(cls,
+            label: str = None,
+            ) -> Type[EchoTransport]:
+        """Return an appropriate transport class.
+
+        Args:
+            label: The name of the desired transport. If none is
+                provided, then the first transport in the registry is used.
+
+        Returns:
+            The transport class to use.
+        """
+        registry = _EchoAsyncTransportClient._transport_registry
+        if not label:
+            return next(iter(registry.values()))
+        try:
+            return registry[label]
+        except KeyError:
+            raise ValueError(
+                'Unknown asyncio transport {!r}; expected one of: {}.'.format(
+                    label, ', '.join(registry))) from None
+
+    def __init__(self, *,
+            credentials: credentials.Credentials = None,
+            transport: Union[str, EchoTransport] = 'grpc_asyncio',
+            client_options: ClientOptions.ClientOptions = None,
+            ) -> None:
+        """Instantiate the echo client.
+
+        Args:
+            credentials (Optional[google.auth.credentials.Credentials]): The
+                authorization credentials to attach to requests. These
+                credentials identify the application to the service; if none
+                are specified, the client will attempt to ascertain the
+                credentials from the environment.
+            transport (Union[str, ~.EchoTransport]): The
+                transport to use. Defaults to the ``grpc_asyncio`` transport;
+                an instance must be an asyncio transport.
+            client_options (ClientOptions): Custom options for the client.
+                (1) The ``api_endpoint`` property can be used to override the
+                default endpoint provided by the client.
+                (2) If ``transport`` is not an instance, ``client_options`` can
+                be used to create a mutual TLS transport. If ``client_cert_source``
+                is provided, mutual TLS transport will be created with the given
+                ``api_endpoint`` or the default mTLS endpoint, and the client
+                SSL credentials obtained from ``client_cert_source``.
+
+        Raises:
+            ValueError: If ``transport`` is not an asyncio transport.
+            google.auth.exceptions.MutualTlsChannelError: If mutual TLS transport
+                creation failed for any reason.
+        """
+        # Calls are awaited on the transport, so it must be an asyncio one.
+        if isinstance(transport, EchoTransport):
+            if not isinstance(transport, EchoGrpcAsyncIOTransport):
+                raise ValueError(
+                    'EchoAsyncClient needs an asyncio transport, such as '
+                    'EchoGrpcAsyncIOTransport, not {}.'.format(
+                        type(transport).__name__))
+        else:
+            type(self).get_transport_class(transport)
+
+        # The synchronous client resolves the endpoint and builds the
+        # transport; calls are then made on the transport directly.
+        self._client = _EchoAsyncTransportClient(
+            credentials=credentials,
+            transport=transport,
+            client_options=client_options,
+        )
+
+    async def __aenter__(self) -> 'EchoAsyncClient':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        closed = self._client._transport.close()
+        if closed is not None:
+            await closed
+
+    async def echo(self,
+            request: gs_echo.EchoRequest = None,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> gs_echo.EchoResponse:
+        r"""This method simply echos the request. This method is
+        showcases unary rpcs.
+
+        Args:
+            request (:class:`~.gs_echo.EchoRequest`):
+                The request object. The request message used for the
+                Echo, Collect and Chat methods. If content is set in
+                this message then the request will succeed. If status is
+                set in  this message then the status will be returned as
+                an error.
+
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            ~.gs_echo.EchoResponse:
+                The response message for the Echo
+                methods.
+
+        """
+        # Create or coerce a protobuf request object.
+
+        request = gs_echo.EchoRequest(request)
+
+        # Look up the RPC method, wrapped once by the transport; this adds
+        # retry and timeout information, and friendly error handling.
+        rpc = self._client._transport._wrapped_methods['echo']
+
+        # Send the request.
+        response = await rpc(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+        # Done; return the response.
+        return response
+
+    def expand(self,
+            request: gs_echo.ExpandRequest = None,
+            *,
+            content: str = None,
+            error: status.Status = None,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> AsyncIterable[gs_echo.EchoResponse]:
+        r"""This method split the given content into words and
+        will pass each word back through the stream. This method
+        showcases server-side streaming rpcs.
+
+        Args:
+            request (:class:`~.gs_echo.ExpandRequest`):
+                The request object. The request message for the Expand
+                method.
+            content (:class:`str`):
+                The content that will be split into
+                words and returned on the stream.
+                This corresponds to the ``content`` field
+                on the ``request`` instance; if ``request`` is provided, this
+                should not be set.
+            error (:class:`~.status.Status`):
+                The error that is thrown after all
+                words are sent on the stream.
+                This corresponds to the ``error`` field
+                on the ``request`` instance; if ``request`` is provided, this
+                should not be set.
+
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            AsyncIterable[~.gs_echo.EchoResponse]:
+                The response message for the Echo
+                methods.
+
+        """
+        # Create or coerce a protobuf request object.
+        # Sanity check: If we got a request object, we should *not* have
+        # gotten any keyword arguments that map to the request.
+        if request is not None and any([content, error]):
+            raise ValueError('If the `request` argument is set, then none of '
+                             'the individual field arguments should be set.')
+
+        request = gs_echo.ExpandRequest(request)
+
+        # If we have keyword arguments corresponding to fields on the
+        # request, apply these.
+
+        if content is not None:
+            request.content = content
+        if error is not None:
+            request.error = error
+
+        # Look up the RPC method, wrapped once by the transport; this adds
+        # retry and timeout information, and friendly error handling.
+        rpc = self._client._transport._wrapped_methods['expand']
+
+        # Send the request once iteration starts, and stream the responses.
+        async def responses():
+            stream = await rpc(
+                request,
+                retry=retry,
+                timeout=timeout,
+                metadata=metadata,
+            )
+            async for response in stream:
+                yield response
+
+        # Done; return the response.
+        return responses()
+
+    async def collect(self,
+            requests: Union[Iterable[gs_echo.EchoRequest], AsyncIterable[gs_echo.EchoRequest]] = None,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> gs_echo.EchoResponse:
+        r"""This method will collect the words given to it. When
+        the stream is closed by the client, this method will
+        return the a concatenation of the strings passed to it.
+        This method showcases client-side streaming rpcs.
+
+        Args:
+            requests (Union[Iterable[`~.gs_echo.EchoRequest`], AsyncIterable[`~.gs_echo.EchoRequest`]]):
+                The request object iterator, which may be asynchronous. The request message used for the
+                Echo, Collect and Chat methods. If content is set in
+                this message then the request will succeed. If status is
+                set in  this message then the status will be returned as
+                an error.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            ~.gs_echo.EchoResponse:
+                The response message for the Echo
+                methods.
+
+        """
+
+        # Look up the RPC method, wrapped once by the transport; this adds
+        # retry and timeout information, and friendly error handling.
+        rpc = self._client._transport._wrapped_methods['collect']
+
+        # Send the requests; the response arrives once the stream is closed.
+        call = await rpc(
+            requests,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+        response = await call
+
+        # Done; return the response.
+        return response
+
+    def chat(self,
+            requests: Union[Iterable[gs_echo.EchoRequest], AsyncIterable[gs_echo.EchoRequest]] = None,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> AsyncIterable[gs_echo.EchoResponse]:
+        r"""This method, upon receiving a request on the stream,
+        the same content will be passed  back on the stream.
+        This method showcases bidirectional streaming rpcs.
+
+        Args:
+            requests (Union[Iterable[`~.gs_echo.EchoRequest`], AsyncIterable[`~.gs_echo.EchoRequest`]]):
+                The request object iterator, which may be asynchronous. The request message used for the
+                Echo, Collect and Chat methods. If content is set in
+                this message then the request will succeed. If status is
+                set in  this message then the status will be returned as
+                an error.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            AsyncIterable[~.gs_echo.EchoResponse]:
+                The response message for the Echo
+                methods.
+
+        """
+
+        # Look up the RPC method, wrapped once by the transport; this adds
+        # retry and timeout information, and friendly error handling.
+        rpc = self._client._transport._wrapped_methods['chat']
+
+        # Send the request once iteration starts, and stream the responses.
+        async def responses():
+            stream = await rpc(
+                requests,
+                retry=retry,
+                timeout=timeout,
+                metadata=metadata,
+            )
+            async for response in stream:
+                yield response
+
+        # Done; return the response.
+        return responses()
+
+    async def paged_expand(self,
+            request: gs_echo.PagedExpandRequest = None,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            prefetch: int = 0,
+            adaptive_page_size: pagers.AdaptivePageSize = None,
+            ) -> pagers.PagedExpandAsyncPager:
+        r"""This is similar to the Expand method but instead of
+        returning a stream of expanded words, this method
+        returns a paged list of expanded words.
+
+        Args:
+            request (:class:`~.gs_echo.PagedExpandRequest`):
+                The request object. The request for the PagedExpand
+                method.
+
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+            prefetch (int): The most pages to request concurrently ahead
+                of the iteration; see :class:`~.pagers.PagedExpandAsyncPager`.
+            adaptive_page_size (~.pagers.AdaptivePageSize): Adjusts the
+                page size of the requests for further pages.
+
+        Returns:
+            ~.pagers.PagedExpandAsyncPager:
+                The response for the PagedExpand
+                method.
+                Iterating over this object will yield
+                results and resolve additional pages
+                automatically.
+
+        """
+        # Create or coerce a protobuf request object.
+
+        request = gs_echo.PagedExpandRequest(request)
+
+        # Look up the RPC method, wrapped once by the transport; this adds
+        # retry and timeout information, and friendly error handling.
+        rpc = self._client._transport._wrapped_methods['paged_expand']
+
+        # Send the request.
+        response = await rpc(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+        # This method is paged; wrap the response in a pager, which provides
+        # an `__aiter__` convenience method.
+        response = pagers.PagedExpandAsyncPager(
+            method=rpc,
+            request=request,
+            response=response,
+            prefetch=prefetch,
+            adaptive_page_size=adaptive_page_size,
+        )
+
+        # Done; return the response.
+        return response
+
+    async def wait(self,
+            request: gs_echo.WaitRequest = None,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> operation_async.AsyncOperation:
+        r"""This method will wait the requested amount of and
+        then return. This method showcases how a client handles
+        a request timing out.
+
+        Args:
+            request (:class:`~.gs_echo.WaitRequest`):
+                The request object. The request for Wait method.
+
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            ~.operation_async.AsyncOperation:
+                An object representing a long-running operation.
+
+                The result type for the operation will be
+                :class:``~.gs_echo.WaitResponse``: The result of the
+                Wait operation.
+
+        """
+        # Create or coerce a protobuf request object.
+
+        request = gs_echo.WaitRequest(request)
+
+        # Look up the RPC method, wrapped once by the transport; this adds
+        # retry and timeout information, and friendly error handling.
+        rpc = self._client._transport._wrapped_methods['wait']
+
+        # Send the request.
+        response = await rpc(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+        # Wrap the response in an operation future.
+        response = operation_async.from_gapic(
+            response,
+            self._client._transport.operations_client,
+            gs_echo.WaitResponse,
+            metadata_type=gs_echo.WaitMetadata,
+        )
+
+        # Done; return the response.
+        return response
+
+    async def block(self,
+            request: gs_echo.BlockRequest = None,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> gs_echo.BlockResponse:
+        r"""This method will block (wait) for the requested
+        amount of time  and then return the response or error.
+        This method showcases how a client handles delays or
+        retries.
+
+        Args:
+            request (:class:`~.gs_echo.BlockRequest`):
+                The request object. The request for Block method.
+
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            ~.gs_echo.BlockResponse:
+                The response for Block method.
+        """
+        # Create or coerce a protobuf request object.
+
+        request = gs_echo.BlockRequest(request)
+
+        # Look up the RPC method, wrapped once by the transport; this adds
+        # retry and timeout information, and friendly error handling.
+        rpc = self._client._transport._wrapped_methods['block']
+
+        # Send the request.
+        response = await rpc(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+        # Done; return the response.
+        return response
+
+
+__all__ = (
+    'EchoAsyncClient',
+)
@@ -0,0 +1,406 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+import collections
+import queue
+import threading
+from typing import TYPE_CHECKING, Any, Deque, Optional, Sequence, Tuple
+
+from google.api_core import gapic_v1  # type: ignore
+
+from google.showcase_v1beta1.types import echo as gs_echo
+
+from .client import EchoClient
+
+if TYPE_CHECKING:
+    from .async_client import EchoAsyncClient
+
+
+# Marks the end of the requests, and of the responses.
+_END = object()
+
+Exchange = Tuple[gs_echo.EchoRequest, gs_echo.EchoResponse]
+
+
+def _check_sendable(closed, ended):
+    """Raise if no more requests can be sent on a session's stream."""
+    if closed:
+        raise ValueError('The session is closed for sending.')
+    if ended is _END:
+        raise ValueError('The stream has ended.')
+    if ended is not None:
+        raise ValueError('The stream failed: {}'.format(ended)) from ended
+
+
+class ChatSession(object):
+    """A bidirectional ``chat`` stream which sends and receives at once.
+
+    Requests passed to :meth:`send` are streamed from a queue while a
+    background thread reads responses, so sending never waits for the
+    server's replies. Each response is paired with the request it echoes;
+    the server answers requests in order, so responses are matched to the
+    oldest unanswered request.
+
+    At most ``max_in_flight`` requests may be sent and not yet received;
+    :meth:`send` blocks beyond that, which bounds the memory held on both
+    sides of the stream. Once the stream has ended or failed, :meth:`send`
+    raises instead.
+
+    Example::
+
+        with ChatSession(client) as session:
+            session.send(gs_echo.EchoRequest(content='hello'))
+            request, response = session.recv()
+
+    Args:
+        client (~.EchoClient): The client to open the stream with.
+        max_in_flight (int): The most requests sent but not yet received.
+        timeout (float): The timeout for the whole stream.
+        metadata (Sequence[Tuple[str, str]]): Strings which should be
+            sent along with the stream as metadata.
+    """
+    def __init__(self,
+            client: EchoClient,
+            *,
+            max_in_flight: int = 32,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = ()):
+        if max_in_flight < 1:
+            raise ValueError('max_in_flight must be positive.')
+        self._max_in_flight = max_in_flight
+        self._lock = threading.Lock()
+        # Signalled when there is room in the window, or the stream ended.
+        self._room = threading.Condition(self._lock)
+        self._in_flight = 0
+        # How the stream ended: _END, the error it failed with, or None
+        # while it is open.
+        self._ended = None  # type: Any
+        self._pending = collections.deque()  # type: Deque[gs_echo.EchoRequest]
+        self._outbox = queue.Queue()  # type: queue.Queue
+        self._inbox = queue.Queue()  # type: queue.Queue
+        self._closed = False
+        self._cancelled = False
+        self._call = None  # type: Any
+
+        # The call is opened by the reader, as it does not return until the
+        # first response has arrived.
+        self._reader = threading.Thread(
+            target=self._read,
+            args=(client, timeout, metadata),
+            name='ChatSession-reader',
+            daemon=True,
+        )
+        self._reader.start()
+
+    def _requests(self):
+        while True:
+            request = self._outbox.get()
+            if request is _END:
+                return
+            yield request
+
+    def _read(self, client, timeout, metadata):
+        try:
+            call = client.chat(self._requests(), timeout=timeout, metadata=metadata)
+            with self._lock:
+                self._call = call
+                cancelled = self._cancelled
+            if cancelled:
+                call.cancel()
+            for response in call:
+                with self._lock:
+                    request = self._pending.popleft()
+                self._inbox.put((request, response))
+        except Exception as exc:
+            # Cancelling on close is not an error.
+            self._end(_END if self._cancelled else exc)
+        else:
+            self._end(_END)
+
+    def _end(self, outcome):
+        with self._room:
+            self._ended = outcome
+            self._room.notify_all()
+        self._inbox.put(outcome)
+
+    def send(self,
+            request: gs_echo.EchoRequest,
+            timeout: float = None) -> None:
+        """Send a request on the stream.
+
+        Args:
+            request (:class:`~.gs_echo.EchoRequest`): The request to send.
+            timeout (Optional[float]): How long to wait for room in the
+                window. Waits indefinitely if None.
+
+        Raises:
+            TimeoutError: If the window stayed full for ``timeout`` seconds.
+            ValueError: If sending was closed, or the stream has ended or
+                failed.
+        """
+        request = gs_echo.EchoRequest(request)
+        with self._room:
+            if not self._room.wait_for(
+                    lambda: (self._closed or self._ended is not None
+                             or self._in_flight < self._max_in_flight),
+                    timeout):
+                raise TimeoutError('No room in the window to send the request.')
+            _check_sendable(self._closed, self._ended)
+            self._in_flight += 1
+            self._pending.append(request)
+            self._outbox.put(request)
+
+    def recv(self, timeout: float = None) -> Optional[Exchange]:
+        """Receive the next response, with the request it answers.
+
+        Args:
+            timeout (Optional[float]): How long to wait for a response.
+                Waits indefinitely if None.
+
+        Returns:
+            Optional[Tuple[~.gs_echo.EchoRequest, ~.gs_echo.EchoResponse]]:
+                The request and its response, or None once the stream has
+                ended.
+
+        Raises:
+            TimeoutError: If no response arrived within ``timeout`` seconds.
+            google.api_core.exceptions.GoogleAPICallError: If the stream
+                failed.
+        """
+        try:
+            item = self._inbox.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError('No response within the timeout.') from None
+        # Leave the outcome for later calls too.
+        if item is _END:
+            self._inbox.put(item)
+            return None
+        if isinstance(item, Exception):
+            self._inbox.put(item)
+            raise item
+        with self._room:
+            self._in_flight -= 1
+            self._room.notify()
+        return item
+
+    def close_send(self) -> None:
+        """Signal that no more requests will be sent.
+
+        Responses to requests already sent can still be received.
+        """
+        with self._room:
+            if self._closed:
+                return
+            self._closed = True
+            self._outbox.put(_END)
+            self._room.notify_all()
+
+    def close(self) -> None:
+        """Stop sending and cancel the stream."""
+        self.close_send()
+        with self._lock:
+            self._cancelled = True
+            call = self._call
+        if call is not None:
+            call.cancel()
+
+    def __iter__(self):
+        """Receive every remaining response, with its request."""
+        while True:
+            exchange = self.recv()
+            if exchange is None:
+                return
+            yield exchange
+
+    def __enter__(self) -> 'ChatSession':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class AsyncChatSession(object):
+    """The asyncio version of :class:`ChatSession`.
+
+    A task reads responses while requests are sent, and :meth:`send`
+    waits while ``max_in_flight`` requests are unreceived. Once the stream
+    has ended or failed, :meth:`send` raises instead.
+
+    Example::
+
+        async with AsyncChatSession(client) as session:
+            await session.send(gs_echo.EchoRequest(content='hello'))
+            request, response = await session.recv()
+
+    Args:
+        client (~.EchoAsyncClient): The client to open the stream with.
+        max_in_flight (int): The most requests sent but not yet received.
+        timeout (float): The timeout for the whole stream.
+        metadata (Sequence[Tuple[str, str]]): Strings which should be
+            sent along with the stream as metadata.
+    """
+    def __init__(self,
+            client: 'EchoAsyncClient',
+            *,
+            max_in_flight: int = 32,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = ()):
+        if max_in_flight < 1:
+            raise ValueError('max_in_flight must be positive.')
+        self._max_in_flight = max_in_flight
+        # Notified when there is room in the window, or the stream ended.
+        self._room = asyncio.Condition()
+        self._in_flight = 0
+        # How the stream ended: _END, the error it failed with, or None
+        # while it is open.
+        self._ended = None  # type: Any
+        self._pending = collections.deque()  # type: Deque[gs_echo.EchoRequest]
+        self._outbox = asyncio.Queue()  # type: asyncio.Queue
+        self._inbox = asyncio.Queue()  # type: asyncio.Queue
+        self._closed = False
+        self._reader = asyncio.ensure_future(
+            self._read(client, timeout, metadata))
+
+    async def _requests(self):
+        while True:
+            request = await self._outbox.get()
+            if request is _END:
+                return
+            yield request
+
+    async def _read(self, client, timeout, metadata):
+        try:
+            async for response in client.chat(
+                    self._requests(), timeout=timeout, metadata=metadata):
+                self._inbox.put_nowait((self._pending.popleft(), response))
+        except asyncio.CancelledError:
+            await self._end(_END)
+            raise
+        except Exception as exc:
+            await self._end(exc)
+        else:
+            await self._end(_END)
+
+    async def _end(self, outcome):
+        self._ended = outcome
+        self._inbox.put_nowait(outcome)
+        await self._wake()
+
+    async def _wake(self):
+        async with self._room:
+            self._room.notify_all()
+
+    async def send(self,
+            request: gs_echo.EchoRequest,
+            timeout: float = None) -> None:
+        """Send a request on the stream.
+
+        Args:
+            request (:class:`~.gs_echo.EchoRequest`): The request to send.
+            timeout (Optional[float]): How long to wait for room in the
+                window. Waits indefinitely if None.
+
+        Raises:
+            asyncio.TimeoutError: If the window stayed full for ``timeout``
+                seconds.
+            ValueError: If sending was closed, or the stream has ended or
+                failed.
+        """
+        request = gs_echo.EchoRequest(request)
+        async with self._room:
+            await asyncio.wait_for(self._room.wait_for(
+                lambda: (self._closed or self._ended is not None
+                         or self._in_flight < self._max_in_flight)),
+                timeout)
+            _check_sendable(self._closed, self._ended)
+            self._in_flight += 1
+            self._pending.append(request)
+            self._outbox.put_nowait(request)
+
+    async def recv(self, timeout: float = None) -> Optional[Exchange]:
+        """Receive the next response, with the request it answers.
+
+        Args:
+            timeout (Optional[float]): How long to wait for a response.
+                Waits indefinitely if None.
+
+        Returns:
+            Optional[Tuple[~.gs_echo.EchoRequest, ~.gs_echo.EchoResponse]]:
+                The request and its response, or None once the stream has
+                ended.
+
+        Raises:
+            asyncio.TimeoutError: If no response arrived within ``timeout``
+                seconds.
+            google.api_core.exceptions.GoogleAPICallError: If the stream
+                failed.
+        """
+        item = await asyncio.wait_for(self._inbox.get(), timeout)
+        # Leave the outcome for later calls too.
+        if item is _END:
+            self._inbox.put_nowait(item)
+            return None
+        if isinstance(item, Exception):
+            self._inbox.put_nowait(item)
+            raise item
+        async with self._room:
+            self._in_flight -= 1
+            self._room.notify()
+        return item
+
+    def close_send(self) -> None:
+        """Signal that no more requests will be sent.
+
+        Responses to requests already sent can still be received.
+        """
+        if not self._closed:
+            self._closed = True
+            self._outbox.put_nowait(_END)
+            asyncio.ensure_future(self._wake())
+
+    async def close(self) -> None:
+        """Stop sending and cancel the stream."""
+        self.close_send()
+        self._reader.cancel()
+        try:
+            await self._reader
+        except asyncio.CancelledError:
+            pass
+
+    def __aiter__(self):
+        """Receive every remaining response, with its request."""
+        async def exchanges():
+            while True:
+                exchange = await self.recv()
+                if exchange is None:
+                    return
+                yield exchange
+
+        return exchanges()
+
+    async def __aenter__(self) -> 'AsyncChatSession':
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+
+__all__ = (
+    'AsyncChatSession',
+    'ChatSession',
+)
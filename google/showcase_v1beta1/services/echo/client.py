@@ -16,9 +16,9 @@
 #
 
 from collections import OrderedDict
+import functools
 import re
-from typing import Callable, Dict, Iterable, Iterator, Sequence, Tuple, Type, Union
-import pkg_resources
+from typing import Any, Callable, Dict, Iterable, Iterator, Sequence, Tuple, Type, Union, cast
 
 import google.api_core.client_options as ClientOptions # type: ignore
 from google.api_core import exceptions                 # type: ignore
@@ -29,11 +29,15 @@ from google.oauth2 import service_account              # type: ignore
 
 from google.api_core import operation
 from google.rpc import status_pb2 as status  # type: ignore
+from google.showcase_v1beta1.services import _batching
+from google.showcase_v1beta1.services import _singleflight
 from google.showcase_v1beta1.services.echo import pagers
 from google.showcase_v1beta1.types import echo as gs_echo
 
+from .raw import RawEchoClient
 from .transports.base import EchoTransport
 from .transports.grpc import EchoGrpcTransport
+from .transports.grpc_multichannel import EchoGrpcMultiChannelTransport
 
 
 class EchoClientMeta(type):
@@ -45,6 +49,7 @@ class EchoClientMeta(type):
     """
     _transport_registry = OrderedDict()  # type: Dict[str, Type[EchoTransport]]
     _transport_registry['grpc'] = EchoGrpcTransport
+    _transport_registry['grpc_multichannel'] = EchoGrpcMultiChannelTransport
 
     def get_transport_class(cls,
             label: str = None,
@@ -135,6 +140,7 @@ class EchoClient(metaclass=EchoClientMeta):
             credentials: credentials.Credentials = None,
             transport: Union[str, EchoTransport] = None,
             client_options: ClientOptions = None,
+            coalesce_reads: bool = False,
             ) -> None:
         """Instantiate the echo client.
 
@@ -155,6 +161,9 @@ class EchoClient(metaclass=EchoClientMeta):
                 is provided, mutual TLS transport will be created with the given
                 ``api_endpoint`` or the default mTLS endpoint, and the client
                 SSL credentials obtained from ``client_cert_source``.
+            coalesce_reads (bool): If True, concurrent ``paged_expand``
+                calls for the same page share one request, made with the
+                options of the first of them.
 
         Raises:
             google.auth.exceptions.MutualTlsChannelError: If mutual TLS transport
@@ -163,6 +172,9 @@ class EchoClient(metaclass=EchoClientMeta):
         if isinstance(client_options, dict):
             client_options = ClientOptions.from_dict(client_options)
 
+        self._single_flight = (
+            _singleflight.SingleFlight() if coalesce_reads else None)
+
         # Save or instantiate the transport.
         # Ordinarily, we provide the transport, but allowing a custom transport
         # instance provides an extensibility point for unusual situations.
@@ -200,18 +212,38 @@ class EchoClient(metaclass=EchoClientMeta):
                 else self.DEFAULT_ENDPOINT
             )
 
-            self._transport = EchoGrpcTransport(
+            # Every registered transport also takes the mTLS arguments,
+            # which EchoTransport itself does not declare.
+            Transport = type(self).get_transport_class(transport)
+            self._transport = cast(Callable[..., EchoTransport], Transport)(
                 credentials=credentials,
                 host=api_endpoint,
                 api_mtls_endpoint=api_mtls_endpoint,
                 client_cert_source=client_options.client_cert_source,
             )
 
+    @property
+    def raw(self) -> RawEchoClient:
+        """The methods of this client on raw protobuf messages.
+
+        See :class:`~.RawEchoClient`. It shares this client's transport, and is
+        created on first use; repeated calls return the same object.
+        """
+        if 'raw' not in self.__dict__:
+            self.__dict__['raw'] = RawEchoClient(self)
+        return self.__dict__['raw']
+
+    def _coalesced(self, key, send):
+        """Send a request, or share the result of an identical one."""
+        response, shared = self._single_flight.do(key, send)
+        # Each caller gets its own message to change.
+        return type(response)(response) if shared else response
+
     def echo(self,
             request: gs_echo.EchoRequest = None,
             *,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
             ) -> gs_echo.EchoResponse:
         r"""This method simply echos the request. This method is
@@ -241,13 +273,9 @@ class EchoClient(metaclass=EchoClientMeta):
 
         request = gs_echo.EchoRequest(request)
 
-        # Wrap the RPC method; this adds retry and timeout information,
-        # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.echo,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        # Look up the RPC method, wrapped once by the transport; this adds
+        # retry and timeout information, and friendly error handling.
+        rpc = self._transport._wrapped_methods['echo']
 
         # Send the request.
         response = rpc(
@@ -260,13 +288,59 @@ class EchoClient(metaclass=EchoClientMeta):
         # Done; return the response.
         return response
 
+    def echo_many(self,
+            requests: Iterable[gs_echo.EchoRequest],
+            *,
+            max_in_flight: int = 32,
+            ordered: bool = True,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> Iterator[_batching.BatchResult]:
+        r"""Echo many requests concurrently.
+
+        Up to ``max_in_flight`` ``Echo`` calls are kept outstanding at once,
+        using the non-blocking form of the RPC, so that a batch costs about
+        one round trip per window rather than one per request. Calls are
+        not retried.
+
+        Args:
+            requests (Iterable[`~.gs_echo.EchoRequest`]):
+                The request objects, consumed lazily as the window allows.
+            max_in_flight (int): The most calls to have outstanding.
+            ordered (bool): Yield results in request order. If False,
+                yield each result as soon as its call completes.
+            timeout (float): The timeout for each request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with each request as metadata.
+
+        Returns:
+            Iterator[~._batching.BatchResult]:
+                The outcome of each request. A failed call is reported in
+                its result's ``exception`` and does not stop the batch.
+                Calls are made as the iterator is consumed; closing it
+                early cancels calls still in flight.
+        """
+        # Look up the RPC method, wrapped once by the transport; this adds
+        # the default timeout and the user-agent metadata.
+        rpc = self._transport._wrapped_methods['echo']
+
+        def start(request):
+            return rpc.future(
+                gs_echo.EchoRequest(request),
+                timeout=timeout,
+                metadata=metadata,
+            )
+
+        return _batching.run_windowed(
+            start, requests, max_in_flight, ordered=ordered)
+
     def expand(self,
             request: gs_echo.ExpandRequest = None,
             *,
             content: str = None,
             error: status.Status = None,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
             ) -> Iterable[gs_echo.EchoResponse]:
         r"""This method split the given content into words and
@@ -319,13 +393,9 @@ class EchoClient(metaclass=EchoClientMeta):
         if error is not None:
             request.error = error
 
-        # Wrap the RPC method; this adds retry and timeout information,
-        # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.expand,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        # Look up the RPC method, wrapped once by the transport; this adds
+        # retry and timeout information, and friendly error handling.
+        rpc = self._transport._wrapped_methods['expand']
 
         # Send the request.
         response = rpc(
@@ -342,7 +412,7 @@ class EchoClient(metaclass=EchoClientMeta):
             requests: Iterator[gs_echo.EchoRequest] = None,
             *,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
             ) -> gs_echo.EchoResponse:
         r"""This method will collect the words given to it. When
@@ -370,13 +440,9 @@ class EchoClient(metaclass=EchoClientMeta):
 
         """
 
-        # Wrap the RPC method; this adds retry and timeout information,
-        # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.collect,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        # Look up the RPC method, wrapped once by the transport; this adds
+        # retry and timeout information, and friendly error handling.
+        rpc = self._transport._wrapped_methods['collect']
 
         # Send the request.
         response = rpc(
@@ -393,7 +459,7 @@ class EchoClient(metaclass=EchoClientMeta):
             requests: Iterator[gs_echo.EchoRequest] = None,
             *,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
             ) -> Iterable[gs_echo.EchoResponse]:
         r"""This method, upon receiving a request on the stream,
@@ -420,13 +486,9 @@ class EchoClient(metaclass=EchoClientMeta):
 
         """
 
-        # Wrap the RPC method; this adds retry and timeout information,
-        # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.chat,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        # Look up the RPC method, wrapped once by the transport; this adds
+        # retry and timeout information, and friendly error handling.
+        rpc = self._transport._wrapped_methods['chat']
 
         # Send the request.
         response = rpc(
@@ -443,8 +505,10 @@ class EchoClient(metaclass=EchoClientMeta):
             request: gs_echo.PagedExpandRequest = None,
             *,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
+            prefetch: int = 0,
+            adaptive_page_size: pagers.AdaptivePageSize = None,
             ) -> pagers.PagedExpandPager:
         r"""This is similar to the Expand method but instead of
         returning a stream of expanded words, this method
@@ -460,6 +524,10 @@ class EchoClient(metaclass=EchoClientMeta):
             timeout (float): The timeout for this request.
             metadata (Sequence[Tuple[str, str]]): Strings which should be
                 sent along with the request as metadata.
+            prefetch (int): The most pages to request in the background
+                ahead of the iteration; see :class:`~.pagers.PagedExpandPager`.
+            adaptive_page_size (~.pagers.AdaptivePageSize): Adjusts the
+                page size of the requests for further pages.
 
         Returns:
             ~.pagers.PagedExpandPager:
@@ -474,13 +542,14 @@ class EchoClient(metaclass=EchoClientMeta):
 
         request = gs_echo.PagedExpandRequest(request)
 
-        # Wrap the RPC method; this adds retry and timeout information,
-        # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.paged_expand,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        # Look up the RPC method, wrapped once by the transport; this adds
+        # retry and timeout information, and friendly error handling.
+        rpc = self._transport._wrapped_methods['paged_expand']  # type: Callable[..., Any]
+
+        # Merge each page request with an identical one in flight, if
+        # enabled; this covers the pages the pager fetches, too.
+        if self._single_flight is not None:
+            rpc = functools.partial(self._paged_expand_coalesced, rpc)
 
         # Send the request.
         response = rpc(
@@ -496,16 +565,23 @@ class EchoClient(metaclass=EchoClientMeta):
             method=rpc,
             request=request,
             response=response,
+            prefetch=prefetch,
+            adaptive_page_size=adaptive_page_size,
         )
 
         # Done; return the response.
         return response
 
+    def _paged_expand_coalesced(self, rpc, request, **kwargs):
+        key = ('paged_expand', gs_echo.PagedExpandRequest.serialize(request))
+        return self._coalesced(
+            key, functools.partial(rpc, request, **kwargs))
+
     def wait(self,
             request: gs_echo.WaitRequest = None,
             *,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
             ) -> operation.Operation:
         r"""This method will wait the requested amount of and
@@ -535,13 +611,9 @@ class EchoClient(metaclass=EchoClientMeta):
 
         request = gs_echo.WaitRequest(request)
 
-        # Wrap the RPC method; this adds retry and timeout information,
-        # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.wait,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        # Look up the RPC method, wrapped once by the transport; this adds
+        # retry and timeout information, and friendly error handling.
+        rpc = self._transport._wrapped_methods['wait']
 
         # Send the request.
         response = rpc(
@@ -566,7 +638,7 @@ class EchoClient(metaclass=EchoClientMeta):
             request: gs_echo.BlockRequest = None,
             *,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
             ) -> gs_echo.BlockResponse:
         r"""This method will block (wait) for the requested
@@ -592,13 +664,9 @@ class EchoClient(metaclass=EchoClientMeta):
 
         request = gs_echo.BlockRequest(request)
 
-        # Wrap the RPC method; this adds retry and timeout information,
-        # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.block,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        # Look up the RPC method, wrapped once by the transport; this adds
+        # retry and timeout information, and friendly error handling.
+        rpc = self._transport._wrapped_methods['block']
 
         # Send the request.
         response = rpc(
@@ -612,19 +680,6 @@ class EchoClient(metaclass=EchoClientMeta):
         return response
 
 
-
-
-
-try:
-    _client_info = gapic_v1.client_info.ClientInfo(
-        gapic_version=pkg_resources.get_distribution(
-            'google-showcase',
-        ).version,
-    )
-except pkg_resources.DistributionNotFound:
-    _client_info = gapic_v1.client_info.ClientInfo()
-
-
 __all__ = (
     'EchoClient',
 )
@@ -15,8 +15,12 @@
 # limitations under the License.
 #
 
-from typing import Any, Callable, Iterable
+import contextlib
+import time
+from typing import Any, AsyncIterable, Awaitable, Callable, Iterable
 
+from google.showcase_v1beta1.services import _paging
+from google.showcase_v1beta1.services._paging import AdaptivePageSize
 from google.showcase_v1beta1.types import echo as gs_echo
 
 
@@ -36,12 +40,21 @@ class PagedExpandPager:
     All the usual :class:`~.gs_echo.PagedExpandResponse`
     attributes are available on the pager. If multiple requests are made, only
     the most recent response is retained, and thus used for attribute lookup.
+
+    With ``prefetch`` set, the next pages are requested in the background
+    while the current one is used. Stopping iteration early stops the
+    background requests. With ``adaptive_page_size`` set, the page size of
+    each further request is chosen from the latency and size of the pages
+    before it.
     """
     def __init__(self,
             method: Callable[[gs_echo.PagedExpandRequest],
                 gs_echo.PagedExpandResponse],
             request: gs_echo.PagedExpandRequest,
-            response: gs_echo.PagedExpandResponse):
+            response: gs_echo.PagedExpandResponse,
+            *,
+            prefetch: int = 0,
+            adaptive_page_size: AdaptivePageSize = None):
         """Instantiate the pager.
 
         Args:
@@ -51,25 +64,177 @@ class PagedExpandPager:
                 The initial request object.
             response (:class:`~.gs_echo.PagedExpandResponse`):
                 The initial response object.
+            prefetch (int): The most pages to request ahead of the
+                iteration. If zero, each page is requested when the one
+                before it has been used.
+            adaptive_page_size (Optional[~.AdaptivePageSize]): Adjusts the
+                page size between requests. If None, every request keeps
+                the page size of the initial request.
         """
+        if prefetch < 0:
+            raise ValueError('prefetch must not be negative.')
         self._method = method
         self._request = gs_echo.PagedExpandRequest(request)
         self._response = response
+        self._prefetch = prefetch
+        self._adaptive_page_size = adaptive_page_size
 
     def __getattr__(self, name: str) -> Any:
         return getattr(self._response, name)
 
     @property
     def pages(self) -> Iterable[gs_echo.PagedExpandResponse]:
+        if self._prefetch:
+            with contextlib.closing(_paging.prefetch_pages(
+                    self._response, self._fetch, self._prefetch)) as pages:
+                for page in pages:
+                    self._response = page
+                    yield page
+            return
+
         yield self._response
         while self._response.next_page_token:
-            self._request.page_token = self._response.next_page_token
-            self._response = self._method(self._request)
+            self._response = self._fetch(self._response.next_page_token)
             yield self._response
 
+    def _fetch(self, page_token: str) -> gs_echo.PagedExpandResponse:
+        request = gs_echo.PagedExpandRequest(self._request)
+        request.page_token = page_token
+        sizer = self._adaptive_page_size
+        if sizer is None:
+            return self._method(request)
+
+        # Until the first page is observed, keep the original request's
+        # size; 0 leaves it to the server.
+        page_size = sizer.size
+        if page_size is None:
+            page_size = request.page_size
+        request.page_size = page_size
+        start = time.monotonic()
+        response = self._method(request)
+        latency = time.monotonic() - start
+        sizer.observe(
+            page_size,
+            len(response.responses),
+            latency,
+            gs_echo.PagedExpandResponse.pb(response).ByteSize() if sizer.target_bytes else None,
+        )
+        return response
+
     def __iter__(self) -> Iterable[gs_echo.EchoResponse]:
         for page in self.pages:
             yield from page.responses
 
     def __repr__(self) -> str:
         return '{0}<{1!r}>'.format(self.__class__.__name__, self._response)
+
+
+class PagedExpandAsyncPager:
+    """A pager for iterating through ``paged_expand`` requests.
+
+    This class thinly wraps an initial
+    :class:`~.gs_echo.PagedExpandResponse` object, and
+    provides an ``__aiter__`` method to iterate through its
+    ``responses`` field.
+
+    If there are more pages, the ``__aiter__`` method will make additional
+    ``PagedExpand`` requests and continue to iterate
+    through the ``responses`` field on the
+    corresponding responses.
+
+    All the usual :class:`~.gs_echo.PagedExpandResponse`
+    attributes are available on the pager. If multiple requests are made, only
+    the most recent response is retained, and thus used for attribute lookup.
+
+    With ``prefetch`` set, a task requests the next pages while the current
+    one is used; closing the iterator with ``aclose()`` cancels it. With
+    ``adaptive_page_size`` set, the page size of each further request is
+    chosen from the latency and size of the pages before it.
+    """
+    def __init__(self,
+            method: Callable[[gs_echo.PagedExpandRequest],
+                Awaitable[gs_echo.PagedExpandResponse]],
+            request: gs_echo.PagedExpandRequest,
+            response: gs_echo.PagedExpandResponse,
+            *,
+            prefetch: int = 0,
+            adaptive_page_size: AdaptivePageSize = None):
+        """Instantiate the pager.
+
+        Args:
+            method (Callable): The method that was originally called, and
+                which instantiated this pager.
+            request (:class:`~.gs_echo.PagedExpandRequest`):
+                The initial request object.
+            response (:class:`~.gs_echo.PagedExpandResponse`):
+                The initial response object.
+            prefetch (int): The most pages to request ahead of the
+                iteration. If zero, each page is requested when the one
+                before it has been used.
+            adaptive_page_size (Optional[~.AdaptivePageSize]): Adjusts the
+                page size between requests. If None, every request keeps
+                the page size of the initial request.
+        """
+        if prefetch < 0:
+            raise ValueError('prefetch must not be negative.')
+        self._method = method
+        self._request = gs_echo.PagedExpandRequest(request)
+        self._response = response
+        self._prefetch = prefetch
+        self._adaptive_page_size = adaptive_page_size
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._response, name)
+
+    @property
+    async def pages(self) -> AsyncIterable[gs_echo.PagedExpandResponse]:
+        if self._prefetch:
+            pages = _paging.prefetch_pages_async(
+                self._response, self._fetch, self._prefetch)
+            try:
+                async for page in pages:
+                    self._response = page
+                    yield page
+            finally:
+                await pages.aclose()
+            return
+
+        yield self._response
+        while self._response.next_page_token:
+            self._response = await self._fetch(self._response.next_page_token)
+            yield self._response
+
+    async def _fetch(self, page_token: str) -> gs_echo.PagedExpandResponse:
+        request = gs_echo.PagedExpandRequest(self._request)
+        request.page_token = page_token
+        sizer = self._adaptive_page_size
+        if sizer is None:
+            return await self._method(request)
+
+        # Until the first page is observed, keep the original request's
+        # size; 0 leaves it to the server.
+        page_size = sizer.size
+        if page_size is None:
+            page_size = request.page_size
+        request.page_size = page_size
+        start = time.monotonic()
+        response = await self._method(request)
+        latency = time.monotonic() - start
+        sizer.observe(
+            page_size,
+            len(response.responses),
+            latency,
+            gs_echo.PagedExpandResponse.pb(response).ByteSize() if sizer.target_bytes else None,
+        )
+        return response
+
+    def __aiter__(self) -> AsyncIterable[gs_echo.EchoResponse]:
+        async def async_generator():
+            async for page in self.pages:
+                for response in page.responses:
+                    yield response
+
+        return async_generator()
+
+    def __repr__(self) -> str:
+        return '{0}<{1!r}>'.format(self.__class__.__name__, self._response)
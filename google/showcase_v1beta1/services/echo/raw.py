@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Sequence, Tuple
+
+from google.api_core import gapic_v1                   # type: ignore
+from google.api_core import retry as retries           # type: ignore
+
+from google.longrunning import operations_pb2 as operations  # type: ignore
+from google.showcase_v1beta1.services import _raw
+from google.showcase_v1beta1.types import echo as gs_echo
+
+if TYPE_CHECKING:
+    from .client import EchoClient
+
+
+class RawEchoClient(_raw.RawMethods):
+    """The methods of an :class:`~.EchoClient` on raw protobuf messages.
+
+    Requests are ``*_pb2`` messages, such as ``gs_echo.EchoRequest.pb()``
+    instances, or their serialized bytes; responses are ``*_pb2``
+    messages. Nothing is marshalled through proto-plus, which makes this
+    the cheaper choice for small messages sent at a high rate. Paged
+    methods return single pages rather than pagers, and :meth:`wait`
+    returns the raw long-running operation.
+
+    The raw client shares the channel of the client's transport, and its
+    default retries and timeouts. It supports the synchronous gRPC
+    transports.
+
+    Example::
+
+        EchoRequestPb = gs_echo.EchoRequest.pb()
+        response = client.raw.echo(EchoRequestPb(content='hello'))
+
+    Args:
+        client (~.EchoClient): The client whose transport to use.
+        decode (bool): Whether to parse responses; if False, responses are
+            the serialized bytes.
+    """
+    _METHODS = {
+        'echo': (
+            '/google.showcase.v1beta1.Echo/Echo', 'unary_unary',
+            gs_echo.EchoResponse.pb()),
+        'expand': (
+            '/google.showcase.v1beta1.Echo/Expand', 'unary_stream',
+            gs_echo.EchoResponse.pb()),
+        'collect': (
+            '/google.showcase.v1beta1.Echo/Collect', 'stream_unary',
+            gs_echo.EchoResponse.pb()),
+        'chat': (
+            '/google.showcase.v1beta1.Echo/Chat', 'stream_stream',
+            gs_echo.EchoResponse.pb()),
+        'paged_expand': (
+            '/google.showcase.v1beta1.Echo/PagedExpand', 'unary_unary',
+            gs_echo.PagedExpandResponse.pb()),
+        'wait': (
+            '/google.showcase.v1beta1.Echo/Wait', 'unary_unary',
+            operations.Operation),
+        'block': (
+            '/google.showcase.v1beta1.Echo/Block', 'unary_unary',
+            gs_echo.BlockResponse.pb()),
+    }
+
+    def __init__(self, client: 'EchoClient', *, decode: bool = True):
+        super().__init__(client._transport, decode=decode)
+
+    def echo(self,
+            request: _raw.RawMessage,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> Any:
+        r"""Call the echo method with a raw ``EchoRequest``.
+
+        Returns:
+            The ``EchoResponse`` message.
+        """
+        return self.rpc('echo')(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+    def expand(self,
+            request: _raw.RawMessage,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> Iterable[Any]:
+        r"""Call the expand method with a raw ``ExpandRequest``.
+
+        Returns:
+            An iterable of ``EchoResponse`` messages.
+        """
+        return self.rpc('expand')(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+    def collect(self,
+            requests: Iterator[_raw.RawMessage],
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> Any:
+        r"""Call the collect method with raw ``EchoRequest`` messages.
+
+        Returns:
+            The ``EchoResponse`` message.
+        """
+        return self.rpc('collect')(
+            requests,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+    def chat(self,
+            requests: Iterator[_raw.RawMessage],
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> Iterable[Any]:
+        r"""Call the chat method with raw ``EchoRequest`` messages.
+
+        Returns:
+            An iterable of ``EchoResponse`` messages.
+        """
+        return self.rpc('chat')(
+            requests,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+    def paged_expand(self,
+            request: _raw.RawMessage,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> Any:
+        r"""Call the paged expand method with a raw ``PagedExpandRequest``.
+
+        Returns:
+            One ``PagedExpandResponse`` page; follow its
+            ``next_page_token`` for the rest.
+        """
+        return self.rpc('paged_expand')(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+    def wait(self,
+            request: _raw.RawMessage,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> Any:
+        r"""Call the wait method with a raw ``WaitRequest``.
+
+        Returns:
+            The ``google.longrunning.Operation`` message.
+        """
+        return self.rpc('wait')(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+    def block(self,
+            request: _raw.RawMessage,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> Any:
+        r"""Call the block method with a raw ``BlockRequest``.
+
+        Returns:
+            The ``BlockResponse`` message.
+        """
+        return self.rpc('block')(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+
+__all__ = (
+    'RawEchoClient',
+)
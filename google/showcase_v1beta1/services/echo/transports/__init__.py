@@ -16,18 +16,38 @@
 #
 
 from collections import OrderedDict
+import sys
+import typing
 from typing import Dict, Type
 
 from .base import EchoTransport
 from .grpc import EchoGrpcTransport
+from .grpc_multichannel import EchoGrpcMultiChannelTransport
 
+if typing.TYPE_CHECKING or sys.version_info < (3, 7):
+    from .grpc_asyncio import EchoGrpcAsyncIOTransport
+else:
+    # The asyncio transport is resolved on first access (PEP 562), so that
+    # the synchronous clients do not load it.
+    def __getattr__(name):
+        if name != 'EchoGrpcAsyncIOTransport':
+            raise AttributeError('module {!r} has no attribute {!r}'.format(
+                __name__, name))
+        from .grpc_asyncio import EchoGrpcAsyncIOTransport
+        globals()[name] = EchoGrpcAsyncIOTransport
+        return EchoGrpcAsyncIOTransport
 
-# Compile a registry of transports.
+
+# Compile a registry of the synchronous transports; the asyncio transport
+# is registered with the async client.
 _transport_registry = OrderedDict()  # type: Dict[str, Type[EchoTransport]]
 _transport_registry['grpc'] = EchoGrpcTransport
+_transport_registry['grpc_multichannel'] = EchoGrpcMultiChannelTransport
 
 
 __all__ = (
     'EchoTransport',
     'EchoGrpcTransport',
+    'EchoGrpcMultiChannelTransport',
+    'EchoGrpcAsyncIOTransport',
 )
@@ -16,14 +16,26 @@
 #
 
 import abc
+import functools
 import typing
 
 from google import auth
-from google.api_core import operations_v1  # type: ignore
+from google.api_core import gapic_v1       # type: ignore
 from google.auth import credentials  # type: ignore
 
 from google.longrunning import operations_pb2 as operations  # type: ignore
 from google.showcase_v1beta1.types import echo as gs_echo
+from google.showcase_v1beta1 import gapic_version as package_version
+from google.showcase_v1beta1.services._method import LazyWrappedMethods
+from google.showcase_v1beta1.services._method import WrappedMethod
+
+if typing.TYPE_CHECKING:
+    from google.api_core import operations_v1  # type: ignore
+
+
+DEFAULT_CLIENT_INFO = gapic_v1.client_info.ClientInfo(
+    gapic_version=package_version.__version__,
+)
 
 
 class EchoTransport(metaclass=abc.ABCMeta):
@@ -32,6 +44,19 @@ class EchoTransport(metaclass=abc.ABCMeta):
     AUTH_SCOPES = (
     )
 
+    # The retry and timeout applied to each method when the caller does not
+    # provide one. ``None`` disables the behavior. Individual entries may be
+    # overridden with the ``method_configs`` transport argument.
+    DEFAULT_METHOD_CONFIGS = {
+        'echo': {'retry': None, 'timeout': None},
+        'expand': {'retry': None, 'timeout': None},
+        'collect': {'retry': None, 'timeout': None},
+        'chat': {'retry': None, 'timeout': None},
+        'paged_expand': {'retry': None, 'timeout': None},
+        'wait': {'retry': None, 'timeout': None},
+        'block': {'retry': None, 'timeout': None},
+    }  # type: typing.Dict[str, typing.Dict[str, typing.Any]]
+
     def __init__(
             self, *,
             host: str = 'localhost:7469',
@@ -60,51 +85,119 @@ class EchoTransport(metaclass=abc.ABCMeta):
         # Save the credentials.
         self._credentials = credentials
 
+    def _prep_wrapped_messages(self,
+            client_info: gapic_v1.client_info.ClientInfo,
+            method_configs: typing.Dict[str, typing.Dict[str, typing.Any]] = None,
+            wrapper: typing.Type[WrappedMethod] = WrappedMethod,
+            ) -> None:
+        """Precompute the wrapped methods.
+
+        Args:
+            client_info (google.api_core.gapic_v1.client_info.ClientInfo):
+                The client info used to build the user-agent metadata.
+            method_configs (Optional[Dict[str, Dict[str, Any]]]): Per-method
+                overrides of :attr:`DEFAULT_METHOD_CONFIGS`, keyed by method
+                name, each holding optional ``retry`` and ``timeout`` entries.
+            wrapper (Type[WrappedMethod]): The class wrapping each method;
+                asyncio transports use ``AsyncWrappedMethod``.
+        """
+        method_configs = method_configs or {}
+        unknown = set(method_configs) - set(self.DEFAULT_METHOD_CONFIGS)
+        if unknown:
+            raise ValueError('Unknown methods in method_configs: {}'.format(
+                ', '.join(sorted(unknown))))
+
+        self._prepared_methods = {}  # type: typing.Dict[str, WrappedMethod]
+        for name in self.DEFAULT_METHOD_CONFIGS:
+            self._prepared_methods[name] = self._wrap_method(
+                name, client_info, method_configs, wrapper)
+
+    def _wrap_method(self,
+            name: str,
+            client_info: gapic_v1.client_info.ClientInfo,
+            method_configs: typing.Dict[str, typing.Dict[str, typing.Any]] = None,
+            wrapper: typing.Type[WrappedMethod] = WrappedMethod,
+            ) -> WrappedMethod:
+        config = dict(
+            self.DEFAULT_METHOD_CONFIGS[name],
+            **(method_configs or {}).get(name, {}))
+        return wrapper(
+            getattr(self, name),
+            default_retry=config['retry'],
+            default_timeout=config['timeout'],
+            client_info=client_info,
+        )
+
+    @property
+    def _wrapped_methods(self) -> typing.Dict[str, WrappedMethod]:
+        """The wrapped methods, by name.
+
+        Transports which do not call :meth:`_prep_wrapped_messages`, such
+        as user subclasses of this class, have each method wrapped with
+        the default configuration when it is first used.
+        """
+        try:
+            return self._prepared_methods
+        except AttributeError:
+            self._prepared_methods = LazyWrappedMethods(functools.partial(
+                self._wrap_method, client_info=DEFAULT_CLIENT_INFO))
+            return self._prepared_methods
+
+    def close(self) -> typing.Union[None, typing.Awaitable[None]]:
+        """Release the resources held by this transport.
+
+        Asyncio transports return an awaitable. By default, there is
+        nothing to release.
+        """
+        return None
+
     @property
-    def operations_client(self) -> operations_v1.OperationsClient:
+    def operations_client(self) -> typing.Union[
+            'operations_v1.OperationsClient',
+            'operations_v1.OperationsAsyncClient']:
         """Return the client designed to process long-running operations."""
         raise NotImplementedError
 
     @property
     def echo(self) -> typing.Callable[
             [gs_echo.EchoRequest],
-            gs_echo.EchoResponse]:
+            typing.Union[gs_echo.EchoResponse, typing.Awaitable[gs_echo.EchoResponse]]]:
         raise NotImplementedError
 
     @property
     def expand(self) -> typing.Callable[
             [gs_echo.ExpandRequest],
-            gs_echo.EchoResponse]:
+            typing.Union[gs_echo.EchoResponse, typing.Awaitable[gs_echo.EchoResponse]]]:
         raise NotImplementedError
 
     @property
     def collect(self) -> typing.Callable[
             [gs_echo.EchoRequest],
-            gs_echo.EchoResponse]:
+            typing.Union[gs_echo.EchoResponse, typing.Awaitable[gs_echo.EchoResponse]]]:
         raise NotImplementedError
 
     @property
     def chat(self) -> typing.Callable[
             [gs_echo.EchoRequest],
-            gs_echo.EchoResponse]:
+            typing.Union[gs_echo.EchoResponse, typing.Awaitable[gs_echo.EchoResponse]]]:
         raise NotImplementedError
 
     @property
     def paged_expand(self) -> typing.Callable[
             [gs_echo.PagedExpandRequest],
-            gs_echo.PagedExpandResponse]:
+            typing.Union[gs_echo.PagedExpandResponse, typing.Awaitable[gs_echo.PagedExpandResponse]]]:
         raise NotImplementedError
 
     @property
     def wait(self) -> typing.Callable[
             [gs_echo.WaitRequest],
-            operations.Operation]:
+            typing.Union[operations.Operation, typing.Awaitable[operations.Operation]]]:
         raise NotImplementedError
 
     @property
     def block(self) -> typing.Callable[
             [gs_echo.BlockRequest],
-            gs_echo.BlockResponse]:
+            typing.Union[gs_echo.BlockResponse, typing.Awaitable[gs_echo.BlockResponse]]]:
         raise NotImplementedError
 
 
@@ -15,10 +15,11 @@
 # limitations under the License.
 #
 
-from typing import Callable, Dict, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
+import weakref
 
+from google.api_core import gapic_v1       # type: ignore
 from google.api_core import grpc_helpers   # type: ignore
-from google.api_core import operations_v1  # type: ignore
 from google.auth import credentials        # type: ignore
 from google.auth.transport.grpc import SslCredentials  # type: ignore
 
@@ -26,9 +27,13 @@ from google.auth.transport.grpc import SslCredentials  # type: ignore
 import grpc  # type: ignore
 
 from google.longrunning import operations_pb2 as operations  # type: ignore
+from google.showcase_v1beta1.services import _channels
 from google.showcase_v1beta1.types import echo as gs_echo
 
-from .base import EchoTransport
+from .base import EchoTransport, DEFAULT_CLIENT_INFO
+
+if TYPE_CHECKING:
+    from google.api_core import operations_v1  # type: ignore
 
 
 class EchoGrpcTransport(EchoTransport):
@@ -53,7 +58,10 @@ class EchoGrpcTransport(EchoTransport):
             credentials: credentials.Credentials = None,
             channel: grpc.Channel = None,
             api_mtls_endpoint: str = None,
-            client_cert_source: Callable[[], Tuple[bytes, bytes]] = None) -> None:
+            client_cert_source: Callable[[], Tuple[bytes, bytes]] = None,
+            client_cert_refresh_interval: float = None,
+            client_info: gapic_v1.client_info.ClientInfo = DEFAULT_CLIENT_INFO,
+            method_configs: Dict[str, Dict[str, Any]] = None) -> None:
         """Instantiate the transport.
 
         Args:
@@ -74,11 +82,27 @@ class EchoGrpcTransport(EchoTransport):
                 callback to provide client SSL certificate bytes and private key
                 bytes, both in PEM format. It is ignored if ``api_mtls_endpoint``
                 is None.
+            client_cert_refresh_interval (Optional[float]): If set, call
+                ``client_cert_source`` every ``client_cert_refresh_interval``
+                seconds and move to a new channel when the certificate
+                changes, letting calls in flight finish on the old one. The
+                channel is then owned by this transport rather than shared.
+                It is ignored if ``client_cert_source`` is None.
+            client_info (google.api_core.gapic_v1.client_info.ClientInfo):
+                The client info used to send a user-agent string along with
+                API requests.
+            method_configs (Optional[Dict[str, Dict[str, Any]]]): Per-method
+                default ``retry`` and ``timeout`` values, overriding
+                ``DEFAULT_METHOD_CONFIGS``.
 
         Raises:
           google.auth.exceptions.MutualTlsChannelError: If mutual TLS transport
               creation failed for any reason.
         """
+        # Releases the pooled channel, if this transport draws one from
+        # the pool; a channel provided by the caller is never closed here.
+        self._release_channel = None  # type: Optional[weakref.finalize]
+
         if channel:
             # Sanity check: Ensure that channel and credentials are not both
             # provided.
@@ -89,28 +113,56 @@ class EchoGrpcTransport(EchoTransport):
         elif api_mtls_endpoint:
             host = api_mtls_endpoint if ":" in api_mtls_endpoint else api_mtls_endpoint + ":443"
 
-            # Create SSL credentials with client_cert_source or application
-            # default SSL credentials.
-            if client_cert_source:
-                cert, key = client_cert_source()
-                ssl_credentials = grpc.ssl_channel_credentials(
-                    certificate_chain=cert, private_key=key
+            if client_cert_source and client_cert_refresh_interval:
+                # Follow the client certificate as it rotates.
+                scopes = self.AUTH_SCOPES
+                rotating_channel = _channels.RotatingChannel(
+                    client_cert_source,
+                    lambda ssl_credentials: grpc_helpers.create_channel(
+                        host,
+                        credentials=credentials,
+                        ssl_credentials=ssl_credentials,
+                        scopes=scopes,
+                    ),
+                    refresh_interval=client_cert_refresh_interval,
                 )
+                self._grpc_channel = rotating_channel
+                self._release_channel = weakref.finalize(self, rotating_channel.close)
             else:
-                ssl_credentials = SslCredentials().ssl_credentials
-
-            # create a new channel. The provided one is ignored.
-            self._grpc_channel = grpc_helpers.create_channel(
-                host,
-                credentials=credentials,
-                ssl_credentials=ssl_credentials,
-                scopes=self.AUTH_SCOPES,
-            )
+                # Identify the SSL credentials from client_cert_source or
+                # application default SSL credentials; they are only created if
+                # the pool has no matching channel yet.
+                if client_cert_source:
+                    cert, key = client_cert_source()
+                    ssl_identity = _channels.fingerprint(cert, key)
+
+                    def ssl_credentials():
+                        return _channels.SSL_CREDENTIALS.get(cert, key)
+                else:
+                    ssl_identity = 'application-default'
+
+                    def ssl_credentials():
+                        return SslCredentials().ssl_credentials
+
+                # Share a channel with any transport using the same endpoint and
+                # credentials. The provided one is ignored.
+                self._grpc_channel = self._acquire_channel(
+                    (host, _channels.credentials_key(credentials), ssl_identity),
+                    lambda: grpc_helpers.create_channel(
+                        host,
+                        credentials=credentials,
+                        ssl_credentials=ssl_credentials(),
+                        scopes=self.AUTH_SCOPES,
+                    ),
+                )
 
         # Run the base constructor.
         super().__init__(host=host, credentials=credentials)
         self._stubs = {}  # type: Dict[str, Callable]
 
+        # Wrap each RPC once, up front, rather than on every call.
+        self._prep_wrapped_messages(client_info, method_configs)
+
     @classmethod
     def create_channel(cls,
                        host: str = 'localhost:7469',
@@ -136,26 +188,48 @@ class EchoGrpcTransport(EchoTransport):
             **kwargs
         )
 
+    def _acquire_channel(self,
+            key: Tuple,
+            factory: Callable[[], grpc.Channel]) -> grpc.Channel:
+        """Take a channel from the pool, releasing it with this transport."""
+        channel = _channels.POOL.acquire(key + (self.AUTH_SCOPES,), factory)
+        self._release_channel = weakref.finalize(
+            self, _channels.POOL.release, channel)
+        return channel
+
+    def close(self) -> None:
+        """Release the channel held by this transport.
+
+        A pooled channel is closed once no transport uses it any more. A
+        channel provided by the caller is left open.
+        """
+        if self._release_channel is not None:
+            self._release_channel()
+
     @property
     def grpc_channel(self) -> grpc.Channel:
         """Create the channel designed to connect to this service.
 
         This property caches on the instance; repeated calls return
-        the same channel.
+        the same channel. Channels are shared through a process-wide pool
+        with other transports using the same endpoint and credentials.
         """
         # Sanity check: Only create a new channel if we do not already
         # have one.
         if not hasattr(self, '_grpc_channel'):
-            self._grpc_channel = self.create_channel(
-                self._host,
-                credentials=self._credentials,
+            self._grpc_channel = self._acquire_channel(
+                (self._host, _channels.credentials_key(self._credentials), None),
+                lambda: self.create_channel(
+                    self._host,
+                    credentials=self._credentials,
+                ),
             )
 
         # Return the channel from cache.
         return self._grpc_channel
 
     @property
-    def operations_client(self) -> operations_v1.OperationsClient:
+    def operations_client(self) -> 'operations_v1.OperationsClient':
         """Create the client designed to process long-running operations.
 
         This property caches on the instance; repeated calls return the same
@@ -163,6 +237,9 @@ class EchoGrpcTransport(EchoTransport):
         """
         # Sanity check: Only create a new client if we do not already have one.
         if 'operations_client' not in self.__dict__:
+            # Imported here since ``operations_v1`` is costly to import and
+            # only needed by long-running methods.
+            from google.api_core import operations_v1  # type: ignore
             self.__dict__['operations_client'] = operations_v1.OperationsClient(
                 self.grpc_channel
             )
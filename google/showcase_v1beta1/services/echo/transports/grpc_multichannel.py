@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+from typing import Any, Callable, Dict, Tuple
+import weakref
+
+from google import auth
+from google.api_core import gapic_v1       # type: ignore
+from google.api_core import grpc_helpers   # type: ignore
+from google.auth import credentials        # type: ignore
+from google.auth.transport.grpc import SslCredentials  # type: ignore
+
+from google.showcase_v1beta1.services import _channels
+
+from .base import DEFAULT_CLIENT_INFO
+from .grpc import EchoGrpcTransport
+
+
+class EchoGrpcMultiChannelTransport(EchoGrpcTransport):
+    """gRPC backend transport for Echo over several channels.
+
+    A single ``grpc.Channel`` is one HTTP/2 connection, and heavy
+    ``chat``/``expand`` fan-out is capped by that connection's maximum
+    number of concurrent streams. This transport opens ``channel_count``
+    channels, each with its own subchannel pool and so its own connection,
+    and sends every call to the channel with the fewest calls in flight.
+
+    Its channels are owned by the transport rather than shared through the
+    process-wide channel pool.
+    """
+    def __init__(self, *,
+            host: str = 'localhost:7469',
+            credentials: credentials.Credentials = None,
+            channel_count: int = None,
+            api_mtls_endpoint: str = None,
+            client_cert_source: Callable[[], Tuple[bytes, bytes]] = None,
+            client_info: gapic_v1.client_info.ClientInfo = DEFAULT_CLIENT_INFO,
+            method_configs: Dict[str, Dict[str, Any]] = None) -> None:
+        """Instantiate the transport.
+
+        Args:
+            host (Optional[str]): The hostname to connect to.
+            credentials (Optional[google.auth.credentials.Credentials]): The
+                authorization credentials to attach to requests. These
+                credentials identify the application to the service; if none
+                are specified, the client will attempt to ascertain the
+                credentials from the environment.
+            channel_count (Optional[int]): The number of channels to open.
+                Defaults to the number of CPUs.
+            api_mtls_endpoint (Optional[str]): The mutual TLS endpoint. If
+                provided, it overrides the ``host`` argument and creates
+                mutual TLS channels with client SSL credentials from
+                ``client_cert_source`` or application default SSL credentials.
+            client_cert_source (Optional[Callable[[], Tuple[bytes, bytes]]]): A
+                callback to provide client SSL certificate bytes and private key
+                bytes, both in PEM format. It is ignored if ``api_mtls_endpoint``
+                is None.
+            client_info (google.api_core.gapic_v1.client_info.ClientInfo):
+                The client info used to send a user-agent string along with
+                API requests.
+            method_configs (Optional[Dict[str, Dict[str, Any]]]): Per-method
+                default ``retry`` and ``timeout`` values, overriding
+                ``DEFAULT_METHOD_CONFIGS``.
+
+        Raises:
+          google.auth.exceptions.MutualTlsChannelError: If mutual TLS transport
+              creation failed for any reason.
+        """
+        channel_count = channel_count or os.cpu_count() or 1
+        if channel_count < 1:
+            raise ValueError('channel_count must be positive.')
+
+        ssl_credentials = None
+        if api_mtls_endpoint:
+            host = api_mtls_endpoint if ":" in api_mtls_endpoint else api_mtls_endpoint + ":443"
+            if client_cert_source:
+                cert, key = client_cert_source()
+                ssl_credentials = _channels.SSL_CREDENTIALS.get(cert, key)
+            else:
+                ssl_credentials = SslCredentials().ssl_credentials
+        elif ':' not in host:
+            host += ':443'
+
+        # Resolve default credentials once for all of the channels.
+        if credentials is None:
+            credentials, _ = auth.default(scopes=self.AUTH_SCOPES)
+
+        channels = [
+            grpc_helpers.create_channel(
+                host,
+                credentials=credentials,
+                ssl_credentials=ssl_credentials,
+                scopes=self.AUTH_SCOPES,
+                # A channel-local subchannel pool gives every channel its
+                # own connection, even though they share a target.
+                options=[('grpc.use_local_subchannel_pool', 1)],
+            )
+            for _ in range(channel_count)
+        ]
+        multi_channel = _channels.MultiChannel(channels)
+
+        super().__init__(
+            host=host,
+            channel=multi_channel,
+            client_info=client_info,
+            method_configs=method_configs,
+        )
+        self._credentials = credentials
+        self._release_channel = weakref.finalize(self, multi_channel.close)
+
+
+__all__ = (
+    'EchoGrpcMultiChannelTransport',
+)
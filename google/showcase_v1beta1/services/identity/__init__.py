@@ -15,8 +15,53 @@
 # limitations under the License.
 #
 
+import sys
+import typing
+
 from .client import IdentityClient
+from .raw import RawIdentityClient
+from .cache import CacheStats
+from .cache import UserCache
+from .export import UserColumns
+from .export import export_users
+from .bulk import DeleteStats
+from .bulk import ImportStats
+from .bulk import delete_users
+from .bulk import import_users
+from .directory import UserDirectory
+from .directory import write_directory
+from .index import UserIndex
+from .snapshot import SnapshotDiff
+from .snapshot import UserSnapshot
+
+if typing.TYPE_CHECKING or sys.version_info < (3, 7):
+    from .async_client import IdentityAsyncClient
+else:
+    # The async client is resolved on first access (PEP 562), so that the
+    # synchronous client does not load the asyncio transport.
+    def __getattr__(name):
+        if name != 'IdentityAsyncClient':
+            raise AttributeError('module {!r} has no attribute {!r}'.format(
+                __name__, name))
+        from .async_client import IdentityAsyncClient
+        globals()[name] = IdentityAsyncClient
+        return IdentityAsyncClient
 
 __all__ = (
     'IdentityClient',
+    'IdentityAsyncClient',
+    'RawIdentityClient',
+    'CacheStats',
+    'UserCache',
+    'UserColumns',
+    'export_users',
+    'DeleteStats',
+    'ImportStats',
+    'delete_users',
+    'import_users',
+    'UserDirectory',
+    'write_directory',
+    'UserIndex',
+    'SnapshotDiff',
+    'UserSnapshot',
 )
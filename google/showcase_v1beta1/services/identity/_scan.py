@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from typing import TYPE_CHECKING, Any, Generator, Sequence, Tuple
+
+from google.showcase_v1beta1.services import _paging
+from google.showcase_v1beta1.types import identity
+
+if TYPE_CHECKING:
+    from .client import IdentityClient
+
+
+# Marks a timestamp which is not set.
+NO_TIME = -(2 ** 63)
+
+ListUsersRequestPb = identity.ListUsersRequest.pb()
+
+
+def nanos(user: Any, field: str) -> int:
+    """Return a timestamp of a raw ``User`` message in nanoseconds since
+    the epoch, or :data:`NO_TIME` if it is not set."""
+    if not user.HasField(field):
+        return NO_TIME
+    value = getattr(user, field)
+    return value.seconds * 10 ** 9 + value.nanos
+
+
+def scan_pages(
+        client: 'IdentityClient',
+        request: Any,
+        prefetch: int,
+        retry: Any,
+        timeout: Any,
+        metadata: Sequence[Tuple[str, str]],
+        ) -> Generator[Any, None, None]:
+    """Return a generator of the raw ``ListUsersResponse`` pages of a scan.
+
+    Args:
+        client (~.IdentityClient): The client to list users with.
+        request (Union[~.identity.ListUsersRequest, dict, ListUsersRequestPb]):
+            The request for the first page.
+        prefetch (int): The most pages to request in the background; 0
+            requests each page in turn.
+        retry (google.api_core.retry.Retry): The retry for each page.
+        timeout (float): The timeout for each page.
+        metadata (Sequence[Tuple[str, str]]): Strings which should be
+            sent along with each request as metadata.
+
+    Returns:
+        Generator[Any, None, None]: The pages; close it to stop early.
+    """
+    request = _list_request(request)
+
+    def fetch(page_token):
+        page_request = ListUsersRequestPb()
+        page_request.CopyFrom(request)
+        page_request.page_token = page_token
+        return client.raw.list_users(
+            page_request, retry=retry, timeout=timeout, metadata=metadata)
+
+    first = client.raw.list_users(
+        request, retry=retry, timeout=timeout, metadata=metadata)
+    if prefetch:
+        return _paging.prefetch_pages(first, fetch, prefetch)
+    return _sequential_pages(first, fetch)
+
+
+def _list_request(request):
+    if isinstance(request, ListUsersRequestPb):
+        return request
+    return identity.ListUsersRequest.pb(identity.ListUsersRequest(request))
+
+
+def _sequential_pages(page, fetch):
+    yield page
+    while page.next_page_token:
+        page = fetch(page.next_page_token)
+        yield page
+
+
+__all__ = (
+    'NO_TIME',
+    'nanos',
+    'scan_pages',
+)
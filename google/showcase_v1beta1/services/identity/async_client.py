@@ -0,0 +1,451 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from collections import OrderedDict
+from typing import Dict, Sequence, Tuple, Type, Union
+
+import google.api_core.client_options as ClientOptions # type: ignore
+from google.api_core import exceptions                 # type: ignore
+from google.api_core import gapic_v1                   # type: ignore
+from google.api_core import retry as retries           # type: ignore
+from google.auth import credentials                    # type: ignore
+
+from google.showcase_v1beta1.services.identity import pagers
+from google.showcase_v1beta1.types import identity
+
+from .client import IdentityClient
+from .transports.base import IdentityTransport
+from .transports.grpc_asyncio import IdentityGrpcAsyncIOTransport
+
+
+class _IdentityAsyncTransportClient(IdentityClient):
+    # Builds the transport of an IdentityAsyncClient, choosing among the
+    # asyncio transports; it is never used to make calls.
+    _transport_registry = OrderedDict()  # type: Dict[str, Type[IdentityTransport]]
+    _transport_registry['grpc_asyncio'] = IdentityGrpcAsyncIOTransport
+
+
+class IdentityAsyncClient:
+    """A simple identity service."""
+
+    DEFAULT_ENDPOINT = IdentityClient.DEFAULT_ENDPOINT
+    DEFAULT_MTLS_ENDPOINT = IdentityClient.DEFAULT_MTLS_ENDPOINT
+
+    user_path = staticmethod(IdentityClient.user_path)
+
+    @classmethod
+    def from_service_account_file(cls, filename: str, *args, **kwargs):
+        """Creates an instance of this client using the provided credentials
+        file.
+
+        Args:
+            filename (str): The path to the service account private key json
+                file.
+            args: Additional arguments to pass to the constructor.
+            kwargs: Additional arguments to pass to the constructor.
+
+        Returns:
+            {@api.name}: The constructed client.
+        """
+        return IdentityClient.from_service_account_file.__func__(  # type: ignore
+            cls, filename, *args, **kwargs)
+
+    from_service_account_json = from_service_account_file
+
+    @classmethod
+    def get_transport_class(cls,
+            label: str = None,
+            ) -> Type[IdentityTransport]:
+        """Return an appropriate transport class.
+
+        Args:
+            label: The name of the desired transport. If none is
+                provided, then the first transport in the registry is used.
+
+        Returns:
+            The transport class to use.
+        """
+        registry = _IdentityAsyncTransportClient._transport_registry
+        if not label:
+            return next(iter(registry.values()))
+        try:
+            return registry[label]
+        except KeyError:
+            raise ValueError(
+                'Unknown asyncio transport {!r}; expected one of: {}.'.format(
+                    label, ', '.join(registry))) from None
+
+    def __init__(self, *,
+            credentials: credentials.Credentials = None,
+            transport: Union[str, IdentityTransport] = 'grpc_asyncio',
+            client_options: ClientOptions.ClientOptions = None,
+            ) -> None:
+        """Instantiate the identity client.
+
+        Args:
+            credentials (Optional[google.auth.credentials.Credentials]): The
+                authorization credentials to attach to requests. These
+                credentials identify the application to the service; if none
+                are specified, the client will attempt to ascertain the
+                credentials from the environment.
+            transport (Union[str, ~.IdentityTransport]): The
+                transport to use. Defaults to the ``grpc_asyncio`` transport;
+                an instance must be an asyncio transport.
+            client_options (ClientOptions): Custom options for the client.
+                (1) The ``api_endpoint`` property can be used to override the
+                default endpoint provided by the client.
+                (2) If ``transport`` is not an instance, ``client_options`` can
+                be used to create a mutual TLS transport. If ``client_cert_source``
+                is provided, mutual TLS transport will be created with the given
+                ``api_endpoint`` or the default mTLS endpoint, and the client
+                SSL credentials obtained from ``client_cert_source``.
+
+        Raises:
+            ValueError: If ``transport`` is not an asyncio transport.
+            google.auth.exceptions.MutualTlsChannelError: If mutual TLS transport
+                creation failed for any reason.
+        """
+        # Calls are awaited on the transport, so it must be an asyncio one.
+        if isinstance(transport, IdentityTransport):
+            if not isinstance(transport, IdentityGrpcAsyncIOTransport):
+                raise ValueError(
+                    'IdentityAsyncClient needs an asyncio transport, such as '
+                    'IdentityGrpcAsyncIOTransport, not {}.'.format(
+                        type(transport).__name__))
+        else:
+            type(self).get_transport_class(transport)
+
+        # The synchronous client resolves the endpoint and builds the
+        # transport; calls are then made on the transport directly.
+        self._client = _IdentityAsyncTransportClient(
+            credentials=credentials,
+            transport=transport,
+            client_options=client_options,
+        )
+
+    async def __aenter__(self) -> 'IdentityAsyncClient':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        closed = self._client._transport.close()
+        if closed is not None:
+            await closed
+
+    async def create_user(self,
+            request: identity.CreateUserRequest = None,
+            *,
+            display_name: str = None,
+            email: str = None,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> identity.User:
+        r"""Creates a user.
+
+        Args:
+            request (:class:`~.identity.CreateUserRequest`):
+                The request object. The request message for the
+                google.showcase.v1beta1.Identity\CreateUser method.
+            display_name (:class:`str`):
+                The display\_name of the user.
+                This corresponds to the ``user.display_name`` field
+                on the ``request`` instance; if ``request`` is provided, this
+                should not be set.
+            email (:class:`str`):
+                The email address of the user.
+                This corresponds to the ``user.email`` field
+                on the ``request`` instance; if ``request`` is provided, this
+                should not be set.
+
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            ~.identity.User:
+                A user.
+        """
+        # Create or coerce a protobuf request object.
+        # Sanity check: If we got a request object, we should *not* have
+        # gotten any keyword arguments that map to the request.
+        if request is not None and any([display_name, email]):
+            raise ValueError('If the `request` argument is set, then none of '
+                             'the individual field arguments should be set.')
+
+        request = identity.CreateUserRequest(request)
+
+        # If we have keyword arguments corresponding to fields on the
+        # request, apply these.
+
+        if display_name is not None:
+            request.user.display_name = display_name
+        if email is not None:
+            request.user.email = email
+
+        # Look up the RPC method, wrapped once by the transport; this adds
+        # retry and timeout information, and friendly error handling.
+        rpc = self._client._transport._wrapped_methods['create_user']
+
+        # Send the request.
+        response = await rpc(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+        # Done; return the response.
+        return response
+
+    async def get_user(self,
+            request: identity.GetUserRequest = None,
+            *,
+            name: str = None,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> identity.User:
+        r"""Retrieves the User with the given uri.
+
+        Args:
+            request (:class:`~.identity.GetUserRequest`):
+                The request object. The request message for the
+                google.showcase.v1beta1.Identity\GetUser method.
+            name (:class:`str`):
+                The resource name of the requested
+                user.
+                This corresponds to the ``name`` field
+                on the ``request`` instance; if ``request`` is provided, this
+                should not be set.
+
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            ~.identity.User:
+                A user.
+        """
+        # Create or coerce a protobuf request object.
+        # Sanity check: If we got a request object, we should *not* have
+        # gotten any keyword arguments that map to the request.
+        if request is not None and any([name]):
+            raise ValueError('If the `request` argument is set, then none of '
+                             'the individual field arguments should be set.')
+
+        request = identity.GetUserRequest(request)
+
+        # If we have keyword arguments corresponding to fields on the
+        # request, apply these.
+
+        if name is not None:
+            request.name = name
+
+        # Look up the RPC method, wrapped once by the transport; this adds
+        # retry and timeout information, and friendly error handling.
+        rpc = self._client._transport._wrapped_methods['get_user']
+
+        # Certain fields should be provided within the metadata header;
+        # add these here.
+        metadata = tuple(metadata) + (
+            gapic_v1.routing_header.to_grpc_metadata((
+                ('name', request.name),
+            )),
+        )
+
+        # Send the request.
+        response = await rpc(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+        # Done; return the response.
+        return response
+
+    async def update_user(self,
+            request: identity.UpdateUserRequest = None,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> identity.User:
+        r"""Updates a user.
+
+        Args:
+            request (:class:`~.identity.UpdateUserRequest`):
+                The request object. The request message for the
+                google.showcase.v1beta1.Identity\UpdateUser method.
+
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            ~.identity.User:
+                A user.
+        """
+        # Create or coerce a protobuf request object.
+
+        request = identity.UpdateUserRequest(request)
+
+        # Look up the RPC method, wrapped once by the transport; this adds
+        # retry and timeout information, and friendly error handling.
+        rpc = self._client._transport._wrapped_methods['update_user']
+
+        # Send the request.
+        response = await rpc(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+        # Done; return the response.
+        return response
+
+    async def delete_user(self,
+            request: identity.DeleteUserRequest = None,
+            *,
+            name: str = None,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> None:
+        r"""Deletes a user, their profile, and all of their
+        authored messages.
+
+        Args:
+            request (:class:`~.identity.DeleteUserRequest`):
+                The request object. The request message for the
+                google.showcase.v1beta1.Identity\DeleteUser method.
+            name (:class:`str`):
+                The resource name of the user to
+                delete.
+                This corresponds to the ``name`` field
+                on the ``request`` instance; if ``request`` is provided, this
+                should not be set.
+
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+        """
+        # Create or coerce a protobuf request object.
+        # Sanity check: If we got a request object, we should *not* have
+        # gotten any keyword arguments that map to the request.
+        if request is not None and any([name]):
+            raise ValueError('If the `request` argument is set, then none of '
+                             'the individual field arguments should be set.')
+
+        request = identity.DeleteUserRequest(request)
+
+        # If we have keyword arguments corresponding to fields on the
+        # request, apply these.
+
+        if name is not None:
+            request.name = name
+
+        # Look up the RPC method, wrapped once by the transport; this adds
+        # retry and timeout information, and friendly error handling.
+        rpc = self._client._transport._wrapped_methods['delete_user']
+
+        # Send the request.
+        await rpc(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+    async def list_users(self,
+            request: identity.ListUsersRequest = None,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            prefetch: int = 0,
+            adaptive_page_size: pagers.AdaptivePageSize = None,
+            ) -> pagers.ListUsersAsyncPager:
+        r"""Lists all users.
+
+        Args:
+            request (:class:`~.identity.ListUsersRequest`):
+                The request object. The request message for the
+                google.showcase.v1beta1.Identity\ListUsers method.
+
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+            prefetch (int): The most pages to request concurrently ahead
+                of the iteration; see :class:`~.pagers.ListUsersAsyncPager`.
+            adaptive_page_size (~.pagers.AdaptivePageSize): Adjusts the
+                page size of the requests for further pages.
+
+        Returns:
+            ~.pagers.ListUsersAsyncPager:
+                The response message for the
+                google.showcase.v1beta1.Identity\ListUsers
+                method.
+                Iterating over this object will yield
+                results and resolve additional pages
+                automatically.
+
+        """
+        # Create or coerce a protobuf request object.
+
+        request = identity.ListUsersRequest(request)
+
+        # Look up the RPC method, wrapped once by the transport; this adds
+        # retry and timeout information, and friendly error handling.
+        rpc = self._client._transport._wrapped_methods['list_users']
+
+        # Send the request.
+        response = await rpc(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+        # This method is paged; wrap the response in a pager, which provides
+        # an `__aiter__` convenience method.
+        response = pagers.ListUsersAsyncPager(
+            method=rpc,
+            request=request,
+            response=response,
+            prefetch=prefetch,
+            adaptive_page_size=adaptive_page_size,
+        )
+
+        # Done; return the response.
+        return response
+
+
+__all__ = (
+    'IdentityAsyncClient',
+)
@@ -0,0 +1,381 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import collections
+import contextlib
+import csv
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence, Set, Tuple, Union
+
+from google.api_core import exceptions                 # type: ignore
+from google.api_core import gapic_v1                   # type: ignore
+
+from google.protobuf import json_format  # type: ignore
+from google.showcase_v1beta1.services import _batching
+from google.showcase_v1beta1.types import identity
+
+from .client import IdentityClient
+
+
+UserPb = identity.User.pb()
+CreateUserRequestPb = identity.CreateUserRequest.pb()
+DeleteUserRequestPb = identity.DeleteUserRequest.pb()
+ListUsersRequestPb = identity.ListUsersRequest.pb()
+
+FORMATS = ('ndjson', 'csv')
+
+ImportStats = collections.namedtuple(
+    'ImportStats', ('created', 'failed', 'skipped'))
+ImportStats.__doc__ = """The outcome of :func:`import_users`.
+
+Attributes:
+    created (int): The users created by this run.
+    failed (int): The records which could not be read, or whose user could
+        not be created.
+    skipped (int): The records created by an earlier run.
+"""
+
+# The errors after which a deletion is tried again.
+TRANSIENT_ERRORS = (
+    exceptions.Aborted,
+    exceptions.DeadlineExceeded,
+    exceptions.ResourceExhausted,
+    exceptions.ServiceUnavailable,
+)
+
+
+class DeleteStats(collections.namedtuple(
+        'DeleteStats', ('deleted', 'not_found', 'failed', 'elapsed', 'errors'))):
+    """The progress or outcome of :func:`delete_users`.
+
+    Attributes:
+        deleted (int): The users deleted.
+        not_found (int): The users which did not exist, e.g. because an
+            earlier attempt deleted them.
+        failed (int): The users which could not be deleted.
+        elapsed (float): The seconds since the deletion started.
+        errors (Dict[str, BaseException]): The error of each user which
+            could not be deleted, by name.
+    """
+    __slots__ = ()
+
+    @property
+    def throughput(self) -> float:
+        """The users deleted or found missing per second."""
+        if not self.elapsed:
+            return 0.0
+        return (self.deleted + self.not_found) / self.elapsed
+
+
+def _format_of(path, format):
+    if format is None:
+        format = 'csv' if path.lower().endswith('.csv') else 'ndjson'
+    if format not in FORMATS:
+        raise ValueError('format must be one of {}.'.format(', '.join(FORMATS)))
+    return format
+
+
+def read_records(
+        path: str,
+        format: str = None,
+        ) -> Iterator[Tuple[int, Union[Dict[str, Any], ValueError]]]:
+    """Read user records from a file, one at a time.
+
+    An NDJSON file holds one JSON object per line; blank lines are
+    skipped. A CSV file has a header row naming a field of each column;
+    empty cells are left unset. Field names are those of
+    :class:`~.identity.User`, e.g. ``display_name`` and ``email``.
+
+    Args:
+        path (str): The file.
+        format (str): ``'ndjson'`` or ``'csv'``; by default, ``'csv'`` for
+            a ``.csv`` file and ``'ndjson'`` otherwise.
+
+    Yields:
+        Tuple[int, Union[Dict[str, Any], ValueError]]: The number of each
+            record, counting from 1, and its fields. A malformed NDJSON
+            line yields the error instead of its fields.
+    """
+    format = _format_of(path, format)
+    with open(path, newline='', encoding='utf-8') as fp:
+        if format == 'csv':
+            for number, row in enumerate(csv.DictReader(fp), 1):
+                yield number, {k: v for k, v in row.items() if v}
+            return
+
+        number = 0
+        for line in fp:
+            if not line.strip():
+                continue
+            number += 1
+            try:
+                yield number, json.loads(line)
+            except ValueError as exc:
+                yield number, exc
+
+
+def _completed(results_path):
+    """Return the records created according to a results file, and
+    whether its last line is incomplete."""
+    done = set()  # type: Set[int]
+    line = '\n'
+    if not os.path.exists(results_path):
+        return done, False
+    with open(results_path, encoding='utf-8') as fp:
+        for line in fp:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                # The last line of an interrupted run may be incomplete.
+                continue
+            if 'name' in result:
+                done.add(result['record'])
+    return done, not line.endswith('\n')
+
+
+def _describe(exc):
+    return '{}: {}'.format(type(exc).__name__, exc)
+
+
+def import_users(
+        client: IdentityClient,
+        path: str,
+        results_path: str,
+        *,
+        format: str = None,
+        max_in_flight: int = 32,
+        rate: float = None,
+        timeout: float = gapic_v1.method.DEFAULT,
+        metadata: Sequence[Tuple[str, str]] = (),
+        ) -> ImportStats:
+    """Create a user for each record of a file.
+
+    Records are read as they are sent (see :func:`read_records`), and up
+    to ``max_in_flight`` ``create_user`` calls are kept outstanding, on
+    raw protobuf messages, so memory does not grow with the file.
+
+    The outcome of each record is appended to ``results_path`` as it
+    completes, one JSON object per line: ``{"record": 1, "name":
+    "users/1"}`` or ``{"record": 2, "error": "..."}``. Running the import
+    again with the same results file skips the records already created,
+    and retries the rest. Calls are not retried otherwise, as creating a
+    user is not idempotent; for the same reason, a call in flight when an
+    import is interrupted may have created its user without recording it.
+
+    Args:
+        client (~.IdentityClient): The client to create users with.
+        path (str): The file of records.
+        results_path (str): The file to append outcomes to.
+        format (str): ``'ndjson'`` or ``'csv'``; by default, inferred from
+            the extension of ``path``.
+        max_in_flight (int): The most calls to have outstanding.
+        rate (float): The most calls to start per second; by default,
+            unlimited.
+        timeout (float): The timeout for each call.
+        metadata (Sequence[Tuple[str, str]]): Strings which should be
+            sent along with each request as metadata.
+
+    Returns:
+        ~.ImportStats: The counts of records by outcome.
+    """
+    format = _format_of(path, format)
+    done, partial = _completed(results_path)
+    limiter = _batching.RateLimiter(rate) if rate else None
+    rpc = client.raw.rpc('create_user')
+    skipped = 0
+
+    def pending():
+        nonlocal skipped
+        for number, record in read_records(path, format):
+            if number in done:
+                skipped += 1
+            else:
+                yield number, record
+
+    def start(numbered):
+        _, record = numbered
+        if isinstance(record, Exception):
+            raise record
+        request = CreateUserRequestPb(
+            user=json_format.ParseDict(record, UserPb()))
+        if limiter is not None:
+            limiter.acquire()
+        return rpc.future(request, timeout=timeout, metadata=metadata)
+
+    created = failed = 0
+    results = _batching.run_windowed(
+        start, pending(), max_in_flight, ordered=False)
+    with open(results_path, 'a', buffering=1, encoding='utf-8') as out, \
+            contextlib.closing(results):
+        if partial:
+            out.write('\n')
+        for result in results:
+            outcome = {'record': result.request[0]}
+            if result.exception is None:
+                outcome['name'] = result.response.name
+                created += 1
+                # As with ``create_user``, the name may be cached as not
+                # found.
+                client.invalidate_user(result.response.name)
+            else:
+                outcome['error'] = _describe(result.exception)
+                failed += 1
+            out.write(json.dumps(outcome) + '\n')
+
+    return ImportStats(created=created, failed=failed, skipped=skipped)
+
+
+def _matching_names(client, where, timeout, metadata):
+    # Deleting users moves the page boundaries of a scan, so the names are
+    # all found before any is deleted.
+    names = []  # type: List[str]
+    page_token = ''
+    while True:
+        page = client.raw.list_users(
+            ListUsersRequestPb(page_token=page_token),
+            timeout=timeout,
+            metadata=metadata,
+        )
+        names.extend(
+            user.name for user in page.users if where(identity.User.wrap(user)))
+        if not page.next_page_token:
+            return names
+        page_token = page.next_page_token
+
+
+def delete_users(
+        client: IdentityClient,
+        names: Iterable[str] = None,
+        *,
+        where: Callable[[identity.User], bool] = None,
+        max_in_flight: int = 32,
+        rate: float = None,
+        max_attempts: int = 3,
+        retry_delay: float = 0.5,
+        progress: Callable[[DeleteStats], None] = None,
+        progress_interval: float = 1.0,
+        timeout: float = gapic_v1.method.DEFAULT,
+        metadata: Sequence[Tuple[str, str]] = (),
+        ) -> DeleteStats:
+    """Delete many users, keeping several deletions in flight.
+
+    Up to ``max_in_flight`` ``delete_user`` calls are kept outstanding,
+    on raw protobuf messages. Deletions which fail with one of
+    :data:`TRANSIENT_ERRORS` are tried again once the others are done,
+    after ``retry_delay`` seconds, doubling each round, up to
+    ``max_attempts`` tries in all. A user found missing is not an error.
+
+    Args:
+        client (~.IdentityClient): The client to delete users with.
+        names (Iterable[str]): The resource names of the users, consumed
+            lazily.
+        where (Callable[[~.identity.User], bool]): Instead of ``names``,
+            delete the users ``list_users`` returns which this accepts.
+            The scan completes before the first deletion.
+        max_in_flight (int): The most calls to have outstanding.
+        rate (float): The most calls to start per second; by default,
+            unlimited.
+        max_attempts (int): The most times to try each deletion.
+        retry_delay (float): The seconds to wait before the first retry.
+        progress (Callable[[~.DeleteStats], None]): Called with the
+            progress so far, at most every ``progress_interval`` seconds,
+            and once at the end.
+        progress_interval (float): The least seconds between progress
+            reports.
+        timeout (float): The timeout for each call.
+        metadata (Sequence[Tuple[str, str]]): Strings which should be
+            sent along with each request as metadata.
+
+    Returns:
+        ~.DeleteStats: The outcome.
+    """
+    if (names is None) == (where is None):
+        raise ValueError('Exactly one of names and where must be given.')
+    if max_attempts < 1:
+        raise ValueError('max_attempts must be positive.')
+
+    started = time.monotonic()
+    if names is None:
+        names = _matching_names(client, where, timeout, metadata)
+    limiter = _batching.RateLimiter(rate) if rate else None
+    rpc = client.raw.rpc('delete_user')
+
+    def start(name):
+        if limiter is not None:
+            limiter.acquire()
+        return rpc.future(
+            DeleteUserRequestPb(name=name), timeout=timeout, metadata=metadata)
+
+    deleted = not_found = 0
+    errors = {}  # type: Dict[str, BaseException]
+    reported = started
+
+    def stats():
+        return DeleteStats(
+            deleted=deleted,
+            not_found=not_found,
+            failed=len(errors),
+            elapsed=time.monotonic() - started,
+            errors=dict(errors),
+        )
+
+    for attempt in range(max_attempts):
+        if attempt:
+            time.sleep(retry_delay * 2 ** (attempt - 1))
+        retrying = []  # type: List[str]
+        results = _batching.run_windowed(
+            start, names, max_in_flight, ordered=False)
+        with contextlib.closing(results):
+            for result in results:
+                name = result.request
+                exc = result.exception
+                # As with ``delete_user``, the cached user may be gone
+                # whether or not the call succeeded.
+                client.invalidate_user(name)
+                if exc is None:
+                    deleted += 1
+                elif isinstance(exc, exceptions.NotFound):
+                    not_found += 1
+                elif (isinstance(exc, TRANSIENT_ERRORS)
+                        and attempt + 1 < max_attempts):
+                    retrying.append(name)
+                else:
+                    errors[name] = exc
+                if progress is not None and (
+                        time.monotonic() - reported >= progress_interval):
+                    reported = time.monotonic()
+                    progress(stats())
+        if not retrying:
+            break
+        names = retrying
+
+    final = stats()
+    if progress is not None:
+        progress(final)
+    return final
+
+
+__all__ = (
+    'DeleteStats',
+    'ImportStats',
+    'TRANSIENT_ERRORS',
+    'delete_users',
+    'import_users',
+    'read_records',
+)
@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import collections
+import copy
+import threading
+import time
+import typing
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from google.api_core import exceptions  # type: ignore
+from google.showcase_v1beta1.types import identity
+
+
+CacheStats = collections.namedtuple(
+    'CacheStats', ('hits', 'stale_hits', 'negative_hits', 'misses', 'evictions',
+                   'invalidations'))
+CacheStats.__doc__ = """Counters of a :class:`UserCache`, since it was created."""
+
+
+def _copy_error(error):
+    # A raised error collects the frames it passes through, so each lookup
+    # raises its own copy of a cached error rather than the shared one.
+    return copy.copy(error).with_traceback(None)
+
+
+class _Entry(object):
+    __slots__ = ('user', 'loaded', 'error')
+
+    def __init__(self, user, loaded, error=None):
+        self.user = user
+        self.loaded = loaded
+        # The NotFound error of a user known not to exist.
+        self.error = error
+
+
+class UserCache(object):
+    """A read-through cache of users, keyed by resource name.
+
+    Pass one to :class:`~.IdentityClient` to serve ``get_user`` from it.
+    A user loaded less than ``ttl`` seconds ago is returned without a
+    call. For ``stale_ttl`` seconds after that, the cached user is still
+    returned, while a background call refreshes it; after that, the next
+    lookup waits for a fresh call. The least recently used users are
+    evicted beyond ``maxsize``.
+
+    With ``negative_ttl``, a lookup which fails with
+    :class:`~google.api_core.exceptions.NotFound` is remembered too, and
+    for that many seconds lookups of the name raise a copy of the error
+    without a call.
+
+    The client drops a user from the cache when it creates, updates or
+    deletes it, and a user being loaded at the time is not stored, so the
+    client never serves a user older than its own writes. Changes made by
+    other clients, including users they create, are seen once the cached
+    entry expires.
+
+    Each lookup returns its own copy of the cached user.
+
+    Args:
+        maxsize (int): The most users to hold.
+        ttl (float): The seconds a user is served without a call.
+        stale_ttl (float): The seconds after ``ttl`` during which the user
+            is served while being refreshed in the background.
+        negative_ttl (float): The seconds a user which was not found is
+            reported missing without a call; 0 disables this.
+        max_refreshes (int): The most background refreshes at once;
+            beyond it, stale users are served without a refresh.
+        clock (Callable[[], float]): The time source, in seconds.
+    """
+    def __init__(self,
+            maxsize: int = 1024,
+            ttl: float = 60.0,
+            *,
+            stale_ttl: float = 0.0,
+            negative_ttl: float = 0.0,
+            max_refreshes: int = 4,
+            clock: Callable[[], float] = time.monotonic):
+        if maxsize < 1:
+            raise ValueError('maxsize must be positive.')
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._stale_ttl = stale_ttl
+        self._negative_ttl = negative_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()  # type: typing.OrderedDict[str, _Entry]
+        # The token of the latest load of each user; a load only stores
+        # its result if it still holds the token.
+        self._loading = {}  # type: Dict[str, object]
+        self._refreshing = set()  # type: Set[str]
+        self._refresh_slots = threading.BoundedSemaphore(max_refreshes)
+        self._hits = self._stale_hits = self._negative_hits = self._misses = 0
+        self._evictions = self._invalidations = 0
+
+    def get(self, name: str, load: Callable[[], identity.User]) -> identity.User:
+        """Return the user, loading it if it is not held fresh.
+
+        Args:
+            name (str): The resource name of the user.
+            load (Callable[[], ~.identity.User]): Fetches the user.
+
+        Returns:
+            ~.identity.User: A copy of the user.
+
+        Raises:
+            google.api_core.exceptions.NotFound: If the user was not found,
+                now or within ``negative_ttl`` seconds.
+        """
+        refresh = False
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None:
+                age = self._clock() - entry.loaded
+                if entry.error is not None:
+                    if age < self._negative_ttl:
+                        self._entries.move_to_end(name)
+                        self._negative_hits += 1
+                    else:
+                        del self._entries[name]
+                        entry = None
+                elif age < self._ttl:
+                    self._entries.move_to_end(name)
+                    self._hits += 1
+                elif age < self._ttl + self._stale_ttl:
+                    self._entries.move_to_end(name)
+                    self._stale_hits += 1
+                    refresh = name not in self._refreshing
+                    if refresh:
+                        self._refreshing.add(name)
+                else:
+                    del self._entries[name]
+                    entry = None
+            if entry is None:
+                self._misses += 1
+                token = self._loading[name] = object()
+
+        if entry is not None:
+            if entry.error is not None:
+                raise _copy_error(entry.error)
+            if refresh:
+                self._start_refresh(name, load)
+            return identity.User(entry.user)
+
+        try:
+            user = load()
+        except exceptions.NotFound as exc:
+            self._store_missing(name, exc, token)
+            raise
+        except BaseException:
+            self._abandon(name, token)
+            raise
+        self._store(name, user, token)
+        return identity.User(user)
+
+    def get_many(self,
+            names: Sequence[str],
+            load_many: Callable[
+                [List[str]],
+                Iterable[Tuple[str, Union[identity.User, Exception]]]],
+            ) -> Dict[str, Union[identity.User, Exception]]:
+        """Return many users, loading those not held fresh in one batch.
+
+        Users held fresh, or held as not found, are returned without a
+        load. The rest, including stale ones, are passed together to
+        ``load_many``.
+
+        Args:
+            names (Sequence[str]): The distinct resource names of the users.
+            load_many (Callable[[List[str]], Iterable[Tuple[str, Union[~.identity.User, Exception]]]]):
+                Fetches the users of the names given, yielding each name
+                with its user or the error of its lookup.
+
+        Returns:
+            Dict[str, Union[~.identity.User, Exception]]: A copy of each
+                user, or the error of its lookup, by name.
+        """
+        held = {}  # type: Dict[str, _Entry]
+        tokens = {}  # type: Dict[str, object]
+        with self._lock:
+            now = self._clock()
+            for name in names:
+                entry = self._entries.get(name)
+                if entry is not None:
+                    age = now - entry.loaded
+                    if entry.error is not None and age < self._negative_ttl:
+                        self._entries.move_to_end(name)
+                        self._negative_hits += 1
+                        held[name] = entry
+                        continue
+                    if entry.error is None and age < self._ttl:
+                        self._entries.move_to_end(name)
+                        self._hits += 1
+                        held[name] = entry
+                        continue
+                self._misses += 1
+                tokens[name] = self._loading[name] = object()
+
+        results = {}  # type: Dict[str, Union[identity.User, Exception]]
+        for name, entry in held.items():
+            if entry.error is not None:
+                results[name] = _copy_error(entry.error)
+            else:
+                results[name] = identity.User(entry.user)
+        if not tokens:
+            return results
+
+        try:
+            for name, outcome in load_many(list(tokens)):
+                token = tokens.pop(name)
+                if isinstance(outcome, exceptions.NotFound):
+                    self._store_missing(name, outcome, token)
+                elif isinstance(outcome, Exception):
+                    self._abandon(name, token)
+                else:
+                    self._store(name, outcome, token)
+                    outcome = identity.User(outcome)
+                results[name] = outcome
+        finally:
+            for name, token in tokens.items():
+                self._abandon(name, token)
+        return results
+
+    def _start_refresh(self, name, load):
+        if not self._refresh_slots.acquire(blocking=False):
+            with self._lock:
+                self._refreshing.discard(name)
+            return
+        threading.Thread(
+            target=self._refresh,
+            args=(name, load),
+            name='UserCache-refresh',
+            daemon=True,
+        ).start()
+
+    def _refresh(self, name, load):
+        try:
+            with self._lock:
+                token = self._loading[name] = object()
+            try:
+                user = load()
+            except exceptions.NotFound as exc:
+                # The user was deleted meanwhile.
+                self._store_missing(name, exc, token)
+            except Exception:
+                # Keep serving the stale user until it expires.
+                self._abandon(name, token)
+            else:
+                self._store(name, user, token)
+        finally:
+            with self._lock:
+                self._refreshing.discard(name)
+            self._refresh_slots.release()
+
+    def _abandon(self, name, token):
+        with self._lock:
+            if self._loading.get(name) is token:
+                del self._loading[name]
+
+    def _store_missing(self, name, error, token):
+        if self._negative_ttl > 0:
+            self._store(name, None, token, _copy_error(error))
+        else:
+            with self._lock:
+                self._entries.pop(name, None)
+            self._abandon(name, token)
+
+    def _store(self, name, user, token, error=None):
+        with self._lock:
+            if self._loading.get(name) is not token:
+                return
+            del self._loading[name]
+            self._entries[name] = _Entry(user, self._clock(), error)
+            self._entries.move_to_end(name)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def peek(self, name: str) -> Optional[identity.User]:
+        """Return a copy of the held user, fresh or not, without loading it.
+
+        Returns:
+            Optional[~.identity.User]: The user, or None if not held or held
+                as not found.
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+        if entry is None or entry.error is not None:
+            return None
+        return identity.User(entry.user)
+
+    def invalidate(self, name: str) -> None:
+        """Drop a user, and discard any load of it in progress."""
+        with self._lock:
+            self._entries.pop(name, None)
+            self._loading.pop(name, None)
+            self._invalidations += 1
+
+    def clear(self) -> None:
+        """Drop all users."""
+        with self._lock:
+            self._entries.clear()
+            self._loading.clear()
+
+    def stats(self) -> CacheStats:
+        """Return the counters of the cache."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                stale_hits=self._stale_hits,
+                negative_hits=self._negative_hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                invalidations=self._invalidations,
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+__all__ = (
+    'CacheStats',
+    'UserCache',
+)
@@ -16,9 +16,10 @@
 #
 
 from collections import OrderedDict
+import contextlib
+import functools
 import re
-from typing import Callable, Dict, Sequence, Tuple, Type, Union
-import pkg_resources
+from typing import Callable, Dict, Iterable, Sequence, Tuple, Type, Union, cast
 
 import google.api_core.client_options as ClientOptions # type: ignore
 from google.api_core import exceptions                 # type: ignore
@@ -28,11 +29,16 @@ from google.auth import credentials                    # type: ignore
 from google.oauth2 import service_account              # type: ignore
 
 from google.protobuf import timestamp_pb2 as timestamp  # type: ignore
+from google.showcase_v1beta1.services import _batching
+from google.showcase_v1beta1.services import _singleflight
 from google.showcase_v1beta1.services.identity import pagers
 from google.showcase_v1beta1.types import identity
 
+from .cache import UserCache
+from .raw import RawIdentityClient
 from .transports.base import IdentityTransport
 from .transports.grpc import IdentityGrpcTransport
+from .transports.grpc_multichannel import IdentityGrpcMultiChannelTransport
 
 
 class IdentityClientMeta(type):
@@ -44,6 +50,7 @@ class IdentityClientMeta(type):
     """
     _transport_registry = OrderedDict()  # type: Dict[str, Type[IdentityTransport]]
     _transport_registry['grpc'] = IdentityGrpcTransport
+    _transport_registry['grpc_multichannel'] = IdentityGrpcMultiChannelTransport
 
     def get_transport_class(cls,
             label: str = None,
@@ -133,6 +140,8 @@ class IdentityClient(metaclass=IdentityClientMeta):
             credentials: credentials.Credentials = None,
             transport: Union[str, IdentityTransport] = None,
             client_options: ClientOptions = None,
+            user_cache: UserCache = None,
+            coalesce_reads: bool = False,
             ) -> None:
         """Instantiate the identity client.
 
@@ -153,6 +162,12 @@ class IdentityClient(metaclass=IdentityClientMeta):
                 is provided, mutual TLS transport will be created with the given
                 ``api_endpoint`` or the default mTLS endpoint, and the client
                 SSL credentials obtained from ``client_cert_source``.
+            user_cache (~.UserCache): If set, ``get_user`` is served from
+                this cache, which this client keeps up to date with its own
+                ``create_user``, ``update_user`` and ``delete_user`` calls.
+            coalesce_reads (bool): If True, concurrent ``get_user`` calls
+                for the same user share one request, made with the
+                options of the first of them.
 
         Raises:
             google.auth.exceptions.MutualTlsChannelError: If mutual TLS transport
@@ -161,6 +176,10 @@ class IdentityClient(metaclass=IdentityClientMeta):
         if isinstance(client_options, dict):
             client_options = ClientOptions.from_dict(client_options)
 
+        self._user_cache = user_cache
+        self._single_flight = (
+            _singleflight.SingleFlight() if coalesce_reads else None)
+
         # Save or instantiate the transport.
         # Ordinarily, we provide the transport, but allowing a custom transport
         # instance provides an extensibility point for unusual situations.
@@ -198,20 +217,52 @@ class IdentityClient(metaclass=IdentityClientMeta):
                 else self.DEFAULT_ENDPOINT
             )
 
-            self._transport = IdentityGrpcTransport(
+            # Every registered transport also takes the mTLS arguments,
+            # which IdentityTransport itself does not declare.
+            Transport = type(self).get_transport_class(transport)
+            self._transport = cast(Callable[..., IdentityTransport], Transport)(
                 credentials=credentials,
                 host=api_endpoint,
                 api_mtls_endpoint=api_mtls_endpoint,
                 client_cert_source=client_options.client_cert_source,
             )
 
+    @property
+    def raw(self) -> RawIdentityClient:
+        """The methods of this client on raw protobuf messages.
+
+        See :class:`~.RawIdentityClient`. It shares this client's transport, and is
+        created on first use; repeated calls return the same object.
+        """
+        if 'raw' not in self.__dict__:
+            self.__dict__['raw'] = RawIdentityClient(self)
+        return self.__dict__['raw']
+
+    def invalidate_user(self, name: str) -> None:
+        """Drop a user from the user cache of this client, if it has one.
+
+        Call this after changing the user by other means than this client,
+        e.g. through :attr:`raw`.
+
+        Args:
+            name (str): The resource name of the user.
+        """
+        if self._user_cache is not None:
+            self._user_cache.invalidate(name)
+
+    def _coalesced(self, key, send):
+        """Send a request, or share the result of an identical one."""
+        response, shared = self._single_flight.do(key, send)
+        # Each caller gets its own message to change.
+        return type(response)(response) if shared else response
+
     def create_user(self,
             request: identity.CreateUserRequest = None,
             *,
             display_name: str = None,
             email: str = None,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
             ) -> identity.User:
         r"""Creates a user.
@@ -258,13 +309,9 @@ class IdentityClient(metaclass=IdentityClientMeta):
         if email is not None:
             request.user.email = email
 
-        # Wrap the RPC method; this adds retry and timeout information,
-        # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.create_user,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        # Look up the RPC method, wrapped once by the transport; this adds
+        # retry and timeout information, and friendly error handling.
+        rpc = self._transport._wrapped_methods['create_user']
 
         # Send the request.
         response = rpc(
@@ -274,6 +321,10 @@ class IdentityClient(metaclass=IdentityClientMeta):
             metadata=metadata,
         )
 
+        # The name may be cached as not found.
+        if self._user_cache is not None:
+            self._user_cache.invalidate(response.name)
+
         # Done; return the response.
         return response
 
@@ -282,7 +333,7 @@ class IdentityClient(metaclass=IdentityClientMeta):
             *,
             name: str = None,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
             ) -> identity.User:
         r"""Retrieves the User with the given uri.
@@ -323,13 +374,9 @@ class IdentityClient(metaclass=IdentityClientMeta):
         if name is not None:
             request.name = name
 
-        # Wrap the RPC method; this adds retry and timeout information,
-        # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.get_user,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        # Look up the RPC method, wrapped once by the transport; this adds
+        # retry and timeout information, and friendly error handling.
+        rpc = self._transport._wrapped_methods['get_user']
 
         # Certain fields should be provided within the metadata header;
         # add these here.
@@ -339,22 +386,115 @@ class IdentityClient(metaclass=IdentityClientMeta):
             )),
         )
 
-        # Send the request.
-        response = rpc(
+        send = functools.partial(
+            rpc,
             request,
             retry=retry,
             timeout=timeout,
             metadata=metadata,
         )
 
+        # Merge the request with an identical one in flight, if enabled.
+        if self._single_flight is not None:
+            send = functools.partial(
+                self._coalesced, ('get_user', request.name), send)
+
+        # Serve the user from the cache, if there is one; it sends the
+        # request only for users it does not hold.
+        if self._user_cache is not None:
+            return self._user_cache.get(request.name, send)
+
+        # Send the request.
+        response = send()
+
         # Done; return the response.
         return response
 
+    def get_users(self,
+            names: Iterable[str],
+            *,
+            max_in_flight: int = 16,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> Dict[str, _batching.BatchResult]:
+        r"""Retrieves many users concurrently.
+
+        Users held fresh by the user cache of this client are returned
+        without a call. Each other distinct name is looked up once, and up
+        to ``max_in_flight`` ``GetUser`` calls are kept outstanding, using
+        the non-blocking form of the RPC. Calls are not retried, nor merged
+        with ``get_user`` calls in flight.
+
+        Args:
+            names (Iterable[str]): The resource names of the users;
+                repeated names are looked up once.
+            max_in_flight (int): The most calls to have outstanding.
+            timeout (float): The timeout for each call.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with each request as metadata.
+
+        Returns:
+            Dict[str, ~._batching.BatchResult]:
+                The outcome of each lookup, by name, in the order the names
+                were first given. A failed lookup, e.g. of a user which
+                does not exist, is reported in its result's ``exception``
+                and does not stop the others.
+        """
+        if max_in_flight < 1:
+            raise ValueError('max_in_flight must be positive.')
+        names = list(OrderedDict.fromkeys(names))
+
+        # Look up the RPC method, wrapped once by the transport; this adds
+        # the default timeout and the user-agent metadata.
+        rpc = self._transport._wrapped_methods['get_user']
+
+        def start(request):
+            return rpc.future(
+                request,
+                timeout=timeout,
+                metadata=tuple(metadata) + (
+                    gapic_v1.routing_header.to_grpc_metadata((
+                        ('name', request.name),
+                    )),
+                ),
+            )
+
+        def load_many(missed):
+            results = _batching.run_windowed(
+                start,
+                (identity.GetUserRequest(name=name) for name in missed),
+                max_in_flight,
+                ordered=False,
+            )
+            with contextlib.closing(results):
+                for result in results:
+                    yield result.request.name, (
+                        result.response if result.exception is None
+                        else result.exception)
+
+        # Serve the users the cache holds; it loads the rest in one batch.
+        if self._user_cache is not None:
+            outcomes = self._user_cache.get_many(names, load_many)
+        else:
+            outcomes = dict(load_many(names))
+
+        results = {}  # type: Dict[str, _batching.BatchResult]
+        for index, name in enumerate(names):
+            request = identity.GetUserRequest(name=name)
+            outcome = outcomes[name]
+            if isinstance(outcome, Exception):
+                results[name] = _batching.BatchResult(
+                    index, request, exception=outcome)
+            else:
+                results[name] = _batching.BatchResult(
+                    index, request, response=outcome)
+        return results
+
     def update_user(self,
             request: identity.UpdateUserRequest = None,
             *,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
             ) -> identity.User:
         r"""Updates a user.
@@ -378,21 +518,22 @@ class IdentityClient(metaclass=IdentityClientMeta):
 
         request = identity.UpdateUserRequest(request)
 
-        # Wrap the RPC method; this adds retry and timeout information,
-        # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.update_user,
-            default_timeout=None,
-            client_info=_client_info,
-        )
-
-        # Send the request.
-        response = rpc(
-            request,
-            retry=retry,
-            timeout=timeout,
-            metadata=metadata,
-        )
+        # Look up the RPC method, wrapped once by the transport; this adds
+        # retry and timeout information, and friendly error handling.
+        rpc = self._transport._wrapped_methods['update_user']
+
+        # Send the request. Whether or not it succeeds, the cached user may
+        # no longer be current.
+        try:
+            response = rpc(
+                request,
+                retry=retry,
+                timeout=timeout,
+                metadata=metadata,
+            )
+        finally:
+            if self._user_cache is not None:
+                self._user_cache.invalidate(request.user.name)
 
         # Done; return the response.
         return response
@@ -402,7 +543,7 @@ class IdentityClient(metaclass=IdentityClientMeta):
             *,
             name: str = None,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
             ) -> None:
         r"""Deletes a user, their profile, and all of their
@@ -440,28 +581,31 @@ class IdentityClient(metaclass=IdentityClientMeta):
         if name is not None:
             request.name = name
 
-        # Wrap the RPC method; this adds retry and timeout information,
-        # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.delete_user,
-            default_timeout=None,
-            client_info=_client_info,
-        )
-
-        # Send the request.
-        rpc(
-            request,
-            retry=retry,
-            timeout=timeout,
-            metadata=metadata,
-        )
+        # Look up the RPC method, wrapped once by the transport; this adds
+        # retry and timeout information, and friendly error handling.
+        rpc = self._transport._wrapped_methods['delete_user']
+
+        # Send the request. Whether or not it succeeds, the cached user may
+        # no longer be current.
+        try:
+            rpc(
+                request,
+                retry=retry,
+                timeout=timeout,
+                metadata=metadata,
+            )
+        finally:
+            if self._user_cache is not None:
+                self._user_cache.invalidate(request.name)
 
     def list_users(self,
             request: identity.ListUsersRequest = None,
             *,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
+            prefetch: int = 0,
+            adaptive_page_size: pagers.AdaptivePageSize = None,
             ) -> pagers.ListUsersPager:
         r"""Lists all users.
 
@@ -475,6 +619,10 @@ class IdentityClient(metaclass=IdentityClientMeta):
             timeout (float): The timeout for this request.
             metadata (Sequence[Tuple[str, str]]): Strings which should be
                 sent along with the request as metadata.
+            prefetch (int): The most pages to request in the background
+                ahead of the iteration; see :class:`~.pagers.ListUsersPager`.
+            adaptive_page_size (~.pagers.AdaptivePageSize): Adjusts the
+                page size of the requests for further pages.
 
         Returns:
             ~.pagers.ListUsersPager:
@@ -490,13 +638,9 @@ class IdentityClient(metaclass=IdentityClientMeta):
 
         request = identity.ListUsersRequest(request)
 
-        # Wrap the RPC method; this adds retry and timeout information,
-        # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.list_users,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        # Look up the RPC method, wrapped once by the transport; this adds
+        # retry and timeout information, and friendly error handling.
+        rpc = self._transport._wrapped_methods['list_users']
 
         # Send the request.
         response = rpc(
@@ -512,25 +656,14 @@ class IdentityClient(metaclass=IdentityClientMeta):
             method=rpc,
             request=request,
             response=response,
+            prefetch=prefetch,
+            adaptive_page_size=adaptive_page_size,
         )
 
         # Done; return the response.
         return response
 
 
-
-
-
-try:
-    _client_info = gapic_v1.client_info.ClientInfo(
-        gapic_version=pkg_resources.get_distribution(
-            'google-showcase',
-        ).version,
-    )
-except pkg_resources.DistributionNotFound:
-    _client_info = gapic_v1.client_info.ClientInfo()
-
-
 __all__ = (
     'IdentityClient',
 )
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+import threading
+import time
+from typing import Callable, Iterator, Optional, Sequence, Tuple
+
+from google.api_core import gapic_v1                   # type: ignore
+from google.api_core import retry as retries           # type: ignore
+
+from google.showcase_v1beta1.types import identity
+
+from .client import IdentityClient
+from .export import UserColumns
+from .export import export_users
+
+
+def write_directory(
+        client: IdentityClient,
+        path: str,
+        request: identity.ListUsersRequest = None,
+        *,
+        prefetch: int = 1,
+        retry: retries.Retry = gapic_v1.method.DEFAULT,
+        timeout: float = gapic_v1.method.DEFAULT,
+        metadata: Sequence[Tuple[str, str]] = (),
+        ) -> int:
+    """Scan ``list_users`` into a file for :class:`UserDirectory`.
+
+    The users are exported as :class:`~.UserColumns`, sorted by name, and
+    saved uncompressed. The file is written beside ``path`` and moved into
+    place, so a directory open on the old file keeps reading it until it
+    reloads.
+
+    Args:
+        client (~.IdentityClient): The client to list users with.
+        path (str): The file to write.
+        request (:class:`~.identity.ListUsersRequest`): The request for
+            the first page; ``page_size`` applies to every page.
+        prefetch (int): The most pages to request in the background while
+            earlier ones are copied; 0 requests each page in turn.
+        retry (google.api_core.retry.Retry): Designation of what errors, if any,
+            should be retried.
+        timeout (float): The timeout for each page.
+        metadata (Sequence[Tuple[str, str]]): Strings which should be
+            sent along with each request as metadata.
+
+    Returns:
+        int: The number of users written.
+    """
+    columns = export_users(
+        client,
+        request,
+        prefetch=prefetch,
+        retry=retry,
+        timeout=timeout,
+        metadata=metadata,
+    )
+    names = columns.name
+    columns = columns.take(sorted(range(len(names)), key=names.__getitem__))
+    columns.save(path)
+    return len(columns)
+
+
+class UserDirectory(object):
+    """Users looked up by name in a file written by :func:`write_directory`.
+
+    The file is mapped into memory read only, so every process with the
+    same file open shares one copy of it in the page cache, and opening
+    it reads only what lookups touch. The rows are sorted by name, so the
+    name column is itself the index: a lookup bisects its offsets,
+    comparing UTF-8 bytes in place, and decodes the one user found.
+
+    When the file is replaced, :meth:`reload` maps the new one. With
+    ``reload_interval``, lookups check for a new file themselves, at most
+    that often. Lookups already running finish on the old file, which is
+    unmapped once nothing uses it.
+
+    Example::
+
+        # In the process which refreshes the users:
+        write_directory(client, '/var/cache/users.npz')
+
+        # In each worker:
+        directory = UserDirectory('/var/cache/users.npz', reload_interval=60)
+        user = directory.get('users/1')
+
+    Args:
+        path (str): The file.
+        reload_interval (float): The least seconds between checks for a
+            new file during lookups; by default, only :meth:`reload`
+            checks.
+        clock (Callable[[], float]): The time source, in seconds.
+    """
+    def __init__(self,
+            path: str,
+            *,
+            reload_interval: float = None,
+            clock: Callable[[], float] = time.monotonic):
+        self._path = path
+        self._reload_interval = reload_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._columns = None  # type: Optional[UserColumns]
+        self._stat = None  # type: Optional[Tuple[int, int, int, int]]
+        self._checked = clock()
+        self.reload()
+
+    def reload(self) -> bool:
+        """Map the file again, if it was replaced since it was mapped.
+
+        Returns:
+            bool: Whether a new file was mapped.
+        """
+        with self._lock:
+            self._checked = self._clock()
+            stat = os.stat(self._path)
+            key = (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+            if key == self._stat:
+                return False
+            # The old mapping is not closed: lookups may still be reading
+            # it. It is unmapped once the last of them drops it.
+            self._columns = UserColumns.load(self._path, mmap_mode=True)
+            self._stat = key
+            return True
+
+    def _current(self):
+        if (self._reload_interval is not None
+                and self._clock() - self._checked >= self._reload_interval):
+            self.reload()
+        return self._columns
+
+    @staticmethod
+    def _find(columns, name):
+        key = name.encode('utf-8')
+        data, offsets = columns.name.data, columns.name.offsets
+        low, high = 0, len(offsets) - 1
+        while low < high:
+            middle = (low + high) // 2
+            if data[offsets[middle]:offsets[middle + 1]].tobytes() < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(offsets) - 1 and (
+                data[offsets[low]:offsets[low + 1]].tobytes() == key):
+            return low
+        return None
+
+    def get(self, name: str) -> Optional[identity.User]:
+        """Return a user, or None if the directory has none by that name."""
+        columns = self._current()
+        row = self._find(columns, name)
+        return None if row is None else columns.user(row)
+
+    def __contains__(self, name: str) -> bool:
+        return self._find(self._current(), name) is not None
+
+    def names(self) -> Iterator[str]:
+        """Iterate over the names of the users, in order."""
+        return iter(self._current().name)
+
+    def __iter__(self) -> Iterator[identity.User]:
+        """Iterate over the users, in name order."""
+        return iter(self._current())
+
+    def __len__(self) -> int:
+        return len(self._current())
+
+    @property
+    def nbytes(self) -> int:
+        """The bytes of the users mapped."""
+        return self._current().nbytes
+
+
+__all__ = (
+    'UserDirectory',
+    'write_directory',
+)
@@ -0,0 +1,378 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import array
+import ast
+import contextlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import zipfile
+from typing import Any, Dict, Iterable, Iterator, Sequence, Tuple, Union
+
+from google.api_core import gapic_v1                   # type: ignore
+from google.api_core import retry as retries           # type: ignore
+
+from google.protobuf import timestamp_pb2 as timestamp  # type: ignore
+from google.showcase_v1beta1.types import identity
+
+from ._scan import NO_TIME
+from ._scan import nanos
+from ._scan import scan_pages
+from .client import IdentityClient
+
+
+_NPY_MAGIC = b'\x93NUMPY\x01\x00'
+_ZIP_LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+_NATIVE = '<' if sys.byteorder == 'little' else '>'
+
+
+class StringColumn(object):
+    """A column of strings, stored as UTF-8 bytes and their end offsets.
+
+    String ``i`` is ``data[offsets[i]:offsets[i + 1]]``, decoded on
+    access, so a column costs a few bytes per row over the text itself.
+
+    Args:
+        data (Optional[Union[bytearray, memoryview]]): The concatenated
+            UTF-8 strings.
+        offsets (Optional[Union[array.array, memoryview]]): The offset of
+            each string and the end of the last one, as 64-bit integers;
+            it starts with 0.
+    """
+    def __init__(self,
+            data: Union[bytearray, memoryview] = None,
+            offsets: Union[array.array, memoryview] = None):
+        self.data = bytearray() if data is None else data  # type: Union[bytearray, memoryview]
+        self.offsets = (
+            array.array('q', [0]) if offsets is None else offsets
+        )  # type: Union[array.array, memoryview]
+
+    def append(self, value: str) -> None:
+        data, offsets = self.data, self.offsets
+        if not isinstance(data, bytearray) or not isinstance(offsets, array.array):
+            raise TypeError('A memory-mapped column cannot be changed.')
+        data += value.encode('utf-8')
+        offsets.append(len(data))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('StringColumn index out of range')
+        return bytes(self.data[self.offsets[index]:self.offsets[index + 1]]).decode('utf-8')
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(len(self)):
+            yield self[index]
+
+    @property
+    def nbytes(self) -> int:
+        """The bytes held by the column."""
+        return len(self.data) + len(self.offsets) * self.offsets.itemsize
+
+
+class UserColumns(object):
+    """Users held column by column, rather than as one message per user.
+
+    The ``name``, ``display_name`` and ``email`` columns are
+    :class:`StringColumn` instances. The ``create_time`` and
+    ``update_time`` columns hold nanoseconds since the epoch, or
+    :data:`NO_TIME` where the timestamp is not set.
+
+    Columns are saved as an NPZ file, which ``numpy.load`` reads as well.
+    Each string column is stored as ``<column>.data`` (``uint8``) and
+    ``<column>.offsets`` (``int64``) arrays. An uncompressed file can be
+    loaded memory-mapped, without NumPy, so processes loading the same
+    file share one copy of it.
+    """
+    STRING_COLUMNS = ('name', 'display_name', 'email')
+    TIME_COLUMNS = ('create_time', 'update_time')
+
+    def __init__(self) -> None:
+        self.name = StringColumn()
+        self.display_name = StringColumn()
+        self.email = StringColumn()
+        self.create_time = array.array('q')  # type: Union[array.array, memoryview]
+        self.update_time = array.array('q')  # type: Union[array.array, memoryview]
+        self._mmap = None  # type: Any
+
+    def __len__(self) -> int:
+        return len(self.name)
+
+    def append(self, user: Any) -> None:
+        """Add a user, given as a ``User`` protobuf message."""
+        create_time, update_time = self.create_time, self.update_time
+        if (not isinstance(create_time, array.array)
+                or not isinstance(update_time, array.array)):
+            raise TypeError('Memory-mapped columns cannot be changed.')
+        self.name.append(user.name)
+        self.display_name.append(user.display_name)
+        self.email.append(user.email)
+        create_time.append(nanos(user, 'create_time'))
+        update_time.append(nanos(user, 'update_time'))
+
+    def extend(self, users: Iterable[Any]) -> None:
+        """Add users, given as ``User`` protobuf messages."""
+        for user in users:
+            self.append(user)
+
+    def take(self, rows: Iterable[int]) -> 'UserColumns':
+        """Return new columns holding the given rows, in that order."""
+        taken = type(self)()
+        rows = list(rows)
+        for column in self.STRING_COLUMNS:
+            strings, copy = getattr(self, column), getattr(taken, column)
+            data, offsets = strings.data, strings.offsets
+            for row in rows:
+                copy.data += data[offsets[row]:offsets[row + 1]]
+                copy.offsets.append(len(copy.data))
+        for column in self.TIME_COLUMNS:
+            values = getattr(self, column)
+            setattr(taken, column, array.array('q', (values[row] for row in rows)))
+        return taken
+
+    def user(self, index: int) -> identity.User:
+        """Return the user in row ``index`` as a :class:`~.identity.User`."""
+        user = identity.User(
+            name=self.name[index],
+            display_name=self.display_name[index],
+            email=self.email[index],
+        )
+        for column in self.TIME_COLUMNS:
+            nanos = getattr(self, column)[index]
+            if nanos != NO_TIME:
+                setattr(user, column, timestamp.Timestamp(
+                    seconds=nanos // 10 ** 9, nanos=nanos % 10 ** 9))
+        return user
+
+    def __iter__(self) -> Iterator[identity.User]:
+        for index in range(len(self)):
+            yield self.user(index)
+
+    @property
+    def nbytes(self) -> int:
+        """The bytes held by the columns."""
+        return sum(getattr(self, c).nbytes for c in self.STRING_COLUMNS) + sum(
+            len(getattr(self, c)) * 8 for c in self.TIME_COLUMNS)
+
+    def arrays(self) -> Dict[str, Any]:
+        """Return each stored array by its name in the NPZ file."""
+        arrays = {}
+        for column in self.STRING_COLUMNS:
+            strings = getattr(self, column)
+            arrays[column + '.data'] = ('|u1', strings.data)
+            arrays[column + '.offsets'] = (_NATIVE + 'i8', strings.offsets)
+        for column in self.TIME_COLUMNS:
+            arrays[column] = (_NATIVE + 'i8', getattr(self, column))
+        return {
+            name: (descr, memoryview(values).cast('B'))
+            for name, (descr, values) in arrays.items()
+        }
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """Return the stored arrays as NumPy arrays, without copying.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        import numpy  # type: ignore
+
+        return {
+            name: numpy.frombuffer(values, dtype=descr)
+            for name, (descr, values) in self.arrays().items()
+        }
+
+    def save(self, path: str, *, compress: bool = False) -> None:
+        """Write the columns to an NPZ file.
+
+        The file is written beside ``path`` and moved into place, so
+        readers never see it half written.
+
+        Args:
+            path (str): The file to write.
+            compress (bool): Whether to deflate the arrays. A compressed
+                file is smaller but cannot be loaded memory-mapped.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.npz.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+                with zipfile.ZipFile(fh, 'w', compression=compression, allowZip64=True) as npz:
+                    for name, (descr, values) in self.arrays().items():
+                        with npz.open(name + '.npy', 'w', force_zip64=True) as member:
+                            member.write(_npy_header(descr, len(values) // _itemsize(descr)))
+                            member.write(values)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str, *, mmap_mode: bool = False) -> 'UserColumns':
+        """Read columns written by :meth:`save`.
+
+        Args:
+            path (str): The file to read.
+            mmap_mode (bool): Whether to map the file into memory, read
+                only, instead of reading it. The file must be uncompressed,
+                and in the byte order of this machine.
+
+        Returns:
+            ~.UserColumns: The columns.
+        """
+        columns = cls()
+        with open(path, 'rb') as fh, zipfile.ZipFile(fh) as npz:
+            if mmap_mode:
+                columns._mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            arrays = {}
+            for info in npz.infolist():
+                name = info.filename[:-len('.npy')]
+                if mmap_mode:
+                    arrays[name] = _mapped_array(columns._mmap, fh, info)
+                else:
+                    arrays[name] = _read_array(npz.read(info))
+
+        for column in cls.STRING_COLUMNS:
+            setattr(columns, column, StringColumn(
+                arrays[column + '.data'], arrays[column + '.offsets']))
+        for column in cls.TIME_COLUMNS:
+            setattr(columns, column, arrays[column])
+        return columns
+
+    def close(self) -> None:
+        """Unmap the file of columns loaded with ``mmap_mode``.
+
+        The columns must not be used afterwards.
+        """
+        if self._mmap is not None:
+            for column in self.STRING_COLUMNS:
+                strings = getattr(self, column)
+                strings.data.release()
+                strings.offsets.release()
+            for column in self.TIME_COLUMNS:
+                getattr(self, column).release()
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> 'UserColumns':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def _itemsize(descr):
+    return int(descr[2:])
+
+
+def _npy_header(descr, count):
+    header = repr({
+        'descr': descr, 'fortran_order': False, 'shape': (count,),
+    }).encode('latin1')
+    # Pad so that the data starts on a 64-byte boundary of the member.
+    padding = -(len(_NPY_MAGIC) + 2 + len(header) + 1) % 64
+    header += b' ' * padding + b'\n'
+    return _NPY_MAGIC + struct.pack('<H', len(header)) + header
+
+
+def _parse_npy(buffer):
+    if bytes(buffer[:len(_NPY_MAGIC)]) != _NPY_MAGIC:
+        raise ValueError('Not an NPY version 1.0 array.')
+    start = len(_NPY_MAGIC) + 2
+    (length,) = struct.unpack('<H', bytes(buffer[len(_NPY_MAGIC):start]))
+    header = ast.literal_eval(bytes(buffer[start:start + length]).decode('latin1'))
+    return header['descr'], header['shape'][0], start + length
+
+
+def _typecode(descr):
+    return 'B' if descr == '|u1' else 'q'
+
+
+def _read_array(buffer):
+    descr, count, offset = _parse_npy(buffer)
+    values = array.array(_typecode(descr))
+    values.frombytes(buffer[offset:offset + count * _itemsize(descr)])
+    if descr[0] not in ('|', _NATIVE):
+        values.byteswap()
+    return bytearray(values) if descr == '|u1' else values
+
+
+def _mapped_array(mapped, fh, info):
+    if info.compress_type != zipfile.ZIP_STORED:
+        raise ValueError('Compressed columns cannot be memory-mapped.')
+    fh.seek(info.header_offset)
+    fields = _ZIP_LOCAL_HEADER.unpack(fh.read(_ZIP_LOCAL_HEADER.size))
+    start = info.header_offset + _ZIP_LOCAL_HEADER.size + fields[-2] + fields[-1]
+    member = memoryview(mapped)[start:start + info.file_size]
+    descr, count, offset = _parse_npy(member)
+    if descr[0] not in ('|', _NATIVE):
+        raise ValueError('Columns in a foreign byte order cannot be memory-mapped.')
+    return member[offset:offset + count * _itemsize(descr)].cast(_typecode(descr))
+
+
+def export_users(
+        client: IdentityClient,
+        request: identity.ListUsersRequest = None,
+        *,
+        prefetch: int = 1,
+        retry: retries.Retry = gapic_v1.method.DEFAULT,
+        timeout: float = gapic_v1.method.DEFAULT,
+        metadata: Sequence[Tuple[str, str]] = (),
+        ) -> UserColumns:
+    """Scan ``list_users`` into :class:`UserColumns`.
+
+    Pages are read as raw protobuf messages through ``client.raw``, and
+    each is copied into the columns and dropped, so no
+    :class:`~.identity.User` is created and memory grows by the columns
+    alone.
+
+    Args:
+        client (~.IdentityClient): The client to list users with.
+        request (:class:`~.identity.ListUsersRequest`): The request for
+            the first page; ``page_size`` applies to every page.
+        prefetch (int): The most pages to request in the background while
+            earlier ones are copied; 0 requests each page in turn.
+        retry (google.api_core.retry.Retry): Designation of what errors, if any,
+            should be retried.
+        timeout (float): The timeout for each page.
+        metadata (Sequence[Tuple[str, str]]): Strings which should be
+            sent along with each request as metadata.
+
+    Returns:
+        ~.UserColumns: The users.
+    """
+    columns = UserColumns()
+    pages = scan_pages(client, request, prefetch, retry, timeout, metadata)
+    with contextlib.closing(pages):
+        for page in pages:
+            columns.extend(page.users)
+    return columns
+
+
+__all__ = (
+    'NO_TIME',
+    'StringColumn',
+    'UserColumns',
+    'export_users',
+)
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import bisect
+import threading
+from typing import Any, Dict, Iterable, List, Set, Tuple, Union
+
+
+class UserIndex(object):
+    """Indexes of users by email and by display name.
+
+    Emails are looked up in a hash index, and display names by prefix in
+    a sorted one; both ignore case. The indexes hold only the names of the
+    users, so they cost little beside the users themselves, wherever those
+    are held. Keep them current with :meth:`update` and :meth:`remove`, or
+    let a :class:`~.UserSnapshot` do so.
+
+    It is safe to share between threads.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        # The keys each user is indexed under, by name.
+        self._keys = {}  # type: Dict[str, Tuple[str, str]]
+        # A name, or the set of names sharing an email.
+        self._by_email = {}  # type: Dict[str, Union[str, Set[str]]]
+        # Display name keys, sorted, and the name at each position; users
+        # with the same display name are sorted by name.
+        self._display_names = []  # type: List[str]
+        self._display_name_users = []  # type: List[str]
+
+    def update(self, user: Any) -> None:
+        """Index a user, or re-index it if it changed.
+
+        Args:
+            user (Union[~.identity.User, ~.identity.User.pb()]): The user.
+        """
+        self.update_many((user,))
+
+    def update_many(self, users: Iterable[Any]) -> None:
+        """Index many users, or re-index those which changed.
+
+        This is much faster than :meth:`update` for each user when many are
+        new, e.g. when the index is first filled.
+
+        Args:
+            users (Iterable[Union[~.identity.User, ~.identity.User.pb()]]):
+                The users; of several with the same name, the last wins.
+        """
+        latest = {user.name: user for user in users}
+        with self._lock:
+            display_names = []  # type: List[Tuple[str, str]]
+            for name, user in latest.items():
+                keys = (user.email.casefold(), user.display_name.casefold())
+                old = self._keys.get(name)
+                if old == keys:
+                    continue
+                if old is not None:
+                    self._unindex(name, old)
+                self._keys[name] = keys
+                email, display_name = keys
+                if email:
+                    held = self._by_email.get(email)
+                    if held is None:
+                        self._by_email[email] = name
+                    elif isinstance(held, str):
+                        self._by_email[email] = {held, name}
+                    else:
+                        held.add(name)
+                if display_name:
+                    display_names.append((display_name, name))
+
+            # Insert a few names in place; merge many by sorting once.
+            if len(display_names) * 8 < len(self._display_names):
+                for display_name, name in display_names:
+                    i = bisect.bisect_left(self._display_names, display_name)
+                    while (i < len(self._display_names)
+                            and self._display_names[i] == display_name
+                            and self._display_name_users[i] < name):
+                        i += 1
+                    self._display_names.insert(i, display_name)
+                    self._display_name_users.insert(i, name)
+            elif display_names:
+                display_names.extend(
+                    zip(self._display_names, self._display_name_users))
+                display_names.sort()
+                self._display_names = [pair[0] for pair in display_names]
+                self._display_name_users = [pair[1] for pair in display_names]
+
+    def remove(self, name: str) -> None:
+        """Drop a user from the indexes, if it is there."""
+        with self._lock:
+            keys = self._keys.pop(name, None)
+            if keys is not None:
+                self._unindex(name, keys)
+
+    def _unindex(self, name, keys):
+        # Each key is dropped only if the user is indexed under it.
+        email, display_name = keys
+        held = self._by_email.get(email)
+        if held == name:
+            del self._by_email[email]
+        elif isinstance(held, set):
+            held.discard(name)
+            if len(held) == 1:
+                self._by_email[email] = held.pop()
+        if display_name:
+            i = bisect.bisect_left(self._display_names, display_name)
+            while (i < len(self._display_names)
+                    and self._display_names[i] == display_name):
+                if self._display_name_users[i] == name:
+                    del self._display_names[i]
+                    del self._display_name_users[i]
+                    break
+                i += 1
+
+    def clear(self) -> None:
+        """Drop every user."""
+        with self._lock:
+            self._keys.clear()
+            self._by_email.clear()
+            del self._display_names[:]
+            del self._display_name_users[:]
+
+    def find_by_email(self, email: str) -> List[str]:
+        """Return the names of the users with an email, ignoring case."""
+        with self._lock:
+            held = self._by_email.get(email.casefold())
+            if held is None:
+                return []
+            if isinstance(held, str):
+                return [held]
+            return sorted(held)
+
+    def find_by_display_name(self, prefix: str, limit: int = None) -> List[str]:
+        """Return the names of the users whose display name starts with a
+        prefix, ignoring case, in display name order, then name order.
+
+        Args:
+            prefix (str): The start of the display names.
+            limit (int): The most names to return; by default, all.
+        """
+        prefix = prefix.casefold()
+        names = []  # type: List[str]
+        with self._lock:
+            i = bisect.bisect_left(self._display_names, prefix)
+            while (i < len(self._display_names)
+                    and self._display_names[i].startswith(prefix)
+                    and (limit is None or len(names) < limit)):
+                names.append(self._display_name_users[i])
+                i += 1
+        return names
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return name in self._keys
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._keys)
+
+
+__all__ = (
+    'UserIndex',
+)
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from typing import TYPE_CHECKING, Any, Sequence, Tuple
+
+from google.api_core import gapic_v1                   # type: ignore
+from google.api_core import retry as retries           # type: ignore
+
+from google.protobuf import empty_pb2 as empty  # type: ignore
+from google.showcase_v1beta1.services import _raw
+from google.showcase_v1beta1.types import identity
+
+if TYPE_CHECKING:
+    from .client import IdentityClient
+
+
+class RawIdentityClient(_raw.RawMethods):
+    """The methods of an :class:`~.IdentityClient` on raw protobuf messages.
+
+    Requests are ``*_pb2`` messages, such as ``identity.User.pb()``
+    instances, or their serialized bytes; responses are ``*_pb2``
+    messages. Nothing is marshalled through proto-plus, which makes this
+    the cheaper choice for small messages sent at a high rate.
+    :meth:`list_users` returns single pages rather than a pager.
+
+    The raw client shares the channel of the client's transport, and its
+    default retries and timeouts. It supports the synchronous gRPC
+    transports. As with the client, :meth:`get_user` sends the user's
+    name in the ``x-goog-request-params`` routing header, unless the
+    request is given as bytes; the other methods send no routing header.
+
+    Example::
+
+        GetUserRequestPb = identity.GetUserRequest.pb()
+        user = client.raw.get_user(GetUserRequestPb(name='users/1'))
+
+    Args:
+        client (~.IdentityClient): The client whose transport to use.
+        decode (bool): Whether to parse responses; if False, responses are
+            the serialized bytes.
+    """
+    _METHODS = {
+        'create_user': (
+            '/google.showcase.v1beta1.Identity/CreateUser', 'unary_unary',
+            identity.User.pb()),
+        'get_user': (
+            '/google.showcase.v1beta1.Identity/GetUser', 'unary_unary',
+            identity.User.pb()),
+        'update_user': (
+            '/google.showcase.v1beta1.Identity/UpdateUser', 'unary_unary',
+            identity.User.pb()),
+        'delete_user': (
+            '/google.showcase.v1beta1.Identity/DeleteUser', 'unary_unary',
+            empty.Empty),
+        'list_users': (
+            '/google.showcase.v1beta1.Identity/ListUsers', 'unary_unary',
+            identity.ListUsersResponse.pb()),
+    }
+
+    def __init__(self, client: 'IdentityClient', *, decode: bool = True):
+        super().__init__(client._transport, decode=decode)
+
+    def create_user(self,
+            request: _raw.RawMessage,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> Any:
+        r"""Call the create user method with a raw ``CreateUserRequest``.
+
+        Returns:
+            The created ``User`` message.
+        """
+        return self.rpc('create_user')(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+    def get_user(self,
+            request: _raw.RawMessage,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> Any:
+        r"""Call the get user method with a raw ``GetUserRequest``.
+
+        Returns:
+            The ``User`` message.
+        """
+        # Certain fields should be provided within the metadata header;
+        # add these here, unless the request is already serialized.
+        if not isinstance(request, bytes):
+            metadata = tuple(metadata) + (
+                gapic_v1.routing_header.to_grpc_metadata((
+                    ('name', request.name),
+                )),
+            )
+
+        return self.rpc('get_user')(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+    def update_user(self,
+            request: _raw.RawMessage,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> Any:
+        r"""Call the update user method with a raw ``UpdateUserRequest``.
+
+        Returns:
+            The updated ``User`` message.
+        """
+        return self.rpc('update_user')(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+    def delete_user(self,
+            request: _raw.RawMessage,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> Any:
+        r"""Call the delete user method with a raw ``DeleteUserRequest``.
+
+        Returns:
+            The ``google.protobuf.Empty`` message.
+        """
+        return self.rpc('delete_user')(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+    def list_users(self,
+            request: _raw.RawMessage,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> Any:
+        r"""Call the list users method with a raw ``ListUsersRequest``.
+
+        Returns:
+            One ``ListUsersResponse`` page; follow its
+            ``next_page_token`` for the rest.
+        """
+        return self.rpc('list_users')(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+
+__all__ = (
+    'RawIdentityClient',
+)
@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import collections
+import contextlib
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from google.api_core import gapic_v1                   # type: ignore
+from google.api_core import retry as retries           # type: ignore
+
+from google.showcase_v1beta1.types import identity
+
+from ._scan import NO_TIME
+from ._scan import nanos
+from ._scan import scan_pages
+from .client import IdentityClient
+from .index import UserIndex
+
+
+SnapshotDiff = collections.namedtuple(
+    'SnapshotDiff', ('added', 'changed', 'removed'))
+SnapshotDiff.__doc__ = """The users a :meth:`UserSnapshot.refresh` found changed.
+
+Attributes:
+    added (List[str]): The names of the users which are new.
+    changed (List[str]): The names of the users whose content changed.
+    removed (List[str]): The names of the users which are gone.
+"""
+
+
+class UserSnapshot(object):
+    """A local copy of every user, kept current by rescans.
+
+    Each :meth:`refresh` scans ``list_users`` and compares each user with
+    the copy held. A user whose ``update_time`` is set and unchanged is
+    kept as it is, without further work; otherwise its serialized content
+    is compared. Only users which are new or changed are copied, and the
+    refresh reports which users were added, changed or removed.
+
+    Users are held serialized, so the snapshot costs about the size of
+    the users on the wire, and each read decodes its own copy. Reads are
+    served locally, may run during a refresh, and see the users as of the
+    latest refresh to complete; a refresh which fails leaves the snapshot
+    as it was.
+
+    With ``index``, the snapshot also keeps a :class:`~.UserIndex` of its
+    users, to find them by email or display name prefix. Lookups during a
+    refresh may see the index updated before the users.
+
+    Example::
+
+        snapshot = UserSnapshot(client)
+        snapshot.refresh()
+        user = snapshot.get('users/1')
+
+    Args:
+        client (~.IdentityClient): The client to scan users with.
+        request (:class:`~.identity.ListUsersRequest`): The request for
+            the first page of each scan; ``page_size`` applies to every
+            page.
+        prefetch (int): The most pages to request in the background while
+            earlier ones are compared; 0 requests each page in turn.
+        retry (google.api_core.retry.Retry): Designation of what errors, if any,
+            should be retried, for each page.
+        timeout (float): The timeout for each page.
+        metadata (Sequence[Tuple[str, str]]): Strings which should be
+            sent along with each request as metadata.
+        index (bool): Whether to index the users by email and display
+            name.
+    """
+    def __init__(self,
+            client: IdentityClient,
+            request: identity.ListUsersRequest = None,
+            *,
+            prefetch: int = 1,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            index: bool = False):
+        self._client = client
+        self._request = request
+        self._prefetch = prefetch
+        self._retry = retry
+        self._timeout = timeout
+        self._metadata = metadata
+        # The update time, in nanoseconds, and the serialized user, by
+        # name. A refresh replaces the whole dict, and never changes one
+        # once published, so reads need no lock.
+        self._users = {}  # type: Dict[str, Tuple[int, bytes]]
+        self._refresh_lock = threading.Lock()
+        self._refreshes = 0
+        self._index = UserIndex() if index else None
+
+    def refresh(self) -> SnapshotDiff:
+        """Scan the users, and bring the snapshot up to date.
+
+        Refreshes run one at a time.
+
+        Returns:
+            ~.SnapshotDiff: The users added, changed and removed since the
+                last refresh; on the first one, every user is added.
+        """
+        with self._refresh_lock:
+            held = self._users
+            users = {}  # type: Dict[str, Tuple[int, bytes]]
+            # The new and changed users, to index. A scan may return a
+            # user twice, e.g. when the pages shift under it; the last copy
+            # wins.
+            updated = {}  # type: Dict[str, Any]
+            pages = scan_pages(
+                self._client,
+                self._request,
+                self._prefetch,
+                self._retry,
+                self._timeout,
+                self._metadata,
+            )
+            with contextlib.closing(pages):
+                for page in pages:
+                    for user in page.users:
+                        name = user.name
+                        old = held.get(name)
+                        update_time = nanos(user, 'update_time')
+                        if (old is not None and update_time != NO_TIME
+                                and old[0] == update_time):
+                            users[name] = old
+                            updated.pop(name, None)
+                            continue
+                        data = user.SerializeToString(deterministic=True)
+                        if old is None or old[1] != data:
+                            updated[name] = user
+                        else:
+                            data = old[1]
+                            updated.pop(name, None)
+                        users[name] = (update_time, data)
+
+            added = [name for name in updated if name not in held]
+            changed = [name for name in updated if name in held]
+            removed = [name for name in held if name not in users]
+            if self._index is not None:
+                self._index.update_many(updated.values())
+                for name in removed:
+                    self._index.remove(name)
+            self._users = users
+            self._refreshes += 1
+        return SnapshotDiff(added=added, changed=changed, removed=removed)
+
+    @property
+    def refreshes(self) -> int:
+        """The number of refreshes completed."""
+        return self._refreshes
+
+    @property
+    def index(self) -> Optional[UserIndex]:
+        """The index of the users, or None if not enabled."""
+        return self._index
+
+    def find_by_email(self, email: str) -> List[identity.User]:
+        """Return copies of the users with an email, ignoring case."""
+        return self._lookup(self._require_index().find_by_email(email))
+
+    def find_by_display_name(self,
+            prefix: str,
+            limit: int = None) -> List[identity.User]:
+        """Return copies of the users whose display name starts with a
+        prefix, ignoring case, in display name order.
+
+        Args:
+            prefix (str): The start of the display names.
+            limit (int): The most users to return; by default, all.
+        """
+        return self._lookup(
+            self._require_index().find_by_display_name(prefix, limit))
+
+    def _require_index(self):
+        if self._index is None:
+            raise ValueError('The snapshot was created without an index.')
+        return self._index
+
+    def _lookup(self, names):
+        users = (self.get(name) for name in names)
+        return [user for user in users if user is not None]
+
+    def get(self, name: str) -> Optional[identity.User]:
+        """Return a copy of a user, or None if the snapshot has none."""
+        entry = self._users.get(name)
+        if entry is None:
+            return None
+        return identity.User.deserialize(entry[1])
+
+    def names(self) -> Iterator[str]:
+        """Iterate over the names of the users."""
+        return iter(self._users)
+
+    def __iter__(self) -> Iterator[identity.User]:
+        """Iterate over copies of the users."""
+        for _, data in self._users.values():
+            yield identity.User.deserialize(data)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._users
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+
+__all__ = (
+    'SnapshotDiff',
+    'UserSnapshot',
+)
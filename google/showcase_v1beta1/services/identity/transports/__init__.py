@@ -16,18 +16,38 @@
 #
 
 from collections import OrderedDict
+import sys
+import typing
 from typing import Dict, Type
 
 from .base import IdentityTransport
 from .grpc import IdentityGrpcTransport
+from .grpc_multichannel import IdentityGrpcMultiChannelTransport
 
+if typing.TYPE_CHECKING or sys.version_info < (3, 7):
+    from .grpc_asyncio import IdentityGrpcAsyncIOTransport
+else:
+    # The asyncio transport is resolved on first access (PEP 562), so that
+    # the synchronous clients do not load it.
+    def __getattr__(name):
+        if name != 'IdentityGrpcAsyncIOTransport':
+            raise AttributeError('module {!r} has no attribute {!r}'.format(
+                __name__, name))
+        from .grpc_asyncio import IdentityGrpcAsyncIOTransport
+        globals()[name] = IdentityGrpcAsyncIOTransport
+        return IdentityGrpcAsyncIOTransport
 
-# Compile a registry of transports.
+
+# Compile a registry of the synchronous transports; the asyncio transport
+# is registered with the async client.
 _transport_registry = OrderedDict()  # type: Dict[str, Type[IdentityTransport]]
 _transport_registry['grpc'] = IdentityGrpcTransport
+_transport_registry['grpc_multichannel'] = IdentityGrpcMultiChannelTransport
 
 
 __all__ = (
     'IdentityTransport',
     'IdentityGrpcTransport',
+    'IdentityGrpcMultiChannelTransport',
+    'IdentityGrpcAsyncIOTransport',
 )
@@ -16,13 +16,23 @@
 #
 
 import abc
+import functools
 import typing
 
 from google import auth
+from google.api_core import gapic_v1       # type: ignore
 from google.auth import credentials  # type: ignore
 
 from google.protobuf import empty_pb2 as empty  # type: ignore
 from google.showcase_v1beta1.types import identity
+from google.showcase_v1beta1 import gapic_version as package_version
+from google.showcase_v1beta1.services._method import LazyWrappedMethods
+from google.showcase_v1beta1.services._method import WrappedMethod
+
+
+DEFAULT_CLIENT_INFO = gapic_v1.client_info.ClientInfo(
+    gapic_version=package_version.__version__,
+)
 
 
 class IdentityTransport(metaclass=abc.ABCMeta):
@@ -31,6 +41,17 @@ class IdentityTransport(metaclass=abc.ABCMeta):
     AUTH_SCOPES = (
     )
 
+    # The retry and timeout applied to each method when the caller does not
+    # provide one. ``None`` disables the behavior. Individual entries may be
+    # overridden with the ``method_configs`` transport argument.
+    DEFAULT_METHOD_CONFIGS = {
+        'create_user': {'retry': None, 'timeout': None},
+        'get_user': {'retry': None, 'timeout': None},
+        'update_user': {'retry': None, 'timeout': None},
+        'delete_user': {'retry': None, 'timeout': None},
+        'list_users': {'retry': None, 'timeout': None},
+    }  # type: typing.Dict[str, typing.Dict[str, typing.Any]]
+
     def __init__(
             self, *,
             host: str = 'localhost:7469',
@@ -59,34 +80,100 @@ class IdentityTransport(metaclass=abc.ABCMeta):
         # Save the credentials.
         self._credentials = credentials
 
+    def _prep_wrapped_messages(self,
+            client_info: gapic_v1.client_info.ClientInfo,
+            method_configs: typing.Dict[str, typing.Dict[str, typing.Any]] = None,
+            wrapper: typing.Type[WrappedMethod] = WrappedMethod,
+            ) -> None:
+        """Precompute the wrapped methods.
+
+        Args:
+            client_info (google.api_core.gapic_v1.client_info.ClientInfo):
+                The client info used to build the user-agent metadata.
+            method_configs (Optional[Dict[str, Dict[str, Any]]]): Per-method
+                overrides of :attr:`DEFAULT_METHOD_CONFIGS`, keyed by method
+                name, each holding optional ``retry`` and ``timeout`` entries.
+            wrapper (Type[WrappedMethod]): The class wrapping each method;
+                asyncio transports use ``AsyncWrappedMethod``.
+        """
+        method_configs = method_configs or {}
+        unknown = set(method_configs) - set(self.DEFAULT_METHOD_CONFIGS)
+        if unknown:
+            raise ValueError('Unknown methods in method_configs: {}'.format(
+                ', '.join(sorted(unknown))))
+
+        self._prepared_methods = {}  # type: typing.Dict[str, WrappedMethod]
+        for name in self.DEFAULT_METHOD_CONFIGS:
+            self._prepared_methods[name] = self._wrap_method(
+                name, client_info, method_configs, wrapper)
+
+    def _wrap_method(self,
+            name: str,
+            client_info: gapic_v1.client_info.ClientInfo,
+            method_configs: typing.Dict[str, typing.Dict[str, typing.Any]] = None,
+            wrapper: typing.Type[WrappedMethod] = WrappedMethod,
+            ) -> WrappedMethod:
+        config = dict(
+            self.DEFAULT_METHOD_CONFIGS[name],
+            **(method_configs or {}).get(name, {}))
+        return wrapper(
+            getattr(self, name),
+            default_retry=config['retry'],
+            default_timeout=config['timeout'],
+            client_info=client_info,
+        )
+
+    @property
+    def _wrapped_methods(self) -> typing.Dict[str, WrappedMethod]:
+        """The wrapped methods, by name.
+
+        Transports which do not call :meth:`_prep_wrapped_messages`, such
+        as user subclasses of this class, have each method wrapped with
+        the default configuration when it is first used.
+        """
+        try:
+            return self._prepared_methods
+        except AttributeError:
+            self._prepared_methods = LazyWrappedMethods(functools.partial(
+                self._wrap_method, client_info=DEFAULT_CLIENT_INFO))
+            return self._prepared_methods
+
+    def close(self) -> typing.Union[None, typing.Awaitable[None]]:
+        """Release the resources held by this transport.
+
+        Asyncio transports return an awaitable. By default, there is
+        nothing to release.
+        """
+        return None
+
     @property
     def create_user(self) -> typing.Callable[
             [identity.CreateUserRequest],
-            identity.User]:
+            typing.Union[identity.User, typing.Awaitable[identity.User]]]:
         raise NotImplementedError
 
     @property
     def get_user(self) -> typing.Callable[
             [identity.GetUserRequest],
-            identity.User]:
+            typing.Union[identity.User, typing.Awaitable[identity.User]]]:
         raise NotImplementedError
 
     @property
     def update_user(self) -> typing.Callable[
             [identity.UpdateUserRequest],
-            identity.User]:
+            typing.Union[identity.User, typing.Awaitable[identity.User]]]:
         raise NotImplementedError
 
     @property
     def delete_user(self) -> typing.Callable[
             [identity.DeleteUserRequest],
-            empty.Empty]:
+            typing.Union[empty.Empty, typing.Awaitable[empty.Empty]]]:
         raise NotImplementedError
 
     @property
     def list_users(self) -> typing.Callable[
             [identity.ListUsersRequest],
-            identity.ListUsersResponse]:
+            typing.Union[identity.ListUsersResponse, typing.Awaitable[identity.ListUsersResponse]]]:
         raise NotImplementedError
 
 
@@ -47,3 +47,15 @@ def mypy(session):
         'mypy',
         'google',
     )
+
+
+@nox.session(python='3.7')
+def benchmark(session):
+    """Run the cold-start benchmarks and write the results as JSON."""
+    session.install('-e', '.')
+    session.run(
+        'python',
+        os.path.join('benchmarks', 'cold_start.py'),
+        '--output', 'cold_start.json',
+        *session.posargs
+    )
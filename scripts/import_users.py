@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import argparse
+import sys
+import time
+
+from google.api_core import client_options
+from google.auth import credentials
+from google.showcase_v1beta1.services.identity import IdentityClient
+from google.showcase_v1beta1.services.identity import bulk
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="""Create showcase users from an NDJSON or CSV file.
+
+The outcome of each record is appended to the results file. Running the
+import again with the same results file skips the records already created
+and retries the rest.
+""")
+    parser.add_argument(
+        'path',
+        help='the file of user records, one JSON object per line or CSV rows',
+    )
+    parser.add_argument(
+        '-r',
+        '--results',
+        required=True,
+        help='the results file to append to, and to resume from',
+    )
+    parser.add_argument(
+        '--format',
+        choices=bulk.FORMATS,
+        help='the format of the records; by default, inferred from the extension',
+    )
+    parser.add_argument(
+        '--max-in-flight',
+        type=int,
+        default=32,
+        help='the most create calls to have outstanding',
+    )
+    parser.add_argument(
+        '--rate',
+        type=float,
+        help='the most create calls to start per second',
+    )
+    parser.add_argument(
+        '--endpoint',
+        help='the API endpoint to connect to',
+    )
+    parser.add_argument(
+        '--anonymous',
+        action='store_true',
+        help='send no credentials, e.g. to a local server',
+    )
+    args = parser.parse_args()
+
+    client = IdentityClient(
+        credentials=credentials.AnonymousCredentials() if args.anonymous else None,
+        client_options=client_options.ClientOptions(
+            api_endpoint=args.endpoint) if args.endpoint else None,
+    )
+    started = time.monotonic()
+    stats = bulk.import_users(
+        client,
+        args.path,
+        args.results,
+        format=args.format,
+        max_in_flight=args.max_in_flight,
+        rate=args.rate,
+    )
+    elapsed = time.monotonic() - started
+    print(
+        f'created {stats.created}, failed {stats.failed}, skipped {stats.skipped} '
+        f'in {elapsed:.1f}s ({stats.created / max(elapsed, 1e-9):.0f} users/s)',
+        file=sys.stderr,
+    )
+    sys.exit(1 if stats.failed else 0)
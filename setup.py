@@ -15,29 +15,42 @@
 # limitations under the License.
 #
 
+import os
+
 import setuptools  # type: ignore
 
 
+package_root = os.path.abspath(os.path.dirname(__file__))
+
+version = {}  # type: dict
+with open(os.path.join(package_root, 'google/showcase_v1beta1/gapic_version.py')) as fp:
+    exec(fp.read(), version)
+version = version['__version__']
+
 setuptools.setup(
     name='google-showcase',
-    version='0.0.1',
+    version=version,
     packages=setuptools.PEP420PackageFinder.find(),
     namespace_packages=('google',),
     platforms='Posix; MacOS X; Windows',
     include_package_data=True,
     install_requires=(
         'google-auth >= 1.13.1',
-        'google-api-core >= 1.8.0, < 2.0.0dev',
+        'google-api-core >= 1.22.2, < 2.0.0dev',
         'googleapis-common-protos >= 1.5.8',
-        'grpcio >= 1.10.0',
+        'grpcio >= 1.32.0',
         'proto-plus >= 0.4.0',
     ),
+    extras_require={
+        'numpy': ['numpy >= 1.13.0'],
+    },
     python_requires='>=3.6',
     setup_requires=[
         'libcst >= 0.2.5',
     ],
     scripts=[
         'scripts/fixup_keywords.py',
+        'scripts/import_users.py',
     ],
     classifiers=[
         'Development Status :: 3 - Alpha',
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import pytest
+
+from google.showcase_v1beta1.services import _channels
+
+
+@pytest.fixture(autouse=True)
+def clear_ssl_credentials():
+    # Tests mock grpc.ssl_channel_credentials; do not let credentials
+    # cached by one test leak into the next.
+    _channels.SSL_CREDENTIALS.clear()
+    yield
+    _channels.SSL_CREDENTIALS.clear()
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from concurrent import futures
+
+import grpc
+import pytest
+
+from google.api_core import exceptions
+from google.showcase_v1beta1.services import _batching
+
+
+class _Calls(object):
+    """Starts calls as plain futures, completed by the test."""
+    def __init__(self):
+        self.futures = []
+        self.max_outstanding = 0
+
+    def start(self, request):
+        future = futures.Future()
+        self.futures.append((request, future))
+        self.max_outstanding = max(self.max_outstanding, self.outstanding)
+        return future
+
+    @property
+    def outstanding(self):
+        return sum(not f.done() for _, f in self.futures)
+
+
+def _not_found():
+    error = grpc.RpcError()
+    error.code = lambda: grpc.StatusCode.NOT_FOUND
+    error.details = lambda: 'missing'
+    error.trailing_metadata = lambda: None
+    return error
+
+
+def test_run_windowed_ordered():
+    calls = _Calls()
+
+    # Complete each call as soon as it starts, failing request 1.
+    def start(request):
+        future = calls.start(request)
+        if request == 1:
+            future.set_exception(_not_found())
+        else:
+            future.set_result(request * 10)
+        return future
+
+    results = list(_batching.run_windowed(start, range(5), max_in_flight=2))
+    assert [r.index for r in results] == [0, 1, 2, 3, 4]
+    assert [r.response for r in results] == [0, None, 20, 30, 40]
+    assert isinstance(results[1].exception, exceptions.NotFound)
+    with pytest.raises(exceptions.NotFound):
+        results[1].result()
+    assert results[2].result() == 20
+
+
+def test_run_windowed_bounds_in_flight():
+    calls = _Calls()
+    results = _batching.run_windowed(calls.start, range(10), max_in_flight=3)
+
+    # Nothing is sent until the results are consumed.
+    assert not calls.futures
+
+    # Completing out of order: a later call finishing first is held back
+    # until the earlier one completes, and still counts toward the window.
+    import threading
+
+    def complete():
+        while True:
+            pending = [(r, f) for r, f in calls.futures if not f.done()]
+            if not pending and len(calls.futures) == 10:
+                return
+            for request, future in reversed(pending):
+                future.set_result(request)
+
+    thread = threading.Thread(target=complete)
+    thread.start()
+    assert [r.response for r in results] == list(range(10))
+    thread.join()
+    assert calls.max_outstanding <= 3
+
+
+def test_run_windowed_unordered():
+    done_first = futures.Future()
+    done_first.set_result('fast')
+    slow = futures.Future()
+
+    def start(request):
+        if request == 'slow':
+            return slow
+        return done_first
+
+    results = _batching.run_windowed(
+        start, ['slow', 'fast'], max_in_flight=2, ordered=False)
+    first = next(results)
+    assert (first.index, first.response) == (1, 'fast')
+    slow.set_result('slow')
+    second = next(results)
+    assert (second.index, second.response) == (0, 'slow')
+    assert list(results) == []
+
+
+def test_run_windowed_start_error():
+    def start(request):
+        raise ValueError(request)
+
+    results = list(_batching.run_windowed(start, ['a'], max_in_flight=1))
+    assert isinstance(results[0].exception, ValueError)
+    assert results[0].request == 'a'
+
+
+def test_run_windowed_close_cancels():
+    calls = _Calls()
+    results = _batching.run_windowed(calls.start, range(4), max_in_flight=2)
+
+    # Complete only the first call.
+    def start(request):
+        future = calls.start(request)
+        if request == 0:
+            future.set_result(0)
+        return future
+
+    results = _batching.run_windowed(start, range(4), max_in_flight=2)
+    assert next(results).response == 0
+    results.close()
+    assert all(f.cancelled() for r, f in calls.futures if r != 0)
+
+
+def test_run_windowed_invalid_window():
+    with pytest.raises(ValueError):
+        list(_batching.run_windowed(lambda r: None, [], max_in_flight=0))
+
+
+def test_run_windowed_unmapped_error():
+    # Mapping this error fails, as it has no trailing metadata.
+    error = _not_found()
+    del error.trailing_metadata
+    future = futures.Future()
+    future.set_exception(error)
+
+    result, = _batching.run_windowed(lambda r: future, ['a'], max_in_flight=1)
+    assert result.exception is error
+
+
+class _Clock(object):
+    """A clock which advances only when slept on."""
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_rate_limiter():
+    clock = _Clock()
+    limiter = _batching.RateLimiter(10, burst=2, clock=clock, sleep=clock.sleep)
+
+    # The burst passes at once; later calls are spaced 0.1s apart.
+    for _ in range(4):
+        limiter.acquire()
+    assert clock.sleeps == pytest.approx([0.1, 0.1])
+
+    # Tokens build up again while idle, up to the burst.
+    clock.now += 10
+    clock.sleeps.clear()
+    for _ in range(3):
+        limiter.acquire()
+    assert clock.sleeps == pytest.approx([0.1])
+
+
+def test_rate_limiter_invalid():
+    with pytest.raises(ValueError):
+        _batching.RateLimiter(0)
+    with pytest.raises(ValueError):
+        _batching.RateLimiter(1, burst=0)
@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from concurrent import futures
+import json
+from unittest import mock
+
+import grpc
+import pytest
+
+from google.api_core import exceptions
+from google.auth import credentials
+from google.showcase_v1beta1.services.identity import IdentityClient
+from google.showcase_v1beta1.services.identity import ImportStats
+from google.showcase_v1beta1.services.identity import UserCache
+from google.showcase_v1beta1.services.identity import bulk
+from google.showcase_v1beta1.types import identity
+
+
+UserPb = identity.User.pb()
+ListUsersResponsePb = identity.ListUsersResponse.pb()
+
+
+def _client():
+    return IdentityClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+
+def _unavailable():
+    error = grpc.RpcError()
+    error.code = lambda: grpc.StatusCode.UNAVAILABLE
+    error.details = lambda: 'unavailable'
+    error.trailing_metadata = lambda: None
+    return error
+
+
+class _Server(object):
+    """Creates users as completed futures, failing the given emails."""
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.requests = []
+
+    def __call__(self, request, timeout=None, metadata=()):
+        self.requests.append(request)
+        future = futures.Future()
+        if request.user.email in self.fail:
+            future.set_exception(_unavailable())
+        else:
+            future.set_result(UserPb(
+                name='users/{}'.format(len(self.requests)),
+                email=request.user.email,
+            ))
+        return future
+
+
+def _results(path):
+    with open(str(path)) as fp:
+        return [json.loads(line) for line in fp]
+
+
+def test_read_records(tmpdir):
+    ndjson = tmpdir.join('users.ndjson')
+    ndjson.write('{"email": "a@example.com"}\n\n{bad\n{"display_name": "c"}\n')
+    records = list(bulk.read_records(str(ndjson)))
+    assert records[0] == (1, {'email': 'a@example.com'})
+    assert records[1][0] == 2 and isinstance(records[1][1], ValueError)
+    assert records[2] == (3, {'display_name': 'c'})
+
+    rows = tmpdir.join('users.csv')
+    rows.write('display_name,email\nA,a@example.com\nB,\n')
+    assert list(bulk.read_records(str(rows))) == [
+        (1, {'display_name': 'A', 'email': 'a@example.com'}),
+        (2, {'display_name': 'B'}),
+    ]
+
+    with pytest.raises(ValueError):
+        list(bulk.read_records(str(rows), format='xml'))
+
+
+def test_import_users(tmpdir):
+    path = tmpdir.join('users.ndjson')
+    path.write(''.join(
+        json.dumps({'email': email}) + '\n'
+        for email in ('a@example.com', 'b@example.com', 'c@example.com')
+    ) + '{"nickname": "d"}\n')
+    results_path = str(tmpdir.join('results.ndjson'))
+    client = IdentityClient(
+        credentials=credentials.AnonymousCredentials(),
+        user_cache=UserCache(negative_ttl=60),
+    )
+
+    server = _Server(fail={'b@example.com'})
+    with mock.patch.object(
+            type(client._transport.create_user),
+            'future') as call:
+        call.side_effect = server
+        stats = bulk.import_users(
+            client, str(path), results_path, max_in_flight=2, timeout=5)
+
+    assert stats == ImportStats(created=2, failed=2, skipped=0)
+    assert [r.user.email for r in server.requests] == [
+        'a@example.com', 'b@example.com', 'c@example.com']
+    _, _, kwargs = call.mock_calls[0]
+    assert kwargs['timeout'] == 5
+
+    results = {r['record']: r for r in _results(results_path)}
+    assert results[1]['name'] == 'users/1'
+    assert client._user_cache.stats().invalidations == 2
+    assert results[2]['error'].startswith('ServiceUnavailable')
+    assert 'nickname' in results[4]['error']
+
+    # A second run skips the created records and retries the rest.
+    server = _Server()
+    with mock.patch.object(
+            type(client._transport.create_user),
+            'future') as call:
+        call.side_effect = server
+        stats = bulk.import_users(client, str(path), results_path)
+
+    assert stats == ImportStats(created=1, failed=1, skipped=2)
+    assert [r.user.email for r in server.requests] == ['b@example.com']
+    assert len(_results(results_path)) == 6
+
+
+def test_import_users_interrupted_results(tmpdir):
+    path = tmpdir.join('users.csv')
+    path.write('email\na@example.com\nb@example.com\n')
+    results_path = tmpdir.join('results.ndjson')
+    # The last line was cut short when the previous run stopped.
+    results_path.write('{"record": 1, "name": "users/1"}\n{"record": 2, "na')
+    client = _client()
+
+    server = _Server()
+    with mock.patch.object(
+            type(client._transport.create_user),
+            'future') as call:
+        call.side_effect = server
+        stats = bulk.import_users(
+            client, str(path), str(results_path), rate=1000)
+
+    assert stats == ImportStats(created=1, failed=0, skipped=1)
+    assert [r.user.email for r in server.requests] == ['b@example.com']
+
+    # The new outcome starts a line of its own.
+    lines = results_path.read().splitlines()
+    assert json.loads(lines[-1]) == {'record': 2, 'name': 'users/1'}
+
+
+class _Deleter(object):
+    """Deletes users as completed futures, failing some names at first."""
+    def __init__(self, errors=None):
+        # The errors to fail each name with, in turn.
+        self.errors = errors or {}
+        self.requests = []
+
+    def __call__(self, request, timeout=None, metadata=()):
+        self.requests.append(request.name)
+        future = futures.Future()
+        errors = self.errors.get(request.name)
+        if errors:
+            code = errors.pop(0)
+            error = grpc.RpcError()
+            error.code = lambda: code
+            error.details = lambda: code.name
+            error.trailing_metadata = lambda: None
+            future.set_exception(error)
+        else:
+            future.set_result(b'')
+        return future
+
+
+def test_delete_users():
+    client = IdentityClient(
+        credentials=credentials.AnonymousCredentials(),
+        user_cache=UserCache(),
+    )
+    client._user_cache.get('users/1', lambda: identity.User(name='users/1'))
+    deleter = _Deleter({
+        'users/2': [grpc.StatusCode.UNAVAILABLE],
+        'users/3': [grpc.StatusCode.NOT_FOUND],
+        'users/4': [grpc.StatusCode.PERMISSION_DENIED],
+        'users/5': [grpc.StatusCode.UNAVAILABLE] * 3,
+    })
+    reports = []
+
+    with mock.patch.object(
+            type(client._transport.delete_user),
+            'future') as call, \
+            mock.patch('time.sleep') as sleep:
+        call.side_effect = deleter
+        stats = bulk.delete_users(
+            client,
+            iter(['users/{}'.format(i) for i in range(1, 6)]),
+            max_in_flight=2,
+            max_attempts=3,
+            retry_delay=0.5,
+            progress=reports.append,
+            progress_interval=0,
+        )
+
+    # Transient errors are retried in later rounds, with backoff.
+    assert deleter.requests == [
+        'users/1', 'users/2', 'users/3', 'users/4', 'users/5',
+        'users/2', 'users/5', 'users/5']
+    assert [c[1][0] for c in sleep.mock_calls] == [0.5, 1.0]
+
+    assert (stats.deleted, stats.not_found, stats.failed) == (2, 1, 2)
+    assert isinstance(stats.errors['users/4'], exceptions.PermissionDenied)
+    assert isinstance(stats.errors['users/5'], exceptions.ServiceUnavailable)
+    assert stats.throughput > 0
+    assert reports[-1] == stats
+    assert len(reports) == 9
+
+    # Deleted users are dropped from the client's cache.
+    assert client._user_cache.peek('users/1') is None
+
+
+def test_delete_users_where():
+    client = _client()
+
+    def list_users(request, timeout=None, metadata=()):
+        if not request.page_token:
+            return ListUsersResponsePb(
+                users=[UserPb(name='users/1', email='a@test'),
+                       UserPb(name='users/2', email='b@example.com')],
+                next_page_token='2',
+            )
+        return ListUsersResponsePb(
+            users=[UserPb(name='users/3', email='c@test')])
+
+    deleter = _Deleter()
+    with mock.patch.object(
+            type(client._transport.delete_user),
+            '__call__') as call, \
+            mock.patch.object(
+                type(client._transport.delete_user),
+                'future') as future:
+        call.side_effect = list_users
+        future.side_effect = deleter
+        stats = bulk.delete_users(
+            client, where=lambda user: user.email.endswith('@test'))
+
+    # The scan finishes before the first deletion.
+    assert [c[1][0].page_token for c in call.mock_calls] == ['', '2']
+    assert deleter.requests == ['users/1', 'users/3']
+    assert stats.deleted == 2
+
+
+def test_delete_users_invalid():
+    client = _client()
+    with pytest.raises(ValueError):
+        bulk.delete_users(client)
+    with pytest.raises(ValueError):
+        bulk.delete_users(client, ['users/1'], where=bool)
+    with pytest.raises(ValueError):
+        bulk.delete_users(client, ['users/1'], max_attempts=0)
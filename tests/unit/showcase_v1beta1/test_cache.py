@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import threading
+
+import pytest
+
+from google.api_core import exceptions
+from google.showcase_v1beta1.services.identity import CacheStats
+from google.showcase_v1beta1.services.identity import UserCache
+from google.showcase_v1beta1.types import identity
+
+
+class _Clock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class _Loader(object):
+    """Loads numbered versions of a user."""
+    def __init__(self, name='users/1'):
+        self.name = name
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return identity.User(name=self.name, display_name=str(self.calls))
+
+
+def _join_refresh_threads():
+    for thread in threading.enumerate():
+        if thread.name == 'UserCache-refresh':
+            thread.join(5)
+
+
+def test_user_cache_ttl():
+    clock = _Clock()
+    cache = UserCache(ttl=10, clock=clock)
+    load = _Loader()
+
+    assert cache.get('users/1', load).display_name == '1'
+    clock.now = 9.9
+    assert cache.get('users/1', load).display_name == '1'
+    assert load.calls == 1
+
+    # Once expired, the next lookup loads the user again.
+    clock.now = 10.0
+    assert cache.get('users/1', load).display_name == '2'
+    assert cache.stats() == CacheStats(
+        hits=1, stale_hits=0, negative_hits=0, misses=2, evictions=0,
+        invalidations=0)
+
+
+def test_user_cache_returns_copies():
+    cache = UserCache()
+    user = cache.get('users/1', _Loader())
+    user.display_name = 'changed'
+
+    assert cache.get('users/1', _Loader()).display_name == '1'
+    assert cache.peek('users/1').display_name == '1'
+    assert cache.peek('users/2') is None
+
+
+def test_user_cache_stale_while_revalidate():
+    clock = _Clock()
+    cache = UserCache(ttl=10, stale_ttl=5, clock=clock)
+    load = _Loader()
+    cache.get('users/1', load)
+
+    # A stale user is served while one refresh runs in the background.
+    clock.now = 12
+    release = threading.Event()
+
+    def slow_load():
+        release.wait(5)
+        return load()
+
+    assert cache.get('users/1', slow_load).display_name == '1'
+    assert cache.get('users/1', slow_load).display_name == '1'
+    release.set()
+    _join_refresh_threads()
+
+    assert load.calls == 2
+    assert cache.get('users/1', load).display_name == '2'
+    assert cache.stats().stale_hits == 2
+
+    # Past the stale window, the lookup waits for a new load.
+    clock.now = 100
+    assert cache.get('users/1', load).display_name == '3'
+
+
+def test_user_cache_refresh_failure():
+    clock = _Clock()
+    cache = UserCache(ttl=10, stale_ttl=5, clock=clock)
+    cache.get('users/1', _Loader())
+    clock.now = 12
+
+    def fail():
+        raise RuntimeError('unavailable')
+
+    assert cache.get('users/1', fail).display_name == '1'
+    _join_refresh_threads()
+
+    # The stale user is kept until it expires.
+    assert cache.peek('users/1').display_name == '1'
+
+
+def test_user_cache_refresh_limit():
+    clock = _Clock()
+    cache = UserCache(ttl=10, stale_ttl=5, max_refreshes=1, clock=clock)
+    for name in ('users/1', 'users/2'):
+        cache.get(name, _Loader(name))
+    clock.now = 12
+
+    release = threading.Event()
+    loads = []
+
+    def slow_load(name):
+        def load():
+            loads.append(name)
+            release.wait(5)
+            return identity.User(name=name)
+        return load
+
+    cache.get('users/1', slow_load('users/1'))
+    cache.get('users/2', slow_load('users/2'))
+    release.set()
+    _join_refresh_threads()
+
+    # Only one refresh ran; the other user is refreshed on a later lookup.
+    assert loads == ['users/1']
+
+
+def test_user_cache_load_error():
+    cache = UserCache()
+
+    def fail():
+        raise RuntimeError('unavailable')
+
+    with pytest.raises(RuntimeError):
+        cache.get('users/1', fail)
+    assert len(cache) == 0
+    assert cache.get('users/1', _Loader()).display_name == '1'
+
+
+def test_user_cache_invalidate_during_load():
+    cache = UserCache()
+    load = _Loader()
+
+    def racing_load():
+        # The user is updated while its old version is being loaded.
+        user = load()
+        cache.invalidate('users/1')
+        return user
+
+    assert cache.get('users/1', racing_load).display_name == '1'
+    assert len(cache) == 0
+    assert cache.get('users/1', load).display_name == '2'
+    assert cache.stats().invalidations == 1
+
+
+def _not_found():
+    raise exceptions.NotFound('no such user')
+
+
+def test_user_cache_negative_ttl():
+    clock = _Clock()
+    cache = UserCache(ttl=60, negative_ttl=5, clock=clock)
+    load = _Loader()
+
+    with pytest.raises(exceptions.NotFound):
+        cache.get('users/1', _not_found)
+
+    # The miss is remembered, without a call, until it expires.
+    clock.now = 4.9
+    with pytest.raises(exceptions.NotFound):
+        cache.get('users/1', load)
+    assert load.calls == 0
+    assert cache.peek('users/1') is None
+    assert cache.stats().negative_hits == 1
+
+    clock.now = 5
+    assert cache.get('users/1', load).display_name == '1'
+
+    # Invalidating the name, as creating the user does, forgets the miss.
+    clock.now = 100
+    with pytest.raises(exceptions.NotFound):
+        cache.get('users/2', _not_found)
+    cache.invalidate('users/2')
+    assert cache.get('users/2', _Loader('users/2')).name == 'users/2'
+
+
+def test_user_cache_negative_ttl_disabled():
+    cache = UserCache()
+    load = _Loader()
+
+    with pytest.raises(exceptions.NotFound):
+        cache.get('users/1', _not_found)
+    assert len(cache) == 0
+    assert cache.get('users/1', load).display_name == '1'
+
+
+def test_user_cache_refresh_not_found():
+    clock = _Clock()
+    cache = UserCache(ttl=10, stale_ttl=5, negative_ttl=5, clock=clock)
+    cache.get('users/1', _Loader())
+
+    # A refresh finds the user deleted.
+    clock.now = 12
+    assert cache.get('users/1', _not_found).display_name == '1'
+    _join_refresh_threads()
+
+    with pytest.raises(exceptions.NotFound):
+        cache.get('users/1', _Loader())
+
+
+def test_user_cache_eviction():
+    cache = UserCache(maxsize=2)
+    for name in ('users/1', 'users/2'):
+        cache.get(name, _Loader(name))
+
+    # Using users/1 makes users/2 the least recently used.
+    cache.get('users/1', _Loader())
+    cache.get('users/3', _Loader('users/3'))
+
+    assert cache.peek('users/2') is None
+    assert cache.peek('users/1') is not None
+    assert len(cache) == 2
+    assert cache.stats().evictions == 1
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_user_cache_maxsize():
+    with pytest.raises(ValueError):
+        UserCache(maxsize=0)
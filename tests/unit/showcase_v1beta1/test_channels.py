@@ -0,0 +1,389 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from unittest import mock
+
+import gc
+import threading
+
+import pytest
+
+from google.auth import credentials
+from google.showcase_v1beta1.services.echo import EchoClient
+from google.showcase_v1beta1.services.identity import IdentityClient
+from google.showcase_v1beta1.services import _channels
+from google.showcase_v1beta1.services.echo import transports as echo_transports
+from google.showcase_v1beta1.services.identity import transports as identity_transports
+
+
+def client_cert_source_callback():
+    return b"cert bytes", b"key bytes"
+
+
+def test_fingerprint():
+    assert _channels.fingerprint(b"a", b"b") == _channels.fingerprint(b"a", b"b")
+    assert _channels.fingerprint(b"a", b"b") != _channels.fingerprint(b"ab", b"")
+
+
+def test_credentials_key():
+    anonymous = credentials.AnonymousCredentials()
+    assert _channels.credentials_key(anonymous) == _channels.credentials_key(
+        credentials.AnonymousCredentials())
+
+    creds = mock.Mock()
+    assert _channels.credentials_key(creds) is creds
+    assert _channels.credentials_key(None) is None
+
+
+def test_channel_pool_reference_counting():
+    pool = _channels.ChannelPool()
+    factory = mock.Mock()
+
+    first = pool.acquire('key', factory)
+    second = pool.acquire('key', factory)
+    assert first is second
+    factory.assert_called_once_with()
+    assert len(pool) == 1
+
+    pool.release(first)
+    first.close.assert_not_called()
+    pool.release(second)
+    first.close.assert_called_once_with()
+    assert len(pool) == 0
+
+    # Releasing an unknown channel is a no-op.
+    pool.release(mock.Mock())
+
+
+def test_channel_pool_distinct_keys():
+    pool = _channels.ChannelPool()
+    first = pool.acquire('a', mock.Mock)
+    second = pool.acquire('b', mock.Mock)
+    assert first is not second
+    assert len(pool) == 2
+
+
+@mock.patch("grpc.ssl_channel_credentials", autospec=True)
+@mock.patch("google.api_core.grpc_helpers.create_channel", autospec=True)
+def test_transports_share_mtls_channel(grpc_create_channel, grpc_ssl_channel_cred):
+    grpc_create_channel.side_effect = lambda *args, **kwargs: mock.Mock()
+
+    echo = echo_transports.EchoGrpcTransport(
+        credentials=credentials.AnonymousCredentials(),
+        api_mtls_endpoint="mtls.squid.clam.whelk",
+        client_cert_source=client_cert_source_callback,
+    )
+    identity = identity_transports.IdentityGrpcTransport(
+        credentials=credentials.AnonymousCredentials(),
+        api_mtls_endpoint="mtls.squid.clam.whelk",
+        client_cert_source=client_cert_source_callback,
+    )
+
+    # One channel, one set of SSL credentials, for both services.
+    assert echo.grpc_channel is identity.grpc_channel
+    grpc_create_channel.assert_called_once()
+    grpc_ssl_channel_cred.assert_called_once()
+
+    # A different client certificate gets its own channel.
+    other = echo_transports.EchoGrpcTransport(
+        credentials=credentials.AnonymousCredentials(),
+        api_mtls_endpoint="mtls.squid.clam.whelk",
+        client_cert_source=lambda: (b"other cert", b"other key"),
+    )
+    assert other.grpc_channel is not echo.grpc_channel
+    other.close()
+
+    # The channel is closed with the last transport using it.
+    channel = echo.grpc_channel
+    echo.close()
+    channel.close.assert_not_called()
+    del identity
+    gc.collect()
+    channel.close.assert_called_once_with()
+
+
+def test_provided_channel_is_not_closed():
+    channel = mock.Mock()
+    transport = echo_transports.EchoGrpcTransport(channel=channel)
+    transport.close()
+    channel.close.assert_not_called()
+
+
+def test_multi_channel_requires_channels():
+    with pytest.raises(ValueError):
+        _channels.MultiChannel([])
+
+
+def test_multi_channel_least_outstanding():
+    channels = [mock.Mock(), mock.Mock(), mock.Mock()]
+    multi_channel = _channels.MultiChannel(channels)
+    assert multi_channel.channels == channels
+
+    # Streaming calls stay outstanding until their callback runs.
+    callbacks = []
+    for channel in channels:
+        channel.unary_stream.return_value.return_value.add_callback.side_effect = (
+            lambda callback: callbacks.append(callback) or True)
+
+    stub = multi_channel.unary_stream('/google.showcase.v1beta1.Echo/Expand')
+    stub('first')
+    stub('second')
+    assert multi_channel.outstanding == [1, 1, 0]
+
+    # A finished call frees its channel for the next one.
+    callbacks[0]()
+    assert multi_channel.outstanding == [0, 1, 0]
+    stub('third')
+    stub('fourth')
+    assert multi_channel.outstanding == [1, 1, 1]
+    channels[2].unary_stream.return_value.assert_called_once_with('third')
+    channels[0].unary_stream.return_value.assert_called_with('fourth')
+
+    # Blocking calls are outstanding only while they run.
+    unary = multi_channel.unary_unary('/google.showcase.v1beta1.Echo/Echo')
+    unary('request', timeout=1)
+    assert multi_channel.outstanding == [1, 1, 1]
+
+    multi_channel.close()
+    for channel in channels:
+        channel.close.assert_called_once_with()
+
+
+def test_multi_channel_future_outstanding():
+    channel = mock.Mock()
+    multi_channel = _channels.MultiChannel([channel])
+    future = multi_channel.unary_unary('/google.showcase.v1beta1.Echo/Echo').future('request')
+    assert multi_channel.outstanding == [1]
+
+    callback, = future.add_done_callback.call_args[0]
+    callback(future)
+    assert multi_channel.outstanding == [0]
+
+
+def test_multi_channel_failed_call_is_not_outstanding():
+    channel = mock.Mock()
+    channel.unary_stream.return_value.side_effect = RuntimeError()
+    multi_channel = _channels.MultiChannel([channel])
+    with pytest.raises(RuntimeError):
+        multi_channel.unary_stream('/google.showcase.v1beta1.Echo/Expand')('request')
+    assert multi_channel.outstanding == [0]
+
+
+@pytest.mark.parametrize('client_class,transport_class', [
+    (EchoClient, echo_transports.EchoGrpcMultiChannelTransport),
+    (IdentityClient, identity_transports.IdentityGrpcMultiChannelTransport),
+])
+@mock.patch("google.api_core.grpc_helpers.create_channel", autospec=True)
+def test_multichannel_transport(grpc_create_channel, client_class, transport_class):
+    grpc_create_channel.side_effect = lambda *args, **kwargs: mock.Mock()
+    assert client_class.get_transport_class('grpc_multichannel') is transport_class
+
+    client = client_class(
+        credentials=credentials.AnonymousCredentials(),
+        transport='grpc_multichannel',
+    )
+    transport = client._transport
+    assert isinstance(transport, transport_class)
+    assert isinstance(transport.grpc_channel, _channels.MultiChannel)
+    assert grpc_create_channel.call_count == len(transport.grpc_channel.channels)
+    for call in grpc_create_channel.call_args_list:
+        assert call[1]['options'] == [('grpc.use_local_subchannel_pool', 1)]
+
+    channels = transport.grpc_channel.channels
+    transport.close()
+    for channel in channels:
+        channel.close.assert_called_once_with()
+
+
+@mock.patch("grpc.ssl_channel_credentials", autospec=True)
+@mock.patch("google.api_core.grpc_helpers.create_channel", autospec=True)
+def test_multichannel_transport_mtls(grpc_create_channel, grpc_ssl_channel_cred):
+    grpc_create_channel.side_effect = lambda *args, **kwargs: mock.Mock()
+    mock_ssl_cred = mock.Mock()
+    grpc_ssl_channel_cred.return_value = mock_ssl_cred
+
+    transport = echo_transports.EchoGrpcMultiChannelTransport(
+        credentials=credentials.AnonymousCredentials(),
+        channel_count=4,
+        api_mtls_endpoint="mtls.squid.clam.whelk",
+        client_cert_source=client_cert_source_callback,
+    )
+    assert len(transport.grpc_channel.channels) == 4
+    grpc_ssl_channel_cred.assert_called_once_with(
+        certificate_chain=b"cert bytes", private_key=b"key bytes"
+    )
+    for call in grpc_create_channel.call_args_list:
+        assert call[0] == ("mtls.squid.clam.whelk:443",)
+        assert call[1]['ssl_credentials'] is mock_ssl_cred
+
+
+@mock.patch("grpc.ssl_channel_credentials", autospec=True)
+def test_ssl_credentials_cache(grpc_ssl_channel_cred):
+    grpc_ssl_channel_cred.side_effect = lambda **kwargs: mock.Mock()
+    cache = _channels.SslCredentialsCache(maxsize=2)
+
+    first = cache.get(b"cert", b"key")
+    assert cache.get(b"cert", b"key") is first
+    grpc_ssl_channel_cred.assert_called_once_with(
+        certificate_chain=b"cert", private_key=b"key")
+
+    # A rotated certificate gets new credentials.
+    second = cache.get(b"new cert", b"new key")
+    assert second is not first
+    assert len(cache) == 2
+
+    # The least recently used entry is evicted.
+    cache.get(b"cert", b"key")
+    cache.get(b"third cert", b"third key")
+    assert len(cache) == 2
+    assert cache.get(b"cert", b"key") is first
+    assert cache.get(b"new cert", b"new key") is not second
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+@mock.patch("grpc.ssl_channel_credentials", autospec=True)
+@mock.patch("google.api_core.grpc_helpers.create_channel", autospec=True)
+def test_transports_reuse_ssl_credentials(grpc_create_channel, grpc_ssl_channel_cred):
+    grpc_create_channel.side_effect = lambda *args, **kwargs: mock.Mock()
+
+    # Separate channels, but the same client certificate.
+    for _ in range(3):
+        transport = echo_transports.EchoGrpcMultiChannelTransport(
+            credentials=credentials.AnonymousCredentials(),
+            channel_count=2,
+            api_mtls_endpoint="mtls.squid.clam.whelk",
+            client_cert_source=client_cert_source_callback,
+        )
+        transport.close()
+
+    assert grpc_create_channel.call_count == 6
+    grpc_ssl_channel_cred.assert_called_once_with(
+        certificate_chain=b"cert bytes", private_key=b"key bytes")
+    ssl_credentials = {id(c[1]['ssl_credentials'])
+                       for c in grpc_create_channel.call_args_list}
+    assert len(ssl_credentials) == 1
+
+
+def _join_closing_threads():
+    for thread in threading.enumerate():
+        if thread.name == 'RotatingChannel-close':
+            thread.join()
+
+
+@mock.patch("grpc.channel_ready_future", autospec=True)
+@mock.patch("grpc.ssl_channel_credentials", autospec=True)
+def test_rotating_channel(grpc_ssl_channel_cred, channel_ready_future):
+    certs = [(b"cert bytes", b"key bytes")]
+    factory = mock.Mock(side_effect=lambda ssl_credentials: mock.Mock())
+    rotating_channel = _channels.RotatingChannel(lambda: certs[-1], factory)
+    first = rotating_channel.channel
+    factory.assert_called_once_with(grpc_ssl_channel_cred.return_value)
+
+    # An unchanged certificate keeps the channel.
+    assert not rotating_channel.refresh()
+
+    # Start a streaming call, which stays in flight on the first channel.
+    callbacks = []
+    first.unary_stream.return_value.return_value.add_callback.side_effect = (
+        lambda callback: callbacks.append(callback) or True)
+    rotating_channel.unary_stream('/google.showcase.v1beta1.Echo/Expand')('request')
+
+    # A new certificate builds a channel, used once it is ready.
+    certs.append((b"new cert", b"new key"))
+    assert rotating_channel.refresh()
+    assert not rotating_channel.refresh()
+    assert rotating_channel.channel is first
+    ready = channel_ready_future.return_value
+    ready.cancelled.return_value = False
+    ready.add_done_callback.call_args[0][0](ready)
+    assert rotating_channel.channel is not first
+
+    # The first channel drains before closing.
+    first.close.assert_not_called()
+    callbacks[0]()
+    _join_closing_threads()
+    first.close.assert_called_once_with()
+
+    rotating_channel.close()
+    rotating_channel.channel.close.assert_called_once_with()
+
+
+@mock.patch("grpc.channel_ready_future", autospec=True)
+@mock.patch("grpc.ssl_channel_credentials", autospec=True)
+def test_rotating_channel_close_pending(grpc_ssl_channel_cred, channel_ready_future):
+    certs = [(b"cert bytes", b"key bytes")]
+    rotating_channel = _channels.RotatingChannel(
+        lambda: certs[-1], lambda ssl_credentials: mock.Mock())
+    first = rotating_channel.channel
+
+    certs.append((b"new cert", b"new key"))
+    assert rotating_channel.refresh()
+    rotating_channel.close()
+    channel_ready_future.return_value.cancel.assert_called_once_with()
+    first.close.assert_called_once_with()
+    channel_ready_future.call_args[0][0].close.assert_called_once_with()
+
+    # A closed channel does not refresh.
+    certs.append((b"third cert", b"third key"))
+    assert not rotating_channel.refresh()
+
+
+@mock.patch("grpc.channel_ready_future", autospec=True)
+@mock.patch("grpc.ssl_channel_credentials", autospec=True)
+def test_rotating_channel_refreshes_periodically(grpc_ssl_channel_cred, channel_ready_future):
+    refreshed = threading.Event()
+    certs = [(b"cert bytes", b"key bytes")]
+
+    def cert_source():
+        if len(certs) > 1:
+            refreshed.set()
+        return certs[-1]
+
+    rotating_channel = _channels.RotatingChannel(
+        cert_source, lambda ssl_credentials: mock.Mock(), refresh_interval=0.01)
+    certs.append((b"new cert", b"new key"))
+    assert refreshed.wait(5)
+    rotating_channel.close()
+
+
+@mock.patch("grpc.ssl_channel_credentials", autospec=True)
+@mock.patch("google.api_core.grpc_helpers.create_channel", autospec=True)
+def test_transport_rotating_client_cert(grpc_create_channel, grpc_ssl_channel_cred):
+    grpc_create_channel.side_effect = lambda *args, **kwargs: mock.Mock()
+
+    transport = identity_transports.IdentityGrpcTransport(
+        credentials=credentials.AnonymousCredentials(),
+        api_mtls_endpoint="mtls.squid.clam.whelk",
+        client_cert_source=client_cert_source_callback,
+        client_cert_refresh_interval=3600,
+    )
+    rotating_channel = transport.grpc_channel
+    assert isinstance(rotating_channel, _channels.RotatingChannel)
+    grpc_create_channel.assert_called_once_with(
+        "mtls.squid.clam.whelk:443",
+        credentials=mock.ANY,
+        ssl_credentials=grpc_ssl_channel_cred.return_value,
+        scopes=(),
+    )
+
+    # The transport owns the channel, and can be collected.
+    channel = rotating_channel.channel
+    del transport
+    gc.collect()
+    channel.close.assert_called_once_with()
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from unittest import mock
+
+from google.auth import credentials
+from google.showcase_v1beta1.services.identity import IdentityClient
+from google.showcase_v1beta1.services.identity import UserDirectory
+from google.showcase_v1beta1.services.identity import write_directory
+from google.showcase_v1beta1.types import identity
+
+
+UserPb = identity.User.pb()
+ListUsersResponsePb = identity.ListUsersResponse.pb()
+
+
+class _Clock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _write(path, *names):
+    client = IdentityClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    users = [UserPb(name=name, email=name + '@example.com') for name in names]
+    with mock.patch.object(
+            type(client._transport.list_users),
+            '__call__') as call:
+        call.side_effect = (
+            ListUsersResponsePb(users=users[:2], next_page_token='2'),
+            ListUsersResponsePb(users=users[2:]),
+        )
+        return write_directory(client, path, prefetch=0)
+
+
+def test_user_directory(tmpdir):
+    path = str(tmpdir.join('users.npz'))
+    names = ['users/3', 'users/10', 'users/ñ', 'users/1', 'users/2']
+    assert _write(path, *names) == 5
+
+    directory = UserDirectory(path)
+    assert list(directory.names()) == sorted(names)
+    for name in names:
+        assert directory.get(name).email == name + '@example.com'
+    for name in ('users/0', 'users/11', 'users/4', 'users/z', ''):
+        assert directory.get(name) is None
+        assert name not in directory
+    assert 'users/ñ' in directory
+    assert len(directory) == 5
+    assert [u.name for u in directory] == sorted(names)
+    assert directory.nbytes > 0
+
+
+def test_user_directory_empty(tmpdir):
+    path = str(tmpdir.join('users.npz'))
+    _write(path)
+
+    directory = UserDirectory(path)
+    assert len(directory) == 0
+    assert directory.get('users/1') is None
+
+
+def test_user_directory_reload(tmpdir):
+    path = str(tmpdir.join('users.npz'))
+    _write(path, 'users/1')
+    clock = _Clock()
+    directory = UserDirectory(path, reload_interval=10, clock=clock)
+    user = directory.get('users/1')
+
+    assert not directory.reload()
+    _write(path, 'users/2', 'users/3')
+
+    # The old file is served until the next check.
+    clock.now = 9
+    assert 'users/1' in directory
+    clock.now = 10
+    assert 'users/1' not in directory
+    assert directory.get('users/3').name == 'users/3'
+    assert user.name == 'users/1'
@@ -17,14 +17,21 @@
 
 from unittest import mock
 
+import asyncio
+from concurrent import futures as concurrent_futures
 import grpc
+from grpc.experimental import aio
 import math
 import pytest
+import threading
 
 from google import auth
 from google.api_core import client_options
+from google.api_core import exceptions
 from google.api_core import future
 from google.api_core import grpc_helpers
+from google.api_core import grpc_helpers_async
+from google.api_core import operation_async
 from google.api_core import operations_v1
 from google.auth import credentials
 from google.longrunning import operations_pb2
@@ -33,7 +40,12 @@ from google.protobuf import any_pb2 as any  # type: ignore
 from google.protobuf import duration_pb2 as duration  # type: ignore
 from google.protobuf import timestamp_pb2 as timestamp  # type: ignore
 from google.rpc import status_pb2 as status  # type: ignore
+from google.showcase_v1beta1.services import _raw
+from google.showcase_v1beta1.services.echo import AsyncChatSession
+from google.showcase_v1beta1.services.echo import ChatSession
+from google.showcase_v1beta1.services.echo import EchoAsyncClient
 from google.showcase_v1beta1.services.echo import EchoClient
+from google.showcase_v1beta1.services.echo import RawEchoClient
 from google.showcase_v1beta1.services.echo import pagers
 from google.showcase_v1beta1.services.echo import transports
 from google.showcase_v1beta1.types import echo as gs_echo
@@ -43,6 +55,21 @@ def client_cert_source_callback():
     return b"cert bytes", b"key bytes"
 
 
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def fake_stream_call(responses, spec=aio.UnaryStreamCall):
+    call = mock.MagicMock(spec=spec)
+    call.wait_for_connection = mock.AsyncMock()
+    call.__aiter__.return_value = responses
+    return call
+
+
 def test__get_default_mtls_endpoint():
     api_endpoint = "example.googleapis.com"
     api_mtls_endpoint = "example.mtls.googleapis.com"
@@ -178,6 +205,109 @@ def test_echo(transport: str = 'grpc'):
     assert response.content == 'content_value'
 
 
+def test_echo_many():
+    client = EchoClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    def start(request, timeout=None, metadata=()):
+        future = concurrent_futures.Future()
+        if request.content == 'fail':
+            error = grpc.RpcError()
+            error.code = lambda: grpc.StatusCode.INVALID_ARGUMENT
+            error.details = lambda: 'fail'
+            error.trailing_metadata = lambda: None
+            future.set_exception(error)
+        else:
+            future.set_result(gs_echo.EchoResponse(content=request.content))
+        return future
+
+    # Mock the non-blocking form of the gRPC stub.
+    with mock.patch.object(
+            type(client._transport.echo),
+            'future') as call:
+        call.side_effect = start
+
+        results = list(client.echo_many(
+            [{'content': 'a'}, gs_echo.EchoRequest(content='fail'), {'content': 'c'}],
+            max_in_flight=2,
+            timeout=5,
+        ))
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 3
+        _, args, kw = call.mock_calls[0]
+        assert args[0] == gs_echo.EchoRequest(content='a')
+        assert kw['timeout'] == 5
+        assert 'x-goog-api-client' in dict(kw['metadata'])
+
+    # A failed call is reported in place, without aborting the batch.
+    assert [r.index for r in results] == [0, 1, 2]
+    assert results[0].result().content == 'a'
+    assert isinstance(results[1].exception, exceptions.InvalidArgument)
+    assert results[2].response.content == 'c'
+
+
+def test_echo_raw():
+    client = EchoClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    request = gs_echo.EchoRequest.pb()(content='content_value')
+
+    with mock.patch.object(
+            type(client._transport.echo),
+            '__call__') as call:
+        call.return_value = gs_echo.EchoResponse.pb()(
+            content='content_value',
+        )
+
+        response = client.raw.echo(request)
+
+        # The raw message is passed through, not coerced by proto-plus.
+        call.assert_called_once()
+        _, args, _ = call.mock_calls[0]
+        assert args[0] is request
+
+    assert isinstance(response, gs_echo.EchoResponse.pb())
+    assert response.content == 'content_value'
+
+    # The raw client and its stubs are created once.
+    assert client.raw is client.raw
+    assert client.raw.rpc('echo') is client.raw.rpc('echo')
+    assert isinstance(client.raw, RawEchoClient)
+
+
+def test_echo_raw_stubs():
+    client = EchoClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    channel = mock.Mock(spec=grpc.Channel)
+    client._transport._grpc_channel = channel
+
+    RawEchoClient(client).rpc('expand')
+    channel.unary_stream.assert_called_once_with(
+        '/google.showcase.v1beta1.Echo/Expand',
+        request_serializer=_raw.serialize,
+        response_deserializer=gs_echo.EchoResponse.pb().FromString,
+    )
+
+    # Undecoded responses are left as bytes.
+    RawEchoClient(client, decode=False).rpc('chat')
+    channel.stream_stream.assert_called_once_with(
+        '/google.showcase.v1beta1.Echo/Chat',
+        request_serializer=_raw.serialize,
+        response_deserializer=None,
+    )
+
+
+def test_raw_serialize():
+    request = gs_echo.EchoRequest.pb()(content='content_value')
+    serialized = request.SerializeToString()
+
+    assert _raw.serialize(request) == serialized
+    assert _raw.serialize(serialized) is serialized
+
+
 def test_expand(transport: str = 'grpc'):
     client = EchoClient(
         credentials=credentials.AnonymousCredentials(),
@@ -316,6 +446,199 @@ def test_chat(transport: str = 'grpc'):
         assert isinstance(message, gs_echo.EchoResponse)
 
 
+class _FakeChatCall(object):
+    """Echoes each request as it is read from the request iterator."""
+    def __init__(self, requests):
+        self._responses = (
+            gs_echo.EchoResponse(content=r.content) for r in requests)
+        self.cancelled = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._responses)
+
+    def cancel(self):
+        self.cancelled = True
+
+
+def test_chat_session():
+    client = EchoClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    with mock.patch.object(
+            type(client._transport.chat),
+            '__call__') as call:
+        call.side_effect = lambda requests, **kwargs: _FakeChatCall(requests)
+
+        with ChatSession(client, max_in_flight=2) as session:
+            session.send(gs_echo.EchoRequest(content='a'))
+            session.send({'content': 'b'})
+
+            # The window is full until a response is received.
+            with pytest.raises(TimeoutError):
+                session.send(gs_echo.EchoRequest(content='c'), timeout=0.01)
+
+            request, response = session.recv(timeout=5)
+            assert request.content == response.content == 'a'
+            session.send(gs_echo.EchoRequest(content='c'))
+
+            session.close_send()
+            with pytest.raises(ValueError):
+                session.send(gs_echo.EchoRequest(content='d'))
+
+            # Each response is paired with the request it answers.
+            assert [(q.content, r.content) for q, r in session] == [
+                ('b', 'b'), ('c', 'c')]
+            assert session.recv() is None
+
+    call.assert_called_once()
+
+
+def test_chat_session_error():
+    client = EchoClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    def fail(requests, **kwargs):
+        error = grpc.RpcError()
+        error.code = lambda: grpc.StatusCode.UNAVAILABLE
+        error.details = lambda: 'unavailable'
+        error.trailing_metadata = lambda: None
+        raise error
+
+    with mock.patch.object(
+            type(client._transport.chat),
+            '__call__') as call:
+        call.side_effect = fail
+
+        with ChatSession(client) as session:
+            with pytest.raises(exceptions.ServiceUnavailable):
+                session.recv(timeout=5)
+            # The failure is reported again, not lost.
+            with pytest.raises(exceptions.ServiceUnavailable):
+                session.recv(timeout=5)
+
+            # Nothing more can be sent on the failed stream.
+            with pytest.raises(ValueError) as exc_info:
+                session.send(gs_echo.EchoRequest(content='a'))
+            assert isinstance(
+                exc_info.value.__cause__, exceptions.ServiceUnavailable)
+
+
+def test_chat_session_send_wakes_on_failure():
+    client = EchoClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    fail = threading.Event()
+
+    def chat(requests, **kwargs):
+        def responses():
+            next(requests)
+            fail.wait(5)
+            error = grpc.RpcError()
+            error.code = lambda: grpc.StatusCode.UNAVAILABLE
+            error.details = lambda: 'unavailable'
+            error.trailing_metadata = lambda: None
+            raise error
+            yield
+
+        return responses()
+
+    with mock.patch.object(
+            type(client._transport.chat),
+            '__call__') as call:
+        call.side_effect = chat
+
+        with ChatSession(client, max_in_flight=1) as session:
+            session.send(gs_echo.EchoRequest(content='a'))
+
+            # A send waiting for room in the window gives up once the
+            # stream fails.
+            threading.Timer(0.05, fail.set).start()
+            with pytest.raises(ValueError):
+                session.send(gs_echo.EchoRequest(content='b'), timeout=5)
+
+
+def test_async_chat_session():
+    async def test():
+        client = EchoAsyncClient(
+            credentials=credentials.AnonymousCredentials(),
+        )
+
+        def chat(requests, **kwargs):
+            async def responses():
+                async for request in requests:
+                    yield gs_echo.EchoResponse(content=request.content)
+
+            stream = fake_stream_call([], spec=aio.StreamStreamCall)
+            stream.__aiter__.side_effect = responses
+            return stream
+
+        with mock.patch.object(
+                type(client._client._transport.chat),
+                '__call__') as call:
+            call.side_effect = chat
+
+            async with AsyncChatSession(client, max_in_flight=1) as session:
+                await session.send(gs_echo.EchoRequest(content='a'))
+                with pytest.raises(asyncio.TimeoutError):
+                    await session.send(
+                        gs_echo.EchoRequest(content='b'), timeout=0.01)
+
+                request, response = await session.recv(timeout=5)
+                assert request.content == response.content == 'a'
+                await session.send(gs_echo.EchoRequest(content='b'))
+                session.close_send()
+
+                assert [(q.content, r.content) async for q, r in session] == [
+                    ('b', 'b')]
+
+    run(test())
+
+
+def test_async_chat_session_error():
+    async def test():
+        client = EchoAsyncClient(
+            credentials=credentials.AnonymousCredentials(),
+        )
+        fail = asyncio.Event()
+
+        def chat(requests, **kwargs):
+            async def responses():
+                await requests.__anext__()
+                await fail.wait()
+                raise exceptions.ServiceUnavailable('unavailable')
+                yield
+
+            stream = fake_stream_call([], spec=aio.StreamStreamCall)
+            stream.__aiter__.side_effect = responses
+            return stream
+
+        with mock.patch.object(
+                type(client._client._transport.chat),
+                '__call__') as call:
+            call.side_effect = chat
+
+            async with AsyncChatSession(client, max_in_flight=1) as session:
+                await session.send(gs_echo.EchoRequest(content='a'))
+
+                # A send waiting for room in the window gives up once the
+                # stream fails, and later sends fail at once.
+                asyncio.get_event_loop().call_later(0.05, fail.set)
+                with pytest.raises(ValueError):
+                    await session.send(
+                        gs_echo.EchoRequest(content='b'), timeout=5)
+                with pytest.raises(ValueError):
+                    await session.send(gs_echo.EchoRequest(content='c'))
+                with pytest.raises(exceptions.ServiceUnavailable):
+                    await session.recv(timeout=5)
+
+    run(test())
+
+
 def test_paged_expand(transport: str = 'grpc'):
     client = EchoClient(
         credentials=credentials.AnonymousCredentials(),
@@ -434,6 +757,69 @@ def test_paged_expand_pages():
             assert page.raw_page.next_page_token == token
 
 
+def test_paged_expand_coalesced():
+    client = EchoClient(
+        credentials=credentials.AnonymousCredentials,
+        coalesce_reads=True,
+    )
+    pages = {
+        '': gs_echo.PagedExpandResponse(
+            responses=[gs_echo.EchoResponse(content='a')],
+            next_page_token='abc',
+        ),
+        'abc': gs_echo.PagedExpandResponse(
+            responses=[gs_echo.EchoResponse(content='b')],
+        ),
+    }
+    started = []
+
+    def rpc(request, **kwargs):
+        started.append(request.page_token)
+        # Hold the first page until every scan has asked for it.
+        while request.page_token == '' and client._single_flight.shared < 2:
+            threading.Event().wait(0.01)
+        return pages[request.page_token]
+
+    with mock.patch.object(
+            type(client._transport.paged_expand),
+            '__call__') as call:
+        call.side_effect = rpc
+        with concurrent_futures.ThreadPoolExecutor(3) as executor:
+            scans = [
+                executor.submit(
+                    lambda: [r.content for r in client.paged_expand(
+                        request={'content': 'a b'})])
+                for _ in range(3)
+            ]
+            results = [scan.result(5) for scan in scans]
+
+    assert results == [['a', 'b']] * 3
+    assert started.count('') == 1
+
+
+def test_paged_expand_pages_prefetch():
+    client = EchoClient(
+        credentials=credentials.AnonymousCredentials,
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._transport.paged_expand),
+            '__call__') as call:
+        call.side_effect = (
+            gs_echo.PagedExpandResponse(
+                responses=[gs_echo.EchoResponse(content='a')],
+                next_page_token='abc',
+            ),
+            gs_echo.PagedExpandResponse(
+                responses=[gs_echo.EchoResponse(content='b')],
+            ),
+            RuntimeError,
+        )
+        pager = client.paged_expand(request={}, prefetch=1)
+        assert [r.content for r in pager] == ['a', 'b']
+
+
 def test_wait(transport: str = 'grpc'):
     client = EchoClient(
         credentials=credentials.AnonymousCredentials(),
@@ -581,6 +967,93 @@ def test_echo_host_with_port():
     assert client._transport._host == 'localhost:8000'
 
 
+def test_echo_wrapped_methods_precomputed():
+    client = EchoClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Calls should reuse the wrappers built with the transport instead of
+    # wrapping the RPC again.
+    with mock.patch.object(
+            type(client._transport.echo),
+            '__call__') as call, mock.patch(
+            'google.api_core.gapic_v1.method.wrap_method') as wrap_method:
+        call.return_value = gs_echo.EchoResponse()
+        client.echo(gs_echo.EchoRequest())
+        client.echo(gs_echo.EchoRequest())
+        wrap_method.assert_not_called()
+
+    # Neither a retry nor a timeout is in effect, so no deadline is sent.
+    assert len(call.mock_calls) == 2
+    _, _, kw = call.mock_calls[0]
+    assert 'timeout' not in kw
+    assert 'x-goog-api-client' in dict(kw['metadata'])
+
+
+def test_echo_custom_transport_wraps_methods_lazily():
+    class CustomTransport(transports.EchoTransport):
+        def __init__(self):
+            super().__init__(credentials=credentials.AnonymousCredentials())
+            self.calls = []
+
+        @property
+        def echo(self):
+            def echo(request, metadata=()):
+                self.calls.append(request)
+                return gs_echo.EchoResponse(content=request.content)
+            return echo
+
+    # The transport never prepares its wrapped methods, and implements only
+    # the method it is called with.
+    client = EchoClient(transport=CustomTransport())
+    response = client.echo(gs_echo.EchoRequest(content='hi'))
+
+    assert response.content == 'hi'
+    assert len(client._transport.calls) == 1
+    assert list(client._transport._wrapped_methods) == ['echo']
+
+    # By default, a transport has nothing to release.
+    assert client._transport.close() is None
+
+
+def test_echo_client_info_version():
+    from google.showcase_v1beta1 import gapic_version
+
+    assert transports.base.DEFAULT_CLIENT_INFO.gapic_version == (
+        gapic_version.__version__)
+
+
+def test_echo_method_configs():
+    transport = transports.EchoGrpcTransport(
+        credentials=credentials.AnonymousCredentials(),
+        method_configs={'echo': {'timeout': 5.0}},
+    )
+    client = EchoClient(transport=transport)
+
+    with mock.patch.object(
+            type(client._transport.echo),
+            '__call__') as call:
+        call.return_value = gs_echo.EchoResponse()
+
+        # The configured default timeout applies when none is given...
+        client.echo(gs_echo.EchoRequest())
+        _, _, kw = call.mock_calls[0]
+        assert 0 < kw['timeout'] <= 5.0
+
+        # ...and an explicit one takes precedence.
+        client.echo(gs_echo.EchoRequest(), timeout=None)
+        _, _, kw = call.mock_calls[1]
+        assert 'timeout' not in kw
+
+
+def test_echo_method_configs_unknown_method():
+    with pytest.raises(ValueError):
+        transports.EchoGrpcTransport(
+            credentials=credentials.AnonymousCredentials(),
+            method_configs={'not_a_method': {'timeout': 5.0}},
+        )
+
+
 def test_echo_grpc_transport_channel():
     channel = grpc.insecure_channel('http://localhost/')
 
@@ -683,3 +1156,243 @@ def test_echo_grpc_lro_client():
 
     # Ensure that subsequent calls to the property send the exact same object.
     assert transport.operations_client is transport.operations_client
+
+
+def test_echo_async():
+    async def test():
+        client = EchoAsyncClient(
+            credentials=credentials.AnonymousCredentials(),
+        )
+        request = gs_echo.EchoRequest()
+
+        # Mock the actual call within the gRPC stub, and fake the request.
+        with mock.patch.object(
+                type(client._client._transport.echo),
+                '__call__') as call:
+            # Designate an appropriate return value for the call.
+            call.return_value = grpc_helpers_async.FakeUnaryUnaryCall(
+                gs_echo.EchoResponse(content='content_value'),
+            )
+
+            response = await client.echo(request)
+
+            # Establish that the underlying gRPC stub method was called.
+            assert len(call.mock_calls) == 1
+            _, args, _ = call.mock_calls[0]
+            assert args[0] == request
+
+        # Establish that the response is the type that we expect.
+        assert isinstance(response, gs_echo.EchoResponse)
+        assert response.content == 'content_value'
+
+    run(test())
+
+
+def test_expand_async():
+    async def test():
+        client = EchoAsyncClient(
+            credentials=credentials.AnonymousCredentials(),
+        )
+
+        with mock.patch.object(
+                type(client._client._transport.expand),
+                '__call__') as call:
+            call.return_value = fake_stream_call(
+                [gs_echo.EchoResponse(content='a'), gs_echo.EchoResponse(content='b')])
+
+            response = client.expand(content='a b')
+
+            # The call is made once iteration starts.
+            assert not call.mock_calls
+            contents = [message.content async for message in response]
+
+            call.assert_called_once()
+            _, args, _ = call.mock_calls[0]
+            assert args[0].content == 'a b'
+
+        assert contents == ['a', 'b']
+
+    run(test())
+
+
+def test_collect_async():
+    async def test():
+        client = EchoAsyncClient(
+            credentials=credentials.AnonymousCredentials(),
+        )
+
+        async def requests():
+            yield gs_echo.EchoRequest(content='a')
+
+        with mock.patch.object(
+                type(client._client._transport.collect),
+                '__call__') as call:
+            call.return_value = grpc_helpers_async.FakeStreamUnaryCall(
+                gs_echo.EchoResponse(content='content_value'),
+            )
+
+            response = await client.collect(requests())
+
+            assert len(call.mock_calls) == 1
+            _, args, _ = call.mock_calls[0]
+            assert [r.content async for r in args[0]] == ['a']
+
+        assert response.content == 'content_value'
+
+    run(test())
+
+
+def test_chat_async():
+    async def test():
+        client = EchoAsyncClient(
+            credentials=credentials.AnonymousCredentials(),
+        )
+
+        with mock.patch.object(
+                type(client._client._transport.chat),
+                '__call__') as call:
+            call.return_value = fake_stream_call(
+                [gs_echo.EchoResponse(content='a')], spec=aio.StreamStreamCall)
+
+            response = client.chat([gs_echo.EchoRequest(content='a')])
+            contents = [message.content async for message in response]
+
+            call.assert_called_once()
+
+        assert contents == ['a']
+
+    run(test())
+
+
+def test_paged_expand_async_pager():
+    async def test():
+        client = EchoAsyncClient(
+            credentials=credentials.AnonymousCredentials(),
+        )
+
+        with mock.patch.object(
+                type(client._client._transport.paged_expand),
+                '__call__') as call:
+            # Set the response to a series of pages.
+            call.side_effect = [
+                grpc_helpers_async.FakeUnaryUnaryCall(page) for page in (
+                    gs_echo.PagedExpandResponse(
+                        responses=[
+                            gs_echo.EchoResponse(),
+                            gs_echo.EchoResponse(),
+                        ],
+                        next_page_token='abc',
+                    ),
+                    gs_echo.PagedExpandResponse(
+                        responses=[],
+                        next_page_token='def',
+                    ),
+                    gs_echo.PagedExpandResponse(
+                        responses=[
+                            gs_echo.EchoResponse(),
+                        ],
+                    ),
+                )
+            ] + [RuntimeError]
+
+            pager = await client.paged_expand(request={})
+            assert isinstance(pager, pagers.PagedExpandAsyncPager)
+            assert pager.next_page_token == 'abc'
+            results = [i async for i in pager]
+
+        assert len(results) == 3
+        assert all(isinstance(i, gs_echo.EchoResponse) for i in results)
+
+    run(test())
+
+
+def test_wait_async():
+    async def test():
+        client = EchoAsyncClient(
+            credentials=credentials.AnonymousCredentials(),
+        )
+
+        with mock.patch.object(
+                type(client._client._transport.wait),
+                '__call__') as call:
+            call.return_value = grpc_helpers_async.FakeUnaryUnaryCall(
+                operations_pb2.Operation(name='operations/spam'),
+            )
+
+            response = await client.wait(gs_echo.WaitRequest())
+
+            assert len(call.mock_calls) == 1
+
+        assert isinstance(response, operation_async.AsyncOperation)
+
+    run(test())
+
+
+def test_echo_async_client_transport():
+    transport = EchoAsyncClient.get_transport_class('grpc_asyncio')
+    assert transport is transports.EchoGrpcAsyncIOTransport
+
+    client = EchoAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    assert isinstance(client._client._transport, transports.EchoGrpcAsyncIOTransport)
+    assert isinstance(client._client._transport.operations_client,
+                      operations_v1.OperationsAsyncClient)
+
+
+
+def test_echo_async_client_rejects_sync_transport():
+    # Calls on a synchronous transport could not be awaited.
+    with pytest.raises(ValueError):
+        EchoAsyncClient(
+            credentials=credentials.AnonymousCredentials(),
+            transport='grpc',
+        )
+    with pytest.raises(ValueError):
+        EchoAsyncClient(transport=transports.EchoGrpcTransport(
+            credentials=credentials.AnonymousCredentials(),
+        ))
+
+    # Nor is the asyncio transport offered to the synchronous client.
+    with pytest.raises(KeyError):
+        EchoClient.get_transport_class('grpc_asyncio')
+
+
+@mock.patch("grpc.ssl_channel_credentials", autospec=True)
+@mock.patch("google.api_core.grpc_helpers_async.create_channel", autospec=True)
+def test_echo_grpc_asyncio_transport_channel_mtls_with_client_cert_source(
+    grpc_create_channel, grpc_ssl_channel_cred
+):
+    # Check that if channel is None, but api_mtls_endpoint and client_cert_source
+    # are provided, then a mTLS channel will be created.
+    mock_cred = mock.Mock()
+
+    mock_ssl_cred = mock.Mock()
+    grpc_ssl_channel_cred.return_value = mock_ssl_cred
+
+    mock_grpc_channel = mock.Mock()
+    grpc_create_channel.return_value = mock_grpc_channel
+
+    client = EchoAsyncClient(
+        credentials=mock_cred,
+        client_options={
+            'api_endpoint': 'mtls.squid.clam.whelk',
+            'client_cert_source': client_cert_source_callback,
+        },
+    )
+    transport = client._client._transport
+    grpc_ssl_channel_cred.assert_called_once_with(
+        certificate_chain=b"cert bytes", private_key=b"key bytes"
+    )
+    grpc_create_channel.assert_called_once_with(
+        "mtls.squid.clam.whelk:443",
+        credentials=mock_cred,
+        ssl_credentials=mock_ssl_cred,
+        scopes=(),
+    )
+    assert transport.grpc_channel == mock_grpc_channel
+
+    # The transport closes the channel it created.
+    mock_grpc_channel.close = mock.AsyncMock()
+    run(transport.close())
+    mock_grpc_channel.close.assert_awaited_once_with()
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from unittest import mock
+
+import pytest
+
+from google.auth import credentials
+from google.protobuf import timestamp_pb2 as timestamp  # type: ignore
+from google.showcase_v1beta1.services.identity import IdentityClient
+from google.showcase_v1beta1.services.identity import export
+from google.showcase_v1beta1.types import identity
+
+
+UserPb = identity.User.pb()
+ListUsersResponsePb = identity.ListUsersResponse.pb()
+
+
+def _user(number, **kwargs):
+    return UserPb(
+        name='users/{}'.format(number),
+        display_name='Ünïcode {}'.format(number),
+        email='user{}@example.com'.format(number),
+        **kwargs
+    )
+
+
+def _columns():
+    columns = export.UserColumns()
+    columns.extend([
+        _user(1, create_time=timestamp.Timestamp(seconds=10, nanos=5)),
+        _user(2),
+        _user(3, update_time=timestamp.Timestamp(seconds=-1, nanos=1)),
+    ])
+    return columns
+
+
+def test_string_column():
+    column = export.StringColumn()
+    for value in ('a', '', 'ñé', 'long' * 10):
+        column.append(value)
+
+    assert len(column) == 4
+    assert list(column) == ['a', '', 'ñé', 'long' * 10]
+    assert column[-1] == 'long' * 10
+    assert column.nbytes == len(column.data) + 5 * 8
+    with pytest.raises(IndexError):
+        column[4]
+
+
+def test_user_columns():
+    columns = _columns()
+
+    assert len(columns) == 3
+    assert list(columns.email) == [
+        'user1@example.com', 'user2@example.com', 'user3@example.com']
+    assert list(columns.create_time) == [
+        10 * 10 ** 9 + 5, export.NO_TIME, export.NO_TIME]
+
+    # Rows round trip, leaving unset timestamps unset.
+    user = columns.user(0)
+    assert identity.User.pb(user) == _user(
+        1, create_time=timestamp.Timestamp(seconds=10, nanos=5))
+    assert identity.User.pb(columns.user(2)).update_time == timestamp.Timestamp(
+        seconds=-1, nanos=1)
+    assert not identity.User.pb(columns.user(1)).HasField('create_time')
+    assert [u.name for u in columns] == ['users/1', 'users/2', 'users/3']
+
+
+def test_user_columns_take():
+    columns = _columns().take([2, 0])
+
+    assert list(columns.name) == ['users/3', 'users/1']
+    assert list(columns.create_time) == [export.NO_TIME, 10 * 10 ** 9 + 5]
+    assert identity.User.pb(columns.user(1)) == identity.User.pb(
+        _columns().user(0))
+
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_user_columns_save_load(tmpdir, compress):
+    path = str(tmpdir.join('users.npz'))
+    _columns().save(path, compress=compress)
+
+    loaded = export.UserColumns.load(path)
+    assert [identity.User.pb(u) for u in loaded] == [
+        identity.User.pb(u) for u in _columns()]
+
+    # Nothing is left behind but the file.
+    assert tmpdir.listdir() == [tmpdir.join('users.npz')]
+
+
+def test_user_columns_load_mmap(tmpdir):
+    path = str(tmpdir.join('users.npz'))
+    columns = _columns()
+    columns.save(path)
+
+    with export.UserColumns.load(path, mmap_mode=True) as mapped:
+        assert isinstance(mapped.name.data, memoryview)
+        assert mapped.name.data.readonly
+        assert list(mapped.display_name) == list(columns.display_name)
+        assert list(mapped.update_time) == list(columns.update_time)
+        assert mapped.nbytes == columns.nbytes
+        with pytest.raises(TypeError):
+            mapped.append(identity.User.pb(columns.user(0)))
+
+    # Compressed columns must be read.
+    columns.save(path, compress=True)
+    with pytest.raises(ValueError):
+        export.UserColumns.load(path, mmap_mode=True)
+
+
+def test_npy_header():
+    header = export._npy_header('<i8', 3)
+    assert len(header) % 64 == 0
+    assert export._parse_npy(header) == ('<i8', 3, len(header))
+
+
+def test_export_users():
+    client = IdentityClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    with mock.patch.object(
+            type(client._transport.list_users),
+            '__call__') as call:
+        call.side_effect = (
+            ListUsersResponsePb(
+                users=[_user(1), _user(2)], next_page_token='abc'),
+            ListUsersResponsePb(users=[_user(3)]),
+            RuntimeError,
+        )
+        columns = export.export_users(client, {'page_size': 2}, prefetch=1)
+
+        requests = [args[0] for _, args, _ in call.mock_calls]
+
+    assert list(columns.name) == ['users/1', 'users/2', 'users/3']
+    assert [r.page_token for r in requests] == ['', 'abc']
+    assert all(r.page_size == 2 for r in requests)
+
+
+def test_export_users_sequential():
+    client = IdentityClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    with mock.patch.object(
+            type(client._transport.list_users),
+            '__call__') as call:
+        call.side_effect = (
+            ListUsersResponsePb(users=[_user(1)], next_page_token='abc'),
+            ListUsersResponsePb(users=[_user(2)]),
+            RuntimeError,
+        )
+        columns = export.export_users(client, prefetch=0)
+
+    assert list(columns.name) == ['users/1', 'users/2']
@@ -17,18 +17,26 @@
 
 from unittest import mock
 
+import asyncio
+from concurrent import futures as concurrent_futures
 import grpc
 import math
 import pytest
+import threading
+import traceback
 
 from google import auth
 from google.api_core import client_options
+from google.api_core import exceptions
 from google.api_core import grpc_helpers
+from google.api_core import grpc_helpers_async
 from google.auth import credentials
 from google.oauth2 import service_account
 from google.protobuf import field_mask_pb2 as field_mask  # type: ignore
 from google.protobuf import timestamp_pb2 as timestamp  # type: ignore
+from google.showcase_v1beta1.services.identity import IdentityAsyncClient
 from google.showcase_v1beta1.services.identity import IdentityClient
+from google.showcase_v1beta1.services.identity import UserCache
 from google.showcase_v1beta1.services.identity import pagers
 from google.showcase_v1beta1.services.identity import transports
 from google.showcase_v1beta1.types import identity
@@ -38,6 +46,14 @@ def client_cert_source_callback():
     return b"cert bytes", b"key bytes"
 
 
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
 def test__get_default_mtls_endpoint():
     api_endpoint = "example.googleapis.com"
     api_mtls_endpoint = "example.mtls.googleapis.com"
@@ -255,6 +271,207 @@ def test_get_user(transport: str = 'grpc'):
     assert response.email == 'email_value'
 
 
+def test_get_user_cached():
+    cache = UserCache()
+    client = IdentityClient(
+        credentials=credentials.AnonymousCredentials(),
+        user_cache=cache,
+    )
+    gets = []
+
+    def rpc(request, **kwargs):
+        # Every stub shares the patched class, so answer by request type.
+        if isinstance(request, identity.GetUserRequest):
+            gets.append((request, kwargs))
+            return identity.User(
+                name=request.name, display_name=str(len(gets)))
+        if isinstance(request, identity.DeleteUserRequest) and (
+                request.name == 'users/1'):
+            raise exceptions.DeadlineExceeded('slow')
+        return identity.User()
+
+    with mock.patch.object(
+            type(client._transport.get_user),
+            '__call__') as call:
+        call.side_effect = rpc
+
+        assert client.get_user(name='users/1').display_name == '1'
+        assert client.get_user(name='users/1').display_name == '1'
+        assert client.get_user(name='users/2').display_name == '2'
+        assert len(gets) == 2
+
+        # The cache sends the request as the client would.
+        request, kwargs = gets[0]
+        assert request.name == 'users/1'
+        assert ('x-goog-request-params', 'name=users/1') in kwargs['metadata']
+
+        # Writes by the client drop the user from the cache.
+        client.update_user(request={'user': {'name': 'users/1'}})
+        assert client.get_user(name='users/1').display_name == '3'
+        client.delete_user(name='users/2')
+        assert client.get_user(name='users/2').display_name == '4'
+
+        # A failed write may still have taken effect.
+        with pytest.raises(exceptions.DeadlineExceeded):
+            client.delete_user(name='users/1')
+        assert cache.peek('users/1') is None
+
+        # Changes made by other means are dropped on request.
+        client.get_user(name='users/3')
+        client.invalidate_user('users/3')
+        assert cache.peek('users/3') is None
+
+    assert cache.stats().hits == 1
+    assert cache.stats().invalidations == 4
+
+    # Without a cache there is nothing to drop.
+    IdentityClient(
+        credentials=credentials.AnonymousCredentials(),
+    ).invalidate_user('users/1')
+
+
+def test_get_user_cached_not_found():
+    client = IdentityClient(
+        credentials=credentials.AnonymousCredentials(),
+        user_cache=UserCache(negative_ttl=30),
+    )
+    created = set()
+
+    def rpc(request, **kwargs):
+        if isinstance(request, identity.CreateUserRequest):
+            created.add('users/1')
+            return identity.User(name='users/1')
+        if request.name not in created:
+            raise exceptions.NotFound('no such user')
+        return identity.User(name=request.name)
+
+    with mock.patch.object(
+            type(client._transport.get_user),
+            '__call__') as call:
+        call.side_effect = rpc
+
+        errors = []
+        for _ in range(50):
+            with pytest.raises(exceptions.NotFound) as exc_info:
+                client.get_user(name='users/1')
+            errors.append(exc_info.value)
+        assert call.call_count == 1
+
+        # Each lookup raises its own copy of the error, so tracebacks do
+        # not pile up on the cached one.
+        assert len({id(error) for error in errors}) == len(errors)
+        depths = [len(traceback.extract_tb(e.__traceback__)) for e in errors]
+        assert depths[-1] == depths[1]
+        assert str(errors[-1]) == str(errors[0])
+
+        # Creating the user drops the cached miss.
+        client.create_user(display_name='one', email='one@example.com')
+        assert client.get_user(name='users/1').name == 'users/1'
+        assert call.call_count == 3
+
+
+def test_get_user_coalesced():
+    client = IdentityClient(
+        credentials=credentials.AnonymousCredentials(),
+        coalesce_reads=True,
+    )
+    release = threading.Event()
+    results = []
+
+    def get(name):
+        thread = threading.Thread(
+            target=lambda: results.append(client.get_user(name=name)))
+        thread.start()
+        return thread
+
+    with mock.patch.object(
+            type(client._transport.get_user),
+            '__call__') as call:
+        call.side_effect = lambda request, **kwargs: (
+            release.wait(5) and identity.User(name=request.name))
+
+        threads = [get('users/1') for _ in range(3)] + [get('users/2')]
+        # Wait for the later lookups of users/1 to join the first.
+        while client._single_flight.shared < 2:
+            release.wait(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+    # One request per user; each caller has its own copy.
+    assert call.call_count == 2
+    assert sorted(u.name for u in results) == [
+        'users/1', 'users/1', 'users/1', 'users/2']
+    assert len(set(map(id, results))) == 4
+
+
+def test_get_users():
+    client = IdentityClient(
+        credentials=credentials.AnonymousCredentials(),
+        user_cache=UserCache(negative_ttl=60),
+    )
+    lock = threading.Lock()
+    running = [0, 0]
+
+    def finish(future, request):
+        with lock:
+            running[0] -= 1
+        if request.name == 'users/3':
+            error = grpc.RpcError()
+            error.code = lambda: grpc.StatusCode.NOT_FOUND
+            error.details = lambda: 'no such user'
+            error.trailing_metadata = lambda: None
+            future.set_exception(error)
+        else:
+            future.set_result(identity.User(name=request.name))
+
+    def start(request, timeout=None, metadata=()):
+        with lock:
+            running[0] += 1
+            running[1] = max(running)
+        future = concurrent_futures.Future()
+        threading.Timer(0.01, finish, (future, request)).start()
+        return future
+
+    with mock.patch.object(
+            type(client._transport.get_user),
+            '__call__') as call, mock.patch.object(
+            type(client._transport.get_user),
+            'future') as call_future:
+        call.return_value = identity.User(name='users/1')
+        call_future.side_effect = start
+        client.get_user(name='users/1')
+
+        names = ['users/{}'.format(i) for i in (2, 1, 3, 2, 4, 5, 6, 1)]
+        results = client.get_users(names, max_in_flight=2)
+
+        # Each name missing from the cache is looked up once, in the
+        # background; users/1 was cached.
+        assert call.call_count == 1
+        assert call_future.call_count == 5
+        _, _, kw = call_future.mock_calls[0]
+        assert ('x-goog-request-params', 'name=users/2') in kw['metadata']
+
+        # The users found, and the one found missing, are now cached.
+        again = client.get_users(['users/3', 'users/4'])
+        assert call_future.call_count == 5
+
+    # The results are in the order the names were first given.
+    assert list(results) == [
+        'users/2', 'users/1', 'users/3', 'users/4', 'users/5', 'users/6']
+    assert running[1] <= 2
+    assert results['users/1'].result().name == 'users/1'
+    assert isinstance(results['users/3'].exception, exceptions.NotFound)
+    assert isinstance(again['users/3'].exception, exceptions.NotFound)
+    assert again['users/4'].result().name == 'users/4'
+    assert results['users/4'].request.name == 'users/4'
+    assert [r.index for r in results.values()] == list(range(6))
+
+    with pytest.raises(ValueError):
+        client.get_users(names, max_in_flight=0)
+    assert client.get_users([]) == {}
+
+
 def test_get_user_field_headers():
     client = IdentityClient(
         credentials=credentials.AnonymousCredentials(),
@@ -325,6 +542,39 @@ def test_get_user_flattened_error():
         )
 
 
+def test_get_user_raw():
+    client = IdentityClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    request = identity.GetUserRequest.pb()(name='name_value')
+
+    with mock.patch.object(
+            type(client._transport.get_user),
+            '__call__') as call:
+        call.return_value = identity.User.pb()(
+            name='name_value',
+            display_name='display_name_value',
+        )
+
+        response = client.raw.get_user(request)
+
+        # The raw message is passed through, not coerced by proto-plus.
+        call.assert_called_once()
+        _, args, kw = call.mock_calls[0]
+        assert args[0] is request
+
+        # It is routed as the client routes it.
+        assert ('x-goog-request-params', 'name=name_value') in kw['metadata']
+
+        # A serialized request is sent as it is.
+        client.raw.get_user(request.SerializeToString())
+        _, _, kw = call.mock_calls[1]
+        assert 'x-goog-request-params' not in dict(kw['metadata'])
+
+    assert isinstance(response, identity.User.pb())
+    assert response.display_name == 'display_name_value'
+
+
 def test_update_user(transport: str = 'grpc'):
     client = IdentityClient(
         credentials=credentials.AnonymousCredentials(),
@@ -547,6 +797,77 @@ def test_list_users_pages():
             assert page.raw_page.next_page_token == token
 
 
+def test_list_users_pages_prefetch():
+    client = IdentityClient(
+        credentials=credentials.AnonymousCredentials,
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._transport.list_users),
+            '__call__') as call:
+        call.side_effect = (
+            identity.ListUsersResponse(
+                users=[identity.User(name='users/1')],
+                next_page_token='abc',
+            ),
+            identity.ListUsersResponse(
+                users=[identity.User(name='users/2')],
+                next_page_token='def',
+            ),
+            identity.ListUsersResponse(
+                users=[identity.User(name='users/3')],
+            ),
+            RuntimeError,
+        )
+        pager = client.list_users(request={'page_size': 1}, prefetch=2)
+        assert [u.name for u in pager] == ['users/1', 'users/2', 'users/3']
+
+        # Each page is requested with the original request and its token.
+        requests = [args[0] for _, args, _ in call.mock_calls]
+        assert [r.page_token for r in requests] == ['', 'abc', 'def']
+        assert all(r.page_size == 1 for r in requests)
+
+    # The last page is used for attribute lookup.
+    assert pager.next_page_token == ''
+
+    with pytest.raises(ValueError):
+        pagers.ListUsersPager(
+            method=None,
+            request={},
+            response=identity.ListUsersResponse(),
+            prefetch=-1,
+        )
+
+
+def test_list_users_adaptive_page_size():
+    client = IdentityClient(
+        credentials=credentials.AnonymousCredentials,
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._transport.list_users),
+            '__call__') as call:
+        call.side_effect = (
+            identity.ListUsersResponse(next_page_token='abc'),
+            identity.ListUsersResponse(next_page_token='def'),
+            identity.ListUsersResponse(next_page_token='ghi'),
+            identity.ListUsersResponse(),
+            RuntimeError,
+        )
+        sizer = pagers.AdaptivePageSize(
+            min_size=1, max_size=25, target_latency=60.0)
+        pager = client.list_users(
+            request={'page_size': 10}, adaptive_page_size=sizer)
+        assert list(pager) == []
+
+        # The pages come back quickly, so each request asks for more.
+        requests = [args[0] for _, args, _ in call.mock_calls]
+        assert [r.page_size for r in requests] == [10, 10, 20, 25]
+        assert [r.page_token for r in requests] == ['', 'abc', 'def', 'ghi']
+
+
 def test_credentials_transport_error():
     # It is an error to provide credentials and a transport instance.
     transport = transports.IdentityGrpcTransport(
@@ -626,6 +947,31 @@ def test_identity_host_with_port():
     assert client._transport._host == 'localhost:8000'
 
 
+def test_identity_method_configs():
+    transport = transports.IdentityGrpcTransport(
+        credentials=credentials.AnonymousCredentials(),
+        method_configs={'get_user': {'timeout': 5.0}},
+    )
+    client = IdentityClient(transport=transport)
+
+    with mock.patch.object(
+            type(client._transport.get_user),
+            '__call__') as call:
+        call.return_value = identity.User()
+        client.get_user(name='users/squid')
+        _, _, kw = call.mock_calls[0]
+        assert 0 < kw['timeout'] <= 5.0
+
+    # Methods without a configured default go straight to the stub.
+    with mock.patch.object(
+            type(client._transport.delete_user),
+            '__call__') as call:
+        call.return_value = None
+        client.delete_user(name='users/squid')
+        _, _, kw = call.mock_calls[0]
+        assert 'timeout' not in kw
+
+
 def test_identity_grpc_transport_channel():
     channel = grpc.insecure_channel('http://localhost/')
 
@@ -713,6 +1059,162 @@ def test_identity_grpc_transport_channel_mtls_with_adc(
         assert transport.grpc_channel == mock_grpc_channel
 
 
+def test_get_user_async_field_headers():
+    async def test():
+        client = IdentityAsyncClient(
+            credentials=credentials.AnonymousCredentials(),
+        )
+
+        # Mock the actual call within the gRPC stub, and fake the request.
+        with mock.patch.object(
+                type(client._client._transport.get_user),
+                '__call__') as call:
+            call.return_value = grpc_helpers_async.FakeUnaryUnaryCall(
+                identity.User(name='name/value'),
+            )
+            response = await client.get_user(name='name/value')
+
+            # Establish that the underlying gRPC stub method was called.
+            assert len(call.mock_calls) == 1
+            _, args, kw = call.mock_calls[0]
+            assert args[0] == identity.GetUserRequest(name='name/value')
+
+        # Establish that the field header was sent.
+        assert (
+            'x-goog-request-params',
+            'name=name/value',
+        ) in kw['metadata']
+        assert response.name == 'name/value'
+
+    run(test())
+
+
+def test_delete_user_async():
+    async def test():
+        client = IdentityAsyncClient(
+            credentials=credentials.AnonymousCredentials(),
+        )
+
+        with mock.patch.object(
+                type(client._client._transport.delete_user),
+                '__call__') as call:
+            call.return_value = grpc_helpers_async.FakeUnaryUnaryCall(None)
+            response = await client.delete_user(name='name_value')
+
+            assert len(call.mock_calls) == 1
+            _, args, _ = call.mock_calls[0]
+            assert args[0].name == 'name_value'
+
+        assert response is None
+
+    run(test())
+
+
+def test_list_users_async_pager():
+    async def test():
+        client = IdentityAsyncClient(
+            credentials=credentials.AnonymousCredentials(),
+        )
+
+        with mock.patch.object(
+                type(client._client._transport.list_users),
+                '__call__') as call:
+            # Set the response to a series of pages.
+            call.side_effect = [
+                grpc_helpers_async.FakeUnaryUnaryCall(page) for page in (
+                    identity.ListUsersResponse(
+                        users=[
+                            identity.User(),
+                            identity.User(),
+                        ],
+                        next_page_token='abc',
+                    ),
+                    identity.ListUsersResponse(
+                        users=[
+                            identity.User(),
+                        ],
+                    ),
+                )
+            ] + [RuntimeError]
+
+            pager = await client.list_users(request={})
+            assert isinstance(pager, pagers.ListUsersAsyncPager)
+            pages = [page async for page in pager.pages]
+
+        assert [page.next_page_token for page in pages] == ['abc', '']
+
+    run(test())
+
+
+def test_list_users_async_pager_prefetch():
+    async def test():
+        client = IdentityAsyncClient(
+            credentials=credentials.AnonymousCredentials(),
+        )
+
+        with mock.patch.object(
+                type(client._client._transport.list_users),
+                '__call__') as call:
+            call.side_effect = [
+                grpc_helpers_async.FakeUnaryUnaryCall(page) for page in (
+                    identity.ListUsersResponse(
+                        users=[identity.User(name='users/1')],
+                        next_page_token='abc',
+                    ),
+                    identity.ListUsersResponse(
+                        users=[identity.User(name='users/2')],
+                        next_page_token='def',
+                    ),
+                    identity.ListUsersResponse(
+                        users=[identity.User(name='users/3')],
+                    ),
+                )
+            ] + [RuntimeError]
+
+            sizer = pagers.AdaptivePageSize(target_latency=60.0)
+            pager = await client.list_users(
+                request={'page_size': 2},
+                prefetch=2,
+                adaptive_page_size=sizer,
+            )
+            users = [user.name async for user in pager]
+
+        assert users == ['users/1', 'users/2', 'users/3']
+        requests = [args[0] for _, args, _ in call.mock_calls]
+        assert [r.page_token for r in requests] == ['', 'abc', 'def']
+        assert [r.page_size for r in requests] == [2, 2, 4]
+        assert pager.next_page_token == ''
+
+    run(test())
+
+
+def test_identity_async_client_transport():
+    client = IdentityAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    assert isinstance(client._client._transport,
+                      transports.IdentityGrpcAsyncIOTransport)
+    assert IdentityAsyncClient.user_path('squid') == 'users/squid'
+
+
+
+def test_identity_async_client_rejects_sync_transport():
+    # Calls on a synchronous transport could not be awaited.
+    with pytest.raises(ValueError):
+        IdentityAsyncClient(
+            credentials=credentials.AnonymousCredentials(),
+            transport='grpc',
+        )
+    with pytest.raises(ValueError):
+        IdentityAsyncClient(transport=transports.IdentityGrpcTransport(
+            credentials=credentials.AnonymousCredentials(),
+        ))
+
+    # Nor is the asyncio transport offered to the synchronous client.
+    with pytest.raises(KeyError):
+        IdentityClient.get_transport_class('grpc_asyncio')
+
+
 def test_user_path():
   user_id = "squid"
 
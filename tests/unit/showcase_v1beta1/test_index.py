@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from google.showcase_v1beta1.services.identity import UserIndex
+from google.showcase_v1beta1.types import identity
+
+
+def _user(number, email='', display_name=''):
+    return identity.User(
+        name='users/{}'.format(number),
+        email=email,
+        display_name=display_name,
+    )
+
+
+def test_user_index_email():
+    index = UserIndex()
+    index.update(_user(1, 'Ann@Example.com'))
+    index.update(_user(2, 'bob@example.com'))
+    index.update(_user(3, 'ann@example.com'))
+    index.update(_user(4))
+
+    assert index.find_by_email('ANN@example.com') == ['users/1', 'users/3']
+    assert index.find_by_email('bob@example.com') == ['users/2']
+    assert index.find_by_email('') == []
+
+    # Changing and removing users moves them in the index.
+    index.update(_user(1, 'carol@example.com'))
+    index.remove('users/2')
+    index.remove('users/5')
+    assert index.find_by_email('ann@example.com') == ['users/3']
+    assert index.find_by_email('carol@example.com') == ['users/1']
+    assert index.find_by_email('bob@example.com') == []
+    assert len(index) == 3
+    assert 'users/2' not in index
+
+
+def test_user_index_display_name():
+    index = UserIndex()
+    for number, display_name in enumerate(
+            ['Bob', 'ann', 'Anna', 'Andy', '', 'Ann'], 1):
+        index.update(_user(number, display_name=display_name))
+
+    assert index.find_by_display_name('an') == [
+        'users/4', 'users/2', 'users/6', 'users/3']
+    assert index.find_by_display_name('ANN', limit=2) == ['users/2', 'users/6']
+    assert index.find_by_display_name('z') == []
+    assert len(index.find_by_display_name('')) == 5
+
+    index.update(_user(2, display_name='Zed'))
+    index.remove('users/6')
+    assert index.find_by_display_name('ann') == ['users/3']
+    assert index.find_by_display_name('z') == ['users/2']
+
+    index.clear()
+    assert index.find_by_display_name('') == []
+    assert len(index) == 0
+
+
+def test_user_index_update_many():
+    index = UserIndex()
+    index.update_many(
+        _user(number, display_name='user {:02}'.format(number))
+        for number in range(20))
+
+    # A few changes are inserted in place; users with the same display
+    # name are ordered by name either way.
+    index.update(_user(30, display_name='user 05'))
+    index.update_many([_user(4, display_name='user 05')])
+    assert index.find_by_display_name('user 05') == [
+        'users/30', 'users/4', 'users/5']
+    assert index.find_by_display_name('user 04') == []
+    assert len(index.find_by_display_name('user')) == 21
+
+
+def test_user_index_update_many_duplicates():
+    empty = UserIndex()
+    populated = UserIndex()
+    populated.update_many(_user(number) for number in range(20))
+
+    # Of several copies of a user in one batch, the last wins.
+    for index in (empty, populated):
+        index.update_many([
+            _user(1, display_name='first', email='first@example.com'),
+            _user(1, display_name='second', email='second@example.com'),
+        ])
+        assert index.find_by_display_name('first') == []
+        assert index.find_by_display_name('second') == ['users/1']
+        assert index.find_by_email('first@example.com') == []
+        assert index.find_by_email('second@example.com') == ['users/1']
+
+        index.remove('users/1')
+        assert index.find_by_display_name('second') == []
+        assert index.find_by_email('second@example.com') == []
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import subprocess
+import sys
+
+import pytest
+
+from google import showcase
+from google import showcase_v1beta1
+
+
+def _loaded_modules_after(code):
+    # Run in a fresh interpreter so earlier imports do not leak in.
+    output = subprocess.check_output([
+        sys.executable, '-c',
+        code + '\nimport sys\nprint("\\n".join(sorted(sys.modules)))',
+    ])
+    return set(output.decode().split())
+
+
+@pytest.mark.parametrize('package', ['google.showcase', 'google.showcase_v1beta1'])
+def test_import_is_lazy(package):
+    modules = _loaded_modules_after('import {}'.format(package))
+    assert 'google.showcase_v1beta1.services.echo.client' not in modules
+    assert 'google.showcase_v1beta1.types.echo' not in modules
+    assert 'grpc' not in modules
+
+
+@pytest.mark.parametrize('package', ['google.showcase', 'google.showcase_v1beta1'])
+def test_message_access_skips_clients(package):
+    modules = _loaded_modules_after(
+        'from {} import EchoRequest'.format(package))
+    assert 'google.showcase_v1beta1.types.echo' in modules
+    assert 'google.showcase_v1beta1.services.echo.client' not in modules
+    assert 'google.showcase_v1beta1.services.identity.client' not in modules
+
+
+@pytest.mark.parametrize('package', [showcase, showcase_v1beta1])
+def test_all_names_resolve(package):
+    for name in package.__all__:
+        assert getattr(package, name) is not None
+        assert name in dir(package)
+
+    with pytest.raises(AttributeError):
+        package.NotAName
+
+
+def test_sync_clients_skip_asyncio_transports():
+    modules = _loaded_modules_after(
+        'from google.showcase_v1beta1.services.echo import EchoClient\n'
+        'from google.showcase_v1beta1.services.identity import IdentityClient')
+    assert not [m for m in modules if m.startswith('google.showcase') and (
+        m.endswith('async_client') or m.endswith('grpc_asyncio'))]
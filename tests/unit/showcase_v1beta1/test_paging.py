@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+import threading
+
+import pytest
+
+from google.showcase_v1beta1.services import _paging
+from google.showcase_v1beta1.types import identity
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def _page(number, last=5):
+    return identity.ListUsersResponse(
+        users=[identity.User(name='users/{}'.format(number))],
+        next_page_token=str(number + 1) if number < last else '',
+    )
+
+
+class _Pages(object):
+    """Fetches numbered pages, each once ``release`` allows it."""
+    def __init__(self):
+        self.tokens = []
+        self.fetched = threading.Semaphore(0)
+        self.release = threading.Semaphore(0)
+
+    def fetch(self, page_token):
+        self.release.acquire()
+        self.tokens.append(page_token)
+        self.fetched.release()
+        return _page(int(page_token))
+
+
+def _join_prefetch_threads():
+    for thread in threading.enumerate():
+        if thread.name == 'PagePrefetch':
+            thread.join(5)
+
+
+def test_prefetch_pages():
+    pages = _Pages()
+    for _ in range(5):
+        pages.release.release()
+
+    results = _paging.prefetch_pages(_page(0), pages.fetch, depth=2)
+    assert [p.users[0].name for p in results] == [
+        'users/{}'.format(n) for n in range(6)]
+    assert pages.tokens == ['1', '2', '3', '4', '5']
+
+
+def test_prefetch_pages_runs_ahead_within_depth():
+    pages = _Pages()
+    for _ in range(5):
+        pages.release.release()
+
+    results = _paging.prefetch_pages(_page(0), pages.fetch, depth=2)
+    assert next(results).users[0].name == 'users/0'
+
+    # Two pages are fetched while the first is in use, and no more.
+    assert pages.fetched.acquire(timeout=5)
+    assert pages.fetched.acquire(timeout=5)
+    assert not pages.fetched.acquire(timeout=0.05)
+    assert pages.tokens == ['1', '2']
+
+    # Taking a page makes room for another.
+    assert next(results).users[0].name == 'users/1'
+    assert pages.fetched.acquire(timeout=5)
+    assert pages.tokens == ['1', '2', '3']
+
+    results.close()
+    _join_prefetch_threads()
+    assert pages.tokens == ['1', '2', '3']
+
+
+def test_prefetch_pages_close_while_fetching():
+    pages = _Pages()
+    results = _paging.prefetch_pages(_page(0), pages.fetch, depth=1)
+    next(results)
+
+    # Stop while the second page is being fetched; it is not followed.
+    results.close()
+    pages.release.release()
+    pages.release.release()
+    _join_prefetch_threads()
+    assert pages.tokens == ['1']
+
+
+def test_prefetch_pages_error():
+    def fetch(page_token):
+        if page_token == '2':
+            raise RuntimeError('failed')
+        return _page(int(page_token))
+
+    results = _paging.prefetch_pages(_page(0), fetch, depth=3)
+    assert next(results).users[0].name == 'users/0'
+    assert next(results).users[0].name == 'users/1'
+    with pytest.raises(RuntimeError):
+        next(results)
+
+
+def test_prefetch_pages_single_page():
+    def fetch(page_token):
+        raise AssertionError('no more pages')
+
+    assert list(_paging.prefetch_pages(_page(5), fetch, depth=1)) == [_page(5)]
+
+
+def test_prefetch_pages_depth():
+    with pytest.raises(ValueError):
+        _paging.prefetch_pages(_page(0), lambda token: None, depth=0)
+
+
+def test_adaptive_page_size_latency():
+    sizer = _paging.AdaptivePageSize(
+        min_size=10, max_size=1000, target_latency=1.0)
+    assert sizer.size is None
+
+    # Fast pages grow, at most twofold each.
+    assert sizer.observe(100, 100, 0.5) == 200
+    assert sizer.observe(200, 200, 0.01) == 400
+
+    # Slow pages shrink, at most fourfold each.
+    assert sizer.observe(400, 400, 2.0) == 200
+    assert sizer.observe(200, 200, 60.0) == 50
+
+    # Sizes stay within the bounds.
+    assert sizer.observe(50, 50, 60.0) == 12
+    assert sizer.observe(12, 12, 60.0) == 10
+    assert sizer.size == 10
+
+
+def test_adaptive_page_size_payload():
+    sizer = _paging.AdaptivePageSize(
+        target_latency=1.0, target_bytes=1000, initial_size=100)
+    assert sizer.size == 100
+
+    # Pages of 20 bytes an item are cut to the 50 items that fit.
+    assert sizer.observe(100, 100, 0.1, payload_bytes=2000) == 50
+
+    # A short page is judged by its bytes per item.
+    assert sizer.observe(50, 10, 0.1, payload_bytes=100) == 100
+
+    # Without a payload size, only latency is considered.
+    assert sizer.observe(100, 100, 0.1) == 200
+
+
+def test_adaptive_page_size_server_chosen():
+    sizer = _paging.AdaptivePageSize(target_latency=1.0)
+
+    # Pages requested without a size are measured by what they held.
+    assert sizer.observe(0, 30, 1.0) == 30
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'min_size': 0},
+    {'min_size': 10, 'max_size': 5},
+    {'target_latency': 0},
+    {'target_bytes': 0},
+])
+def test_adaptive_page_size_invalid(kwargs):
+    with pytest.raises(ValueError):
+        _paging.AdaptivePageSize(**kwargs)
+
+
+def test_prefetch_pages_async():
+    async def test():
+        tokens = []
+        release = asyncio.Semaphore(0)
+
+        async def fetch(page_token):
+            await release.acquire()
+            tokens.append(page_token)
+            return _page(int(page_token))
+
+        results = _paging.prefetch_pages_async(_page(0), fetch, depth=2)
+        assert (await results.__anext__()).users[0].name == 'users/0'
+
+        # Pages are fetched concurrently, up to two ahead.
+        for _ in range(5):
+            release.release()
+        await asyncio.sleep(0.01)
+        assert tokens == ['1', '2']
+
+        assert [p.users[0].name async for p in results] == [
+            'users/{}'.format(n) for n in range(1, 6)]
+        assert tokens == ['1', '2', '3', '4', '5']
+
+    run(test())
+
+
+def test_prefetch_pages_async_close():
+    async def test():
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def fetch(page_token):
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        results = _paging.prefetch_pages_async(_page(0), fetch, depth=1)
+        await results.__anext__()
+        await started.wait()
+
+        # Closing cancels the request in flight.
+        await results.aclose()
+        await asyncio.wait_for(cancelled.wait(), 5)
+
+    run(test())
+
+
+def test_prefetch_pages_async_error():
+    async def test():
+        async def fetch(page_token):
+            raise RuntimeError('failed')
+
+        results = _paging.prefetch_pages_async(_page(0), fetch, depth=1)
+        await results.__anext__()
+        with pytest.raises(RuntimeError):
+            await results.__anext__()
+
+    run(test())
+
+
+def test_prefetch_pages_async_depth():
+    with pytest.raises(ValueError):
+        _paging.prefetch_pages_async(_page(0), None, depth=0)
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import threading
+
+import pytest
+
+from google.showcase_v1beta1.services._singleflight import SingleFlight
+
+
+def _start(target, count):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def test_single_flight_merges_concurrent_calls():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+    results = []
+
+    def func():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'result'
+
+    leader = _start(lambda: results.append(flight.do('key', func)), 1)
+    assert started.wait(5)
+    followers = _start(lambda: results.append(flight.do('key', func)), 3)
+
+    # Wait for the followers to join the call in flight.
+    while flight.shared < 3:
+        threading.Event().wait(0.01)
+    release.set()
+    for thread in leader + followers:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert results == [('result', True)] * 4
+    assert len(flight) == 0
+
+
+def test_single_flight_shares_errors():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    errors = []
+
+    def func():
+        started.set()
+        release.wait(5)
+        raise RuntimeError('unavailable')
+
+    def call():
+        try:
+            flight.do('key', func)
+        except RuntimeError as exc:
+            errors.append(exc)
+
+    threads = _start(call, 1)
+    assert started.wait(5)
+    threads += _start(call, 2)
+    while flight.shared < 2:
+        threading.Event().wait(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(errors) == 3
+    assert len(flight) == 0
+
+
+def test_single_flight_does_not_cache():
+    flight = SingleFlight()
+    calls = []
+
+    def func():
+        calls.append(1)
+        return len(calls)
+
+    # Calls which do not overlap each run, and are not shared.
+    assert flight.do('key', func) == (1, False)
+    assert flight.do('key', func) == (2, False)
+    assert flight.do('other', func) == (3, False)
+    assert flight.shared == 0
+
+    with pytest.raises(ZeroDivisionError):
+        flight.do('key', lambda: 1 / 0)
+    assert len(flight) == 0
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from unittest import mock
+
+import pytest
+
+from google.auth import credentials
+from google.protobuf import timestamp_pb2 as timestamp  # type: ignore
+from google.showcase_v1beta1.services.identity import IdentityClient
+from google.showcase_v1beta1.services.identity import SnapshotDiff
+from google.showcase_v1beta1.services.identity import UserSnapshot
+from google.showcase_v1beta1.types import identity
+
+
+UserPb = identity.User.pb()
+ListUsersResponsePb = identity.ListUsersResponse.pb()
+
+
+class _Directory(object):
+    """Serves list_users from a dict of users, two per page."""
+    def __init__(self, *users):
+        self.users = {u.name: u for u in users}
+        self.fail = False
+
+    def __call__(self, request, **kwargs):
+        if self.fail:
+            raise RuntimeError('unavailable')
+        names = sorted(self.users)
+        start = int(request.page_token or 0)
+        return ListUsersResponsePb(
+            users=[self.users[n] for n in names[start:start + 2]],
+            next_page_token=str(start + 2) if start + 2 < len(names) else '',
+        )
+
+
+def _user(number, email, seconds=None):
+    user = UserPb(name='users/{}'.format(number), email=email)
+    if seconds is not None:
+        user.update_time.CopyFrom(timestamp.Timestamp(seconds=seconds))
+    return user
+
+
+def test_user_snapshot_refresh():
+    client = IdentityClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    directory = _Directory(
+        _user(1, 'a@example.com', 10),
+        _user(2, 'b@example.com', 10),
+        _user(3, 'c@example.com'),
+    )
+    snapshot = UserSnapshot(client, prefetch=0)
+
+    with mock.patch.object(
+            type(client._transport.list_users),
+            '__call__') as call:
+        call.side_effect = directory
+
+        assert snapshot.refresh() == SnapshotDiff(
+            added=['users/1', 'users/2', 'users/3'], changed=[], removed=[])
+        assert snapshot.get('users/2').email == 'b@example.com'
+        assert len(snapshot) == 3
+
+        # Nothing changed.
+        assert snapshot.refresh() == SnapshotDiff([], [], [])
+
+        # An edit bumps the update time; a user without one is compared by
+        # content.
+        directory.users['users/1'] = _user(1, 'new@example.com', 11)
+        directory.users['users/3'] = _user(3, 'new@example.com')
+        del directory.users['users/2']
+        directory.users['users/4'] = _user(4, 'd@example.com', 12)
+        assert snapshot.refresh() == SnapshotDiff(
+            added=['users/4'], changed=['users/1', 'users/3'],
+            removed=['users/2'])
+
+        # A scan which fails leaves the snapshot as it was.
+        directory.fail = True
+        with pytest.raises(RuntimeError):
+            snapshot.refresh()
+
+    assert snapshot.refreshes == 3
+    assert 'users/2' not in snapshot
+    assert snapshot.get('users/2') is None
+    assert snapshot.get('users/1').email == 'new@example.com'
+    assert sorted(snapshot.names()) == ['users/1', 'users/3', 'users/4']
+    assert sorted(u.email for u in snapshot) == [
+        'd@example.com', 'new@example.com', 'new@example.com']
+
+
+def test_user_snapshot_returns_copies():
+    client = IdentityClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    snapshot = UserSnapshot(client, {'page_size': 2})
+
+    with mock.patch.object(
+            type(client._transport.list_users),
+            '__call__') as call:
+        call.side_effect = _Directory(_user(1, 'a@example.com', 10))
+        snapshot.refresh()
+
+    user = snapshot.get('users/1')
+    user.email = 'changed@example.com'
+    assert snapshot.get('users/1').email == 'a@example.com'
+    assert call.mock_calls[0][1][0].page_size == 2
+
+
+def test_user_snapshot_index():
+    client = IdentityClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    directory = _Directory(
+        _user(1, 'a@example.com', 10),
+        _user(2, 'b@example.com', 10),
+    )
+    snapshot = UserSnapshot(client, index=True)
+
+    with mock.patch.object(
+            type(client._transport.list_users),
+            '__call__') as call:
+        call.side_effect = directory
+        snapshot.refresh()
+        assert [u.name for u in snapshot.find_by_email('A@example.com')] == [
+            'users/1']
+
+        # The index follows the changes a refresh finds.
+        directory.users['users/1'] = _user(1, 'b@example.com', 11)
+        directory.users['users/1'].display_name = 'Ann'
+        del directory.users['users/2']
+        snapshot.refresh()
+
+    assert [u.name for u in snapshot.find_by_email('b@example.com')] == [
+        'users/1']
+    assert snapshot.find_by_email('a@example.com') == []
+    assert [u.name for u in snapshot.find_by_display_name('an')] == ['users/1']
+    assert len(snapshot.index) == 1
+
+    with pytest.raises(ValueError):
+        UserSnapshot(client).find_by_email('a@example.com')
+
+
+def test_user_snapshot_duplicate_users():
+    client = IdentityClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    snapshot = UserSnapshot(client, index=True, prefetch=0)
+    first = _user(1, 'a@example.com', 10)
+    first.display_name = 'Ann'
+    second = _user(1, 'b@example.com', 11)
+    second.display_name = 'Bea'
+
+    # The pages shift under the scan, so it returns users/1 twice.
+    pages = [
+        ListUsersResponsePb(users=[first], next_page_token='1'),
+        ListUsersResponsePb(users=[second, _user(2, 'c@example.com', 10)]),
+    ]
+
+    with mock.patch.object(
+            type(client._transport.list_users),
+            '__call__') as call:
+        call.side_effect = lambda request, **kwargs: pages[
+            int(request.page_token or 0)]
+        assert snapshot.refresh() == SnapshotDiff(
+            added=['users/1', 'users/2'], changed=[], removed=[])
+
+    # The last copy wins, in the snapshot and in its index alike.
+    assert snapshot.get('users/1').email == 'b@example.com'
+    assert [u.name for u in snapshot.find_by_email('b@example.com')] == [
+        'users/1']
+    assert snapshot.find_by_email('a@example.com') == []
+    assert [u.name for u in snapshot.find_by_display_name('bea')] == [
+        'users/1']
+    assert snapshot.find_by_display_name('ann') == []